@@ -0,0 +1,86 @@
+########################################
+#	IMPORTS
+########################################
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from vlbasic.vlbasic.tokenizer import Tokenizer
+from vlbasic.vlbasic.parser import Parser
+from vlbasic.vlbasic.contextclass import Context, VariableTable
+from vlbasic.vlbasic.interpreter import Interpreter
+from vlbasic.vlbasic.utils import InterpretFile
+
+########################################
+#	BENCHMARK
+########################################
+
+# Measures the memory allocated by every stage with tracemalloc, run with
+# python benchmarks/allocations.py [functions], functions defaults to 200.
+# retained is what the stage result keeps alive, peak is the most allocated at
+# once while the stage was running
+
+FUNCTION = """FUNCTION f{name}(a, b)
+	LET total = 0
+	FOR item IN [a, b, {i}] THEN
+		IF item > {i} THEN
+			total += item - {i}
+		ELSEIF item == 0 THEN
+			total -= 1
+		ELSE
+			total += 1
+		END
+	END
+	RETURN total
+END
+LET r{name} = f{name}({i}, 3)
+"""
+
+# Identifiers can only contain letters
+def letters(number: int) -> str:
+	text = ""
+	while True:
+		text = chr(ord("a") + number % 26) + text
+		number //= 26
+		if number == 0:
+			return text
+
+def measure(name: str, stage):
+	tracemalloc.start()
+	result = stage()
+	retained, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	print(f"{name:<12} retained {retained / 1024:>9.1f} KiB   peak {peak / 1024:>9.1f} KiB")
+
+	return result
+
+def main() -> None:
+	functions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+	code = "".join(FUNCTION.replace("{name}", letters(i)).replace("{i}", str(i)) for i in range(functions))
+
+	print(f"{functions} functions, {len(code)} characters")
+
+	tokens, error = measure("tokenize", lambda: Tokenizer("<BENCHMARK>", code).tokenize())
+	if error:
+		print(error)
+		return
+
+	statements, error = measure("parse", lambda: Parser("<BENCHMARK>", tokens).parse())
+	if error:
+		print(error)
+		return
+
+	context = Context("<BENCHMARK>")
+	context.setVariableTable(VariableTable())
+	interpreter = Interpreter(statements, InterpretFile("<BENCHMARK>", None))
+
+	out, error = measure("interpret", lambda: interpreter.interpret(context))
+	if error:
+		print(error)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,55 @@
+########################################
+#	IMPORTS
+########################################
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from vlbasic.vlbasic.tokenizer import Tokenizer
+from vlbasic.vlbasic.parser import Parser
+from vlbasic.vlbasic.contextclass import Context, VariableTable
+from vlbasic.vlbasic.interpreter import Interpreter
+from vlbasic.vlbasic.utils import InterpretFile
+
+########################################
+#	BENCHMARK
+########################################
+
+# Compares the per node cost of resolving the visit function with getattr on
+# every visit (the old way) against the precomputed dispatch table
+
+NUMBER = 1_000_000
+
+def getattrVisit(interpreter: Interpreter, statement, context: Context, insideLoop: bool = False):
+	functionName = f"visit_{type(statement).__name__}"
+	func = getattr(interpreter, functionName, interpreter.visitFunctionNotFound)
+	return func(statement, context, insideLoop)
+
+def main() -> None:
+	tokens, _ = Tokenizer("<BENCHMARK>", "1").tokenize()
+	statements, _ = Parser("<BENCHMARK>", tokens).parse()
+	node = statements[0]
+
+	context = Context("<BENCHMARK>")
+	context.setVariableTable(VariableTable())
+
+	interpreter = Interpreter(statements, InterpretFile("<BENCHMARK>", None))
+
+	getattrLookup = min(timeit.repeat(lambda: getattr(interpreter, f"visit_{type(node).__name__}", interpreter.visitFunctionNotFound), number=NUMBER, repeat=5))
+	tableLookup = min(timeit.repeat(lambda: interpreter.dispatchTable.get(type(node)), number=NUMBER, repeat=5))
+
+	print(f"getattr lookup:    {getattrLookup / NUMBER * 1e9:.1f} ns per node")
+	print(f"table lookup:      {tableLookup / NUMBER * 1e9:.1f} ns per node")
+
+	getattrTime = min(timeit.repeat(lambda: getattrVisit(interpreter, node, context), number=NUMBER, repeat=5))
+	tableTime = min(timeit.repeat(lambda: interpreter.visit(node, context), number=NUMBER, repeat=5))
+
+	print(f"getattr dispatch:  {getattrTime / NUMBER * 1e9:.1f} ns per NumberNode")
+	print(f"dispatch table:    {tableTime / NUMBER * 1e9:.1f} ns per NumberNode")
+	print(f"speedup:           {getattrTime / tableTime:.2f}x")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,64 @@
+########################################
+#	IMPORTS
+########################################
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from vlbasic.vlbasic.tokenizer import Tokenizer
+from vlbasic.vlbasic.parser import Parser
+from vlbasic.vlbasic.contextclass import Context, VariableTable
+from vlbasic.vlbasic.interpreter import Interpreter
+from vlbasic.vlbasic.vm import VM
+from vlbasic.vlbasic.closurecompiler import ClosureInterpreter
+from vlbasic.vlbasic.utils import InterpretFile
+
+########################################
+#	BENCHMARK
+########################################
+
+# Recursive fib stresses the function call path, run with
+# python benchmarks/fib.py [n], n defaults to 20
+
+ENGINES = {
+	"interpreter": Interpreter,
+	"vm": VM,
+	"closure": ClosureInterpreter
+}
+
+CODE = """FUNCTION fib(n)
+	IF n < 2 THEN
+		RETURN n
+	END
+	RETURN fib(n - 1) + fib(n - 2)
+END
+fib({n})"""
+
+def main() -> None:
+	n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+	code = CODE.replace("{n}", str(n))
+
+	tokens, _ = Tokenizer("<BENCHMARK>", code).tokenize()
+	statements, _ = Parser("<BENCHMARK>", tokens).parse()
+
+	for name, engine in ENGINES.items():
+		context = Context("<BENCHMARK>")
+		context.setVariableTable(VariableTable())
+
+		interpreter = engine(statements, InterpretFile("<BENCHMARK>", None))
+
+		start = time.perf_counter()
+		out, error = interpreter.interpret(context)
+		elapsed = time.perf_counter() - start
+
+		if error:
+			print(error)
+			return
+
+		print(f"{name:<12} fib({n}) = {out[-1].value} in {elapsed:.3f}s")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,115 @@
+########################################
+#	IMPORTS
+########################################
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from vlbasic.vlbasic.tokenizer import Tokenizer
+from vlbasic.vlbasic.parser import Parser
+from vlbasic.vlbasic.contextclass import Context, VariableTable
+from vlbasic.vlbasic.interpreter import Interpreter
+from vlbasic.vlbasic.vm import VM
+from vlbasic.vlbasic.closurecompiler import ClosureInterpreter
+from vlbasic.vlbasic.utils import InterpretFile, readSource
+
+try:
+	import resource
+except ImportError:
+	resource = None
+
+########################################
+#	BENCHMARK
+########################################
+
+# Writes a large synthetic .vlb file, parses and runs it and reports the peak
+# resident set size of the process. Run with
+# python benchmarks/memory.py [functions] [engine], functions defaults to 5000
+# and engine to interpreter. Run every configuration in a new process, the
+# peak RSS never goes down
+
+ENGINES = {
+	"interpreter": Interpreter,
+	"vm": VM,
+	"closure": ClosureInterpreter
+}
+
+FUNCTION = """FUNCTION f{name}(a, b)
+	LET total = 0
+	LET items = [a, b, {i}, "{name}"]
+	FOR item IN [1->10] THEN
+		IF item > a THEN
+			total += item - b
+		ELSEIF item == 0 THEN
+			CONTINUE
+		ELSE
+			total += 1
+		END
+	END
+	RETURN total
+END
+LET r{name} = f{name}({i}, 3)
+"""
+
+# Identifiers can only contain letters
+def letters(number: int) -> str:
+	text = ""
+	while True:
+		text = chr(ord("a") + number % 26) + text
+		number //= 26
+		if number == 0:
+			return text
+
+def peakRSS() -> str:
+	if not resource:
+		return "unavailable"
+
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+	# Linux reports KiB, macOS bytes
+	if sys.platform == "darwin":
+		peak /= 1024
+
+	return f"{peak / 1024:.1f} MiB"
+
+def main() -> None:
+	functions = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+	engine = sys.argv[2] if len(sys.argv) > 2 else "interpreter"
+
+	with tempfile.NamedTemporaryFile("w", suffix=".vlb", delete=False) as file:
+		for i in range(functions):
+			file.write(FUNCTION.replace("{name}", letters(i)).replace("{i}", str(i)))
+
+		path = file.name
+
+	try:
+		print(f"{functions} functions, {os.path.getsize(path) / 1024:.0f} KiB of source, engine {engine}")
+		print(f"before:      {peakRSS()}")
+
+		start = time.perf_counter()
+
+		statements, error = Parser(path, Tokenizer(path, readSource(path)).generateTokens()).parse()
+		if error:
+			print(error)
+			return
+
+		print(f"parsed:      {peakRSS()}")
+
+		context = Context(path)
+		context.setVariableTable(VariableTable())
+
+		out, error = ENGINES[engine](statements, InterpretFile(path, None)).interpret(context)
+		if error:
+			print(error)
+			return
+
+		print(f"interpreted: {peakRSS()} in {time.perf_counter() - start:.2f}s")
+	finally:
+		os.remove(path)
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,79 @@
+########################################
+#	IMPORTS
+########################################
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from vlbasic.vlbasic.tokenizer import Tokenizer
+from vlbasic.vlbasic.parser import Parser
+
+########################################
+#	BENCHMARK
+########################################
+
+# Parses a long file of arithmetic heavy statements from a tokenized list so
+# only the parser is timed, and counts the Python calls it makes per token.
+# Run with python benchmarks/parser.py [lines], lines defaults to 20000
+
+LINES = [
+	"LET {name} = 1 + 2 * 3 - 4 / 5 % 6 ^ 2",
+	"{name} = ({name} + 1) * -2 ^ 3 - f(a, b + 1)[0] / 7",
+	"LET {name} = a == b + 1 * c != d < e - 2 ^ 2",
+	"IF NOT {name} >= 10 * 2 THEN\n\t{name} += -1\nEND",
+	"LET {name} = [a * 1, b * 2, c ^ 3].length + {{\"k\": 1 * 2}}.k"
+]
+
+# Identifiers can only contain letters
+def letters(number: int) -> str:
+	text = ""
+	while True:
+		text = chr(ord("a") + number % 26) + text
+		number //= 26
+		if number == 0:
+			return text
+
+def countCalls(tokens: list) -> int:
+	calls = 0
+
+	def profile(frame, event, arg) -> None:
+		nonlocal calls
+		if event == "call":
+			calls += 1
+
+	sys.setprofile(profile)
+	try:
+		Parser("<BENCHMARK>", tokens).parse()
+	finally:
+		sys.setprofile(None)
+
+	return calls
+
+def main() -> None:
+	lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+	code = "\n".join(LINES[i % len(LINES)].format(name=letters(i)) for i in range(lines))
+
+	tokens, error = Tokenizer("<BENCHMARK>", code).tokenize()
+	if error:
+		print(error)
+		return
+
+	print(f"{lines} lines, {len(tokens)} tokens")
+
+	start = time.perf_counter()
+	statements, error = Parser("<BENCHMARK>", tokens).parse()
+	elapsed = time.perf_counter() - start
+
+	if error:
+		print(error)
+		return
+
+	print(f"parsed in {elapsed:.2f}s, {len(tokens) / elapsed / 1000:.0f}k tokens/s")
+	sample, error = Tokenizer("<BENCHMARK>", "\n".join(line.format(name="x") for line in LINES)).tokenize()
+	print(f"{countCalls(sample) / len(sample):.1f} calls per token")
+
+if __name__ == "__main__":
+	main()
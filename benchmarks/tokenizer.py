@@ -0,0 +1,54 @@
+########################################
+#	IMPORTS
+########################################
+
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from vlbasic.vlbasic.tokenizer import Tokenizer, CharacterTokenizer
+
+########################################
+#	BENCHMARK
+########################################
+
+# Tokenizes the examples repeated until the source is a few megabytes and
+# reports the throughput, run with python benchmarks/tokenizer.py [megabytes],
+# megabytes defaults to 4
+
+TOKENIZERS = {
+	"character": CharacterTokenizer,
+	"regex": Tokenizer
+}
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples", "*.vlb")
+
+def main() -> None:
+	megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+	examples = ""
+	for path in sorted(glob.glob(EXAMPLES)):
+		with open(path, "r") as file:
+			examples += file.read() + "\n"
+
+	code = examples * max(1, int(megabytes * 1024 * 1024 / len(examples)))
+	size = len(code.encode()) / (1024 * 1024)
+
+	print(f"{size:.1f} MB of source")
+
+	for name, tokenizer in TOKENIZERS.items():
+		start = time.perf_counter()
+		tokens, error = tokenizer("<BENCHMARK>", code).tokenize()
+		elapsed = time.perf_counter() - start
+
+		if error:
+			print(error)
+			return
+
+		print(f"{name:<10} {len(tokens)} tokens in {elapsed:.2f}s, {size / elapsed:.2f} MB/s")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,208 @@
+import os
+import pickle
+import pytest
+from vlbasic import cache
+from vlbasic.cache import parseFile, cachePath, compileTree, CACHE_DIRECTORY
+from vlbasic.parser import Parser
+from vlbasic.contextclass import Context, VariableTable
+from vlbasic.interpreter import Interpreter
+from vlbasic.utils import InterpretFile
+
+CODE = "FUNCTION f(a)\n\tLET b = a * 2\n\tRETURN b + 1\nEND\nPRINT(f(3))\n"
+
+def write(path, code):
+	path.write_text(code)
+	return str(path)
+
+def countParses(monkeypatch):
+	parses = []
+	parse = Parser.parse
+
+	def countedParse(self):
+		parses.append(self)
+		return parse(self)
+
+	monkeypatch.setattr(Parser, "parse", countedParse)
+
+	return parses
+
+class TestCache:
+	def testLoadsWithoutParsing(self, tmp_path, monkeypatch):
+		path = write(tmp_path / "a.vlb", CODE)
+		parses = countParses(monkeypatch)
+
+		statements, error = parseFile(path)
+
+		assert error is None
+		assert os.path.exists(cachePath(path))
+		assert cachePath(path) == str(tmp_path / CACHE_DIRECTORY / "a.vlbc")
+
+		cached, error = parseFile(path)
+
+		assert error is None
+		assert len(parses) == 1
+		assert repr(cached) == repr(statements)
+		assert cached[0].layout == statements[0].layout
+		assert cached[0].body[1].value.left.slot == statements[0].body[1].value.left.slot
+
+	def testPositionsPointToTheSource(self, tmp_path):
+		path = write(tmp_path / "a.vlb", CODE)
+
+		parseFile(path)
+		statements, _ = parseFile(path, "shown.vlb")
+
+		position = statements[1].position
+		assert position.file.name == "shown.vlb"
+		assert position.file.lineColumn(position.start) == (5, 0)
+		assert position.file.lineText(5) == "PRINT(f(3))"
+
+	@pytest.mark.parametrize("code", [CODE, "PRINT(1 +)\n"])
+	def testMappingClosed(self, tmp_path, code):
+		path = write(tmp_path / "a.vlb", code)
+
+		for _ in range(2):
+			statements, error = parseFile(path)
+			position = error.position if error else statements[0].position
+
+			assert type(position.file.text) is bytes
+
+	def testCachedProgramRuns(self, tmp_path, capsys):
+		path = write(tmp_path / "a.vlb", CODE)
+
+		parseFile(path)
+		statements, _ = parseFile(path)
+
+		context = Context(path)
+		context.setVariableTable(VariableTable())
+		_, error = Interpreter(statements, InterpretFile(path, None)).interpret(context)
+
+		assert error is None
+		assert capsys.readouterr().out == "7\n"
+
+	def testChangedSourceIsParsedAgain(self, tmp_path, monkeypatch):
+		path = write(tmp_path / "a.vlb", CODE)
+		parseFile(path)
+
+		write(tmp_path / "a.vlb", CODE.replace("* 2", "* 3"))
+		parses = countParses(monkeypatch)
+
+		statements, _ = parseFile(path)
+		assert len(parses) == 1
+		assert "MULTIPLY 3" in repr(statements[0].body[0].valueNode)
+
+		parseFile(path)
+		assert len(parses) == 1
+
+	def testOtherVersionIsParsedAgain(self, tmp_path, monkeypatch):
+		path = write(tmp_path / "a.vlb", CODE)
+		parseFile(path)
+
+		monkeypatch.setattr(cache, "VERSION", "other")
+		parses = countParses(monkeypatch)
+
+		parseFile(path)
+		assert len(parses) == 1
+
+	def testBrokenCacheIsIgnored(self, tmp_path, monkeypatch):
+		path = write(tmp_path / "a.vlb", CODE)
+		parseFile(path)
+
+		with open(cachePath(path), "r+b") as file:
+			file.truncate(os.path.getsize(cachePath(path)) // 2)
+
+		parses = countParses(monkeypatch)
+
+		statements, error = parseFile(path)
+		assert error is None
+		assert len(parses) == 1
+		assert len(statements) == 2
+
+	def testOtherClassesAreRefused(self, tmp_path, monkeypatch):
+		path = write(tmp_path / "a.vlb", CODE)
+		marker = tmp_path / "ran"
+		parseFile(path)
+
+		class Payload:
+			def __reduce__(self):
+				return (os.mkdir, (str(marker),))
+
+		with open(cachePath(path), "wb") as file:
+			file.write(cache.cacheHeader(cache.sourceHash(CODE.encode())))
+			pickle.dump(Payload(), file)
+
+		parses = countParses(monkeypatch)
+
+		statements, error = parseFile(path)
+		assert error is None
+		assert not marker.exists()
+		assert len(parses) == 1
+		assert len(statements) == 2
+
+		parseFile(path)
+		assert len(parses) == 1
+
+	def testHeaderIsNotUnpickled(self, tmp_path, monkeypatch):
+		path = write(tmp_path / "a.vlb", CODE)
+		marker = tmp_path / "ran"
+		parseFile(path)
+
+		class Payload:
+			def __reduce__(self):
+				return (os.mkdir, (str(marker),))
+
+		with open(cachePath(path), "wb") as file:
+			pickle.dump(Payload(), file)
+
+		parses = countParses(monkeypatch)
+
+		statements, error = parseFile(path)
+		assert error is None
+		assert not marker.exists()
+		assert len(parses) == 1
+		assert len(statements) == 2
+
+	def testVersionFollowsDefinitions(self):
+		assert cache.CACHE_VERSION == cache.definitionsHash()
+		assert cache.CACHE_VERSION in cache.VERSION
+
+	def testSyntaxErrorIsNotCached(self, tmp_path):
+		path = write(tmp_path / "a.vlb", "LET = 1")
+
+		_, error = parseFile(path)
+
+		assert error.name == "InvalidSyntaxError"
+		assert not os.path.exists(cachePath(path))
+
+	def testTooDeepToCache(self, tmp_path):
+		path = write(tmp_path / "a.vlb", " + ".join(["1"] * 20000))
+
+		statements, error = parseFile(path)
+
+		assert error is None
+		assert len(statements) == 1
+		assert not os.path.exists(cachePath(path))
+
+	def testNoCache(self, tmp_path):
+		path = write(tmp_path / "a.vlb", CODE)
+
+		parseFile(path, useCache=False)
+
+		assert not os.path.exists(cachePath(path))
+
+	def testCompileTree(self, tmp_path):
+		(tmp_path / "sub").mkdir()
+		write(tmp_path / "a.vlb", CODE)
+		write(tmp_path / "sub" / "b.vlb", CODE)
+		write(tmp_path / "sub" / "bad.vlb", "LET = 1")
+		write(tmp_path / "sub" / "notes.txt", "LET = 1")
+
+		results = compileTree(str(tmp_path))
+
+		assert [(os.path.relpath(path, tmp_path), error.name if error else None) for path, error in results] == [
+			("a.vlb", None),
+			(os.path.join("sub", "b.vlb"), None),
+			(os.path.join("sub", "bad.vlb"), "InvalidSyntaxError")
+		]
+		assert os.path.exists(cachePath(str(tmp_path / "sub" / "b.vlb")))
+
+		assert len(compileTree(str(tmp_path))) == 3
@@ -0,0 +1,180 @@
+import os
+import pytest
+from vlbasic.tokenizer import Tokenizer
+from vlbasic.parser import Parser
+from vlbasic.contextclass import Context, VariableTable
+from vlbasic.interpreter import Interpreter
+from vlbasic.vm import VM
+from vlbasic.closurecompiler import ClosureInterpreter
+from vlbasic.utils import InterpretFile
+from vlbasic.moduleclass import ModuleSearchPath, modules, directoryIndex
+
+ENGINES = [Interpreter, VM, ClosureInterpreter]
+
+MODULE = "PRINT(\"loaded\")\nLET x = 1\nFUNCTION get()\n\tRETURN x\nEND\n"
+
+@pytest.fixture(autouse=True)
+def clearModules():
+	modules.clear()
+	directoryIndex.clear()
+	yield
+	modules.clear()
+	directoryIndex.clear()
+
+def run(tmp_path, code, engine):
+	path = str(tmp_path / "main.vlb")
+
+	tokens, error = Tokenizer(path, code).tokenize()
+	assert not error
+
+	statements, error = Parser(path, tokens).parse()
+	assert not error
+
+	context = Context(path)
+	context.setVariableTable(VariableTable())
+
+	_, error = engine(statements, InterpretFile(path, None)).interpret(context)
+
+	return context, error
+
+@pytest.mark.parametrize("engine", ENGINES)
+class TestModuleCache:
+	def testRunsOnce(self, tmp_path, engine, capsys):
+		(tmp_path / "mod.vlb").write_text(MODULE)
+
+		context, error = run(tmp_path, "FUNCTION f()\n\tIMPORT \"mod\" AS *\n\tRETURN get()\nEND\nFOR i IN [1->4] THEN\n\tPRINT(f())\nEND", engine)
+
+		assert error is None
+		assert capsys.readouterr().out.split("\n")[1:] == ["loaded", "1", "1", "1", ""]
+
+	def testBindsTheSameNamespace(self, tmp_path, engine):
+		(tmp_path / "mod.vlb").write_text(MODULE)
+
+		context, error = run(tmp_path, "IMPORT \"mod\"\nIMPORT \"mod\" AS other\nIMPORT \"mod\" AS *", engine)
+
+		assert error is None
+
+		first, _ = context.variableTable.lookupVariable("mod", None)
+		second, _ = context.variableTable.lookupVariable("other", None)
+		x, _ = context.variableTable.lookupVariable("x", None)
+
+		assert first is second
+		assert repr(x) == "NUMBER(1)"
+		assert modules.get(str(tmp_path / "mod.vlb")).namespace is first
+
+	def testInvalidate(self, tmp_path, engine, capsys):
+		(tmp_path / "mod.vlb").write_text(MODULE)
+		run(tmp_path, "IMPORT \"mod\"", engine)
+
+		assert modules.invalidate(str(tmp_path / "mod.vlb"))
+		assert not modules.invalidate(str(tmp_path / "mod.vlb"))
+
+		run(tmp_path, "IMPORT \"mod\"", engine)
+
+		assert capsys.readouterr().out.count("loaded") == 2
+
+	def testInvalidateChanged(self, tmp_path, engine, capsys):
+		path = tmp_path / "mod.vlb"
+		path.write_text(MODULE)
+		run(tmp_path, "IMPORT \"mod\"", engine)
+
+		assert modules.invalidateChanged() == []
+
+		path.write_text(MODULE.replace("LET x = 1", "LET x = 2"))
+		os.utime(path, (0, 0))
+
+		assert modules.invalidateChanged() == [str(path)]
+
+		context, error = run(tmp_path, "IMPORT \"mod\" AS *", engine)
+		x, _ = context.variableTable.lookupVariable("x", None)
+
+		assert error is None
+		assert repr(x) == "NUMBER(2)"
+
+	def testFailedImportIsNotCached(self, tmp_path, engine):
+		path = tmp_path / "mod.vlb"
+		path.write_text("LET x = 1 + \"a\"")
+
+		_, error = run(tmp_path, "IMPORT \"mod\"", engine)
+
+		assert error is not None
+		assert modules.get(str(path)) is None
+
+		path.write_text(MODULE)
+
+		_, error = run(tmp_path, "IMPORT \"mod\"", engine)
+
+		assert error is None
+
+class TestSearchPath:
+	@pytest.fixture
+	def tree(self, tmp_path, monkeypatch):
+		(tmp_path / "work" / "vlbasic" / "modules").mkdir(parents=True)
+		(tmp_path / "src" / "vlbasic" / "modules" / "sub").mkdir(parents=True)
+		monkeypatch.chdir(tmp_path / "work")
+
+		return tmp_path
+
+	@pytest.mark.parametrize("files, expected", [
+		(["src/vlbasic/modules/a.vlb", "work/vlbasic/modules/a.vlb", "src/a.vlb", "work/a.vlb"], "{src}/vlbasic/modules/a.vlb"),
+		(["work/vlbasic/modules/a.vlb", "src/a.vlb", "work/a.vlb"], "vlbasic/modules/a.vlb"),
+		(["src/a.vlb", "work/a.vlb", "src/vlbasic/modules/a.py"], "{src}/a.vlb"),
+		(["work/a.vlb", "src/vlbasic/modules/a.py"], "a.vlb"),
+		(["src/vlbasic/modules/a.py", "work/vlbasic/modules/a.py"], "{src}/vlbasic/modules/a.py"),
+		(["work/vlbasic/modules/a.py", "src/a.py", "work/a.py"], "vlbasic/modules/a.py"),
+		(["src/a.py", "work/a.py"], None)
+	])
+	def testFindOrder(self, tree, files, expected):
+		for file in files:
+			(tree / file).write_text("")
+
+		path = ModuleSearchPath.forFile(str(tree / "src" / "main.vlb")).find("a")
+
+		assert path == (expected and expected.format(src=tree / "src"))
+
+	def testFindInFolder(self, tree):
+		(tree / "src" / "vlbasic" / "modules" / "sub" / "a.vlb").write_text("")
+
+		path = ModuleSearchPath.forFile(str(tree / "src" / "main.vlb")).find("sub/a")
+
+		assert path == f"{tree / 'src'}/vlbasic/modules/sub/a.vlb"
+
+	def testListsEveryFolderOnce(self, tree, monkeypatch):
+		listed = []
+		listdir = os.listdir
+		monkeypatch.setattr(os, "listdir", lambda path: listed.append(path) or listdir(path))
+
+		searchPath = ModuleSearchPath.forFile(str(tree / "src" / "main.vlb"))
+		for name in ["a", "b", "c", "a"]:
+			assert searchPath.find(name) is None
+
+		assert len(listed) == len(set(listed)) == 4
+
+	def testFindsFileAddedLater(self, tree):
+		searchPath = ModuleSearchPath.forFile(str(tree / "src" / "main.vlb"))
+		assert searchPath.find("a") is None
+
+		(tree / "src" / "a.vlb").write_text("")
+
+		assert searchPath.find("a") == str(tree / "src" / "a.vlb")
+		assert "a.vlb" in directoryIndex.files(str(tree / "src"))
+
+	def testFindsOtherCase(self, tree):
+		(tree / "src" / "a.vlb").write_text("")
+		if not os.path.exists(tree / "src" / "A.vlb"):
+			pytest.skip("the file system is case sensitive")
+
+		assert ModuleSearchPath.forFile(str(tree / "src" / "main.vlb")).find("A") == str(tree / "src" / "A.vlb")
+
+	def testExtraRoots(self, tree, monkeypatch):
+		(tree / "lib").mkdir()
+		(tree / "lib" / "a.vlb").write_text("")
+		monkeypatch.setenv("VLBASIC_PATH", str(tree / "lib"))
+
+		assert ModuleSearchPath.forFile(str(tree / "src" / "main.vlb")).find("a") == str(tree / "lib" / "a.vlb")
+
+	def testListModules(self, tree):
+		for name in ["b.vlb", "a.vlb", "c.py", "notes.txt"]:
+			(tree / "work" / "vlbasic" / "modules" / name).write_text("")
+
+		assert ModuleSearchPath.installed().listModules() == [("a", ".vlb"), ("b", ".vlb"), ("c", ".py")]
@@ -0,0 +1,35 @@
+import pytest
+from vlbasic.tokenizer import Tokenizer
+from vlbasic.parser import Parser
+
+def parse(code):
+	statements, error = Parser("TEST", Tokenizer("TEST", code).generateTokens()).parse()
+	if error:
+		return error.details
+
+	return repr(statements)
+
+class TestOperators:
+	@pytest.mark.parametrize("code, tree", [
+		("1 + 2 * 3", "[(1 PLUS (2 MULTIPLY 3))]"),
+		("1 * 2 + 3", "[((1 MULTIPLY 2) PLUS 3)]"),
+		("a - b - c", "[((VARIABLE_ACCESS_NODE(a) MINUS VARIABLE_ACCESS_NODE(b)) MINUS VARIABLE_ACCESS_NODE(c))]"),
+		("2 ^ 3 ^ 2", "[((2 POWER 3) POWER 2)]"),
+		("2 * 3 ^ 2 % 4", "[((2 MULTIPLY (3 POWER 2)) MODULUS 4)]"),
+		("-a ^ 2", "[((MINUS VARIABLE_ACCESS_NODE(a)) POWER 2)]"),
+		("2 ^ -1", "[(2 POWER (MINUS 1))]"),
+		("- -1", "[(MINUS (MINUS 1))]"),
+		("a == b + 1", "[((VARIABLE_ACCESS_NODE(a) DOUBLE_EQUALS VARIABLE_ACCESS_NODE(b)) PLUS 1)]"),
+		("a < b < c", "[((VARIABLE_ACCESS_NODE(a) LESS_THAN VARIABLE_ACCESS_NODE(b)) LESS_THAN VARIABLE_ACCESS_NODE(c))]"),
+		("NOT a == b", "[(KEYWORD (VARIABLE_ACCESS_NODE(a) DOUBLE_EQUALS VARIABLE_ACCESS_NODE(b)))]"),
+		("NOT a + b", "[((KEYWORD VARIABLE_ACCESS_NODE(a)) PLUS VARIABLE_ACCESS_NODE(b))]"),
+		("a + NOT b", "[(VARIABLE_ACCESS_NODE(a) PLUS (KEYWORD VARIABLE_ACCESS_NODE(b)))]"),
+		("f(x)[0].k * 2", "[(GET_ATTRIBUTE_NODE(GET_ITEM_NODE(FUNCTION_CALL_NODE(VARIABLE_ACCESS_NODE(f), [VARIABLE_ACCESS_NODE(x)]), 0), k) MULTIPLY 2)]"),
+		("(1 + 2) * 3", "[((1 PLUS 2) MULTIPLY 3)]")
+	])
+	def testPrecedence(self, code, tree):
+		assert parse(code) == tree
+
+	@pytest.mark.parametrize("code", ["a == NOT b", "- NOT a", "a * NOT b", "[1 + 2]"])
+	def testRejected(self, code):
+		assert not parse(code).startswith("[")
@@ -0,0 +1,51 @@
+import pytest
+from vlbasic.tokenizer import Tokenizer
+from vlbasic.parser import Parser
+from vlbasic.statementclass import VariableAccessNode
+
+def parse(code):
+	tokens, error = Tokenizer("TEST", code).tokenize()
+	assert not error
+
+	statements, error = Parser("TEST", tokens).parse()
+	assert not error
+
+	return statements
+
+class TestResolver:
+	def testModuleScopeUsesNames(self):
+		statements = parse("LET a = 1\na")
+
+		assert statements[0].slot is None
+		assert statements[1].slot is None
+
+	def testLocalSlots(self):
+		func = parse("FUNCTION f(a, b)\n\tLET c = a\n\tRETURN c + b\nEND")[0]
+
+		assert func.layout == {"a": 0, "b": 1, "c": 2}
+
+		declare = func.body[0]
+		assert (declare.depth, declare.slot) == (0, 2)
+		assert (declare.valueNode.depth, declare.valueNode.slot) == (0, 0)
+
+	def testEnclosingFunction(self):
+		outer = parse("FUNCTION f(a)\n\tFUNCTION g()\n\t\tRETURN a + b\n\tEND\nEND")[0]
+		inner = outer.body[0]
+		access = inner.body[0].value
+
+		assert outer.layout == {"a": 0, "g": 1}
+		assert (access.left.depth, access.left.slot) == (1, 0)
+		assert access.right.slot is None
+
+	def testBuiltinsAreNotSlotted(self):
+		func = parse("FUNCTION f(PRINT)\n\tPRINT(1)\nEND")[0]
+
+		assert func.layout == {}
+		assert func.body[0].func.slot is None
+
+	def testImportMakesScopeDynamic(self):
+		outer = parse("FUNCTION f(a)\n\tFUNCTION g()\n\t\tIMPORT \"x\"\n\t\tRETURN a\n\tEND\nEND")[0]
+		access = outer.body[0].body[1].value
+
+		assert isinstance(access, VariableAccessNode)
+		assert access.slot is None
@@ -0,0 +1,427 @@
+import pytest
+from vlbasic.runtimevaluesclass import String, StringBuilder, STRING_BUILDER_MIN_LENGTH, Null, List, Range, NumberList, Dictionary, PythonGenerator, makeList, NUMBER_LIST_MIN_LENGTH, makeNumber, makeBoolean, makeNull, TRUE, FALSE, NULL, SMALL_INT_MAX
+from vlbasic.utils import StartEndPosition, File, InterpretFile
+from vlbasic.tokenizer import Tokenizer
+from vlbasic.parser import Parser
+from vlbasic.contextclass import Context, VariableTable
+from vlbasic.interpreter import Interpreter
+
+position = StartEndPosition(File("TEST", ""), 0)
+
+class TestSharedValues:
+	def testSmallIntegers(self):
+		assert makeNumber(5, position, None) is makeNumber(5, position, None)
+		assert makeNumber(-1, position, None) is makeNumber(-1, position, None)
+
+	def testOtherNumbers(self):
+		assert makeNumber(SMALL_INT_MAX + 1, position, None) is not makeNumber(SMALL_INT_MAX + 1, position, None)
+		assert makeNumber(1.0, position, None) is not makeNumber(1, position, None)
+		assert makeNumber(1.0, position, None).value == 1.0
+
+	def testSingletons(self):
+		assert makeBoolean(True, position, None) is TRUE
+		assert makeBoolean(0, position, None) is FALSE
+		assert makeNull(position, None) is NULL
+
+	def testOperationsReturnShared(self):
+		result, error = makeNumber(2, position, None).added(makeNumber(3, position, None), position)
+
+		assert error is None
+		assert result is makeNumber(5, position, None)
+
+		result, error = result.lessThan(makeNumber(10, position, None), position)
+
+		assert error is None
+		assert result is TRUE
+
+	# Shared values have no position in the program, errors about them point to
+	# the expression instead
+	def testErrorPosition(self):
+		tokens, _ = Tokenizer("TEST", "LET x = TRUE\nPRINT([x->3])").tokenize()
+		statements, _ = Parser("TEST", tokens).parse()
+
+		context = Context("TEST")
+		context.setVariableTable(VariableTable())
+
+		_, error = Interpreter(statements, InterpretFile("TEST", None)).interpret(context)
+
+		assert error.position.file.lineColumn(error.position.start) == (2, 7)
+		assert "ln: 2, col: 7" in repr(error)
+
+class TestCompactLayouts:
+	def testValuesHaveNoDict(self):
+		assert not hasattr(makeNumber(SMALL_INT_MAX + 1, position, None), "__dict__")
+		assert not hasattr(NULL, "__dict__")
+
+	def testNodesHaveNoDict(self):
+		tokens, error = Tokenizer("TEST", "FUNCTION f(a)\n\tRETURN a + 1\nEND\nf(1)").tokenize()
+		assert error is None
+
+		statements, error = Parser("TEST", tokens).parse()
+		assert error is None
+
+		for node in [statements[0], statements[0].body[0], statements[1], tokens[0]]:
+			assert not hasattr(node, "__dict__")
+
+	def testLoopFlagsAreCleared(self):
+		tokens, _ = Tokenizer("TEST", "FOR x IN [1, 2] THEN\n\tIF x == 1 THEN\n\t\tCONTINUE\n\tEND\n\tBREAK\nEND").tokenize()
+		statements, _ = Parser("TEST", tokens).parse()
+
+		context = Context("TEST")
+		context.setVariableTable(VariableTable())
+
+		interpreter = Interpreter(statements, InterpretFile("TEST", None))
+		_, error = interpreter.interpret(context)
+
+		assert error is None
+		assert not interpreter.breakLoop
+		assert not interpreter.continueLoop
+
+class TestDictionaryKeys:
+	def testValuesHashByValue(self):
+		assert String("a", position, None) == String("a", position, None)
+		assert hash(String("a", position, None)) == hash(String("a", position, None))
+		assert makeNumber(SMALL_INT_MAX + 1, position, None) == makeNumber(SMALL_INT_MAX + 1, position, None)
+		assert makeNumber(1.0, position, None) == makeNumber(1, position, None)
+		assert Null(position, None) == NULL
+
+	def testTypesAreDifferentKeys(self):
+		assert makeNumber(1, position, None) != TRUE
+		assert String("1", position, None) != makeNumber(1, position, None)
+		assert List([], position, None) != List([], position, None)
+
+	def testLookup(self):
+		dictionary = Dictionary({}, position, None)
+		for i in range(1000):
+			dictionary.setItem(String(f"key{i}", position, None), makeNumber(i, position, None), position)
+
+		value, error = dictionary.getItem(String("key500", position, None), position)
+
+		assert error is None
+		assert value.value == 500
+
+		_, error = dictionary.getItem(String("missing", position, None), position)
+
+		assert error is not None
+
+	def testSetReplaces(self):
+		dictionary = Dictionary({}, position, None)
+		dictionary.setItem(String("a", position, None), makeNumber(1, position, None), position)
+		dictionary.setItem(String("a", position, None), makeNumber(2, position, None), position)
+
+		assert len(dictionary.value) == 1
+		assert dictionary.getItem(String("a", position, None), position)[0].value == 2
+
+	def testUnhashableKeysCompareByValue(self):
+		dictionary = Dictionary({}, position, None)
+		dictionary.setItem(List([makeNumber(1, position, None), makeNumber(2, position, None)], position, None), makeNumber(3, position, None), position)
+		dictionary.setItem(List([makeNumber(1, position, None), makeNumber(2, position, None)], position, None), makeNumber(4, position, None), position)
+
+		value, error = dictionary.getItem(List([makeNumber(1, position, None), makeNumber(2, position, None)], position, None), position)
+
+		assert error is None
+		assert value.value == 4
+		assert len(dictionary.value) == 1
+
+		_, error = dictionary.getItem(List([makeNumber(2, position, None), makeNumber(1, position, None)], position, None), position)
+
+		assert error is not None
+
+	def testBooleanDoesNotFindNumber(self):
+		dictionary = Dictionary({makeNumber(1, position, None): String("a", position, None)}, position, None)
+
+		_, error = dictionary.getItem(TRUE, position)
+
+		assert error is not None
+
+	@pytest.mark.parametrize("code, expected", [
+		("LET d = {\"a\": 1, 2: \"b\", TRUE: 3, NULL: 4}\nLET r = [d[\"a\"], d[2], d[TRUE], d[NULL]]\n", "LIST([NUMBER(1), STRING(b), NUMBER(3), NUMBER(4)])"),
+		("LET d = {\"a\": 1}\nd[\"a\"] = 2\nd[\"b\"] = 3\nLET r = [d[\"a\"], d[\"b\"], d]\n", "LIST([NUMBER(2), NUMBER(3), DICTIONARY({STRING(a): NUMBER(2), STRING(b): NUMBER(3)})])"),
+		("LET a = {\"a\": 1, \"b\": 2}\nLET b = {\"b\": 2, \"a\": 1}\nLET r = a == b\n", "BOOLEAN(True)"),
+		("LET a = {\"a\": 1, \"b\": 2}\nLET b = {\"a\": 1, \"b\": 3}\nLET r = a == b\n", "BOOLEAN(False)"),
+		("LET a = {\"a\": 1}\nLET b = {\"c\": 1}\nLET r = a != b\n", "BOOLEAN(True)"),
+		("LET d = {}\nd[[1, 2]] = 3\nLET r = d[[1, 2]]\n", "NUMBER(3)"),
+		("LET a = {[1]: 2}\nLET b = {[1]: 2}\nLET r = a == b\n", "BOOLEAN(True)"),
+		("LET d = {TRUE: \"a\", FALSE: \"b\"}\nLET r = [d[1], d[2], d[0]]\n", "LIST([STRING(a), STRING(a), STRING(b)])"),
+		("LET d = {TRUE: \"a\", 1: \"b\"}\nLET r = [d[1], d[TRUE]]\n", "LIST([STRING(b), STRING(a)])"),
+		("LET d = {TRUE: \"a\"}\nd[1] = \"b\"\nLET r = d\n", "DICTIONARY({BOOLEAN(True): STRING(b)})")
+	])
+	def testInPrograms(self, code, expected):
+		tokens, error = Tokenizer("TEST", code).tokenize()
+		assert error is None
+
+		statements, error = Parser("TEST", tokens).parse()
+		assert error is None
+
+		context = Context("TEST")
+		context.setVariableTable(VariableTable())
+
+		_, error = Interpreter(statements, InterpretFile("TEST", None)).interpret(context)
+		assert error is None
+
+		result, _ = context.variableTable.lookupVariable("r", None)
+
+		assert repr(result) == expected
+
+class TestRange:
+	def testNotMaterialized(self):
+		numbers = Range(range(0, 10 ** 9, 3), position, None)
+
+		length, _ = numbers.getLength(position)
+		item, _ = numbers.getItem(makeNumber(1000, position, None), position)
+		first = next(numbers.iterate(position, None)[0])
+
+		assert (length.value, item.value, first.value) == (333333334, 3000, 0)
+		assert numbers.expressions is None
+
+		_, error = numbers.getItem(makeNumber(333333334, position, None), position)
+
+		assert error is not None
+
+	def testZeroStep(self):
+		tokens, _ = Tokenizer("TEST", "LET x = [1->5->0]").tokenize()
+		statements, _ = Parser("TEST", tokens).parse()
+
+		context = Context("TEST")
+		context.setVariableTable(VariableTable())
+
+		_, error = Interpreter(statements, InterpretFile("TEST", None)).interpret(context)
+
+		assert error.name == "ValueError"
+		assert error.position.file.lineColumn(error.position.start) == (1, 15)
+
+	def testMaterializedWhenChanged(self):
+		numbers = Range(range(3), position, None)
+		numbers.setItem(makeNumber(0, position, None), String("a", position, None), position)
+
+		assert repr(numbers) == "LIST([STRING(a), NUMBER(1), NUMBER(2)])"
+		assert [item.value for item in numbers.iterate(position, None)[0]] == ["a", 1, 2]
+
+	def testToString(self):
+		text, error = Range(range(5, 0, -2), position, None).toString(position)
+
+		assert error is None
+		assert text.value == "[5, 3, 1]"
+
+class TestIterate:
+	def testString(self):
+		items, error = String("abc", position, None).iterate(position, None)
+
+		assert error is None
+		assert [item.value for item in items] == ["a", "b", "c"]
+
+	def testDictionaryKeys(self):
+		dictionary = Dictionary({String("a", position, None): NULL}, position, None)
+
+		items, _ = dictionary.iterate(position, None)
+		for key in items:
+			dictionary.setItem(String(key.value + "!", position, None), NULL, position)
+
+		assert len(dictionary.value) == 2
+
+	def testNotIterable(self):
+		_, error = makeNumber(1, position, None).iterate(position, None)
+
+		assert error.name == "InvalidIteratorError"
+
+	def testPythonGenerator(self):
+		made = []
+
+		def numbers():
+			for i in range(3):
+				made.append(i)
+				yield i
+
+		interpreter = Interpreter([], InterpretFile("TEST", None))
+		generator, error = interpreter.convertValue(numbers(), position, None, "TEST")
+		assert error is None
+		assert isinstance(generator, PythonGenerator)
+
+		items, _ = generator.iterate(position, None)
+
+		assert next(items).value == 0
+		assert made == [0]
+		assert [item.value for item in items] == [1, 2]
+
+	def testPythonGeneratorError(self):
+		interpreter = Interpreter([], InterpretFile("TEST", None))
+		generator, _ = interpreter.convertValue(iter([1, object(), 2]), position, None, "TEST")
+
+		items, _ = generator.iterate(position, None)
+		items = list(items)
+
+		assert len(items) == 2
+		assert items[0].value == 1
+		assert "Cannot convert" in items[1].details
+
+class TestNumberList:
+	def numbers(self, values):
+		return [makeNumber(value, position, None) for value in values]
+
+	@pytest.mark.parametrize("values, typecode", [
+		(range(100), "q"),
+		([0.5 * i for i in range(100)], "d")
+	])
+	def testPacked(self, values, typecode):
+		numbers = makeList(self.numbers(values), position, None)
+
+		assert isinstance(numbers, NumberList)
+		assert numbers.numbers.typecode == typecode
+		assert [item.value for item in numbers.items()] == list(values)
+
+	@pytest.mark.parametrize("values", [
+		range(NUMBER_LIST_MIN_LENGTH - 1),
+		[1, 2.5] * NUMBER_LIST_MIN_LENGTH,
+		[2 ** 70] * NUMBER_LIST_MIN_LENGTH
+	])
+	def testNotPacked(self, values):
+		assert type(makeList(self.numbers(values), position, None)) is List
+
+	def testNotPackedWithOtherValues(self):
+		expressions = self.numbers(range(NUMBER_LIST_MIN_LENGTH)) + [String("a", position, None)]
+
+		assert type(makeList(expressions, position, None)) is List
+
+	def testSetItem(self):
+		numbers = makeList(self.numbers(range(100)), position, None)
+
+		numbers.setItem(makeNumber(1, position, None), makeNumber(2 ** 40, position, None), position)
+		item, _ = numbers.getItem(makeNumber(1, position, None), position)
+
+		assert item.value == 2 ** 40
+		assert numbers.expressions is None
+
+		numbers.setItem(makeNumber(2, position, None), makeNumber(0.5, position, None), position)
+
+		assert numbers.expressions is not None
+		assert [item.value for item in numbers.items()][:3] == [0, 2 ** 40, 0.5]
+
+	def testRangeStaysPacked(self):
+		numbers = Range(range(10), position, None)
+		numbers.setItem(makeNumber(0, position, None), makeNumber(9, position, None), position)
+
+		text, _ = numbers.toString(position)
+
+		assert numbers.numbers.typecode == "q"
+		assert text.value == "[9, 1, 2, 3, 4, 5, 6, 7, 8, 9]"
+
+	def testSameAsList(self):
+		values = [1.5, -2.0, 1e300, float("inf")] * 5
+		numbers = makeList(self.numbers(values), position, None)
+		expressions = List(self.numbers(values), position, None)
+
+		assert repr(numbers) == repr(expressions)
+		assert numbers.toString(position)[0].value == expressions.toString(position)[0].value
+		assert numbers.equals(expressions, position)[0] is TRUE
+
+class TestListMethods:
+	def call(self, value, name, *arguments):
+		function, error = value.getAttribute(String(name, position, None), position)
+		assert error is None
+
+		return function.execute(list(arguments), position)
+
+	def testAppendStaysPacked(self):
+		numbers = Range(range(NUMBER_LIST_MIN_LENGTH), position, None)
+
+		_, error = self.call(numbers, "APPEND", makeNumber(100, position, None))
+
+		assert error is None
+		assert numbers.numbers.typecode == "q"
+		assert numbers.numbers[-1] == 100
+
+		self.call(numbers, "APPEND", String("a", position, None))
+
+		assert numbers.expressions is not None
+		assert numbers.toString(position)[0].value.endswith("100, a]")
+
+	def testPopAndSlice(self):
+		numbers = makeList([makeNumber(value, position, None) for value in range(20)], position, None)
+
+		item, error = self.call(numbers, "POP", makeNumber(0, position, None))
+		part, _ = self.call(numbers, "SLICE", makeNumber(2, position, None), makeNumber(5, position, None))
+
+		assert error is None
+		assert item.value == 0
+		assert numbers.length() == 19
+		assert repr(part) == "LIST([NUMBER(3), NUMBER(4), NUMBER(5)])"
+
+	@pytest.mark.parametrize("name, arguments", [
+		("POP", [makeNumber(3, position, None)]),
+		("SLICE", [makeNumber(2, position, None), makeNumber(1, position, None)]),
+		("SLICE", [makeNumber(0.5, position, None)]),
+		("SORT", [makeNumber(1, position, None)])
+	])
+	def testErrors(self, name, arguments):
+		_, error = self.call(makeList([makeNumber(1, position, None)], position, None), name, *arguments)
+
+		assert error is not None
+
+	@pytest.mark.parametrize("name, expected", [
+		("MAP", "LIST([NUMBER(2), NUMBER(4)])"),
+		("FILTER", "LIST([NUMBER(1), NUMBER(2)])"),
+		("REDUCE", "NUMBER(4)")
+	])
+	def testPythonFunctionCallback(self, name, expected):
+		double, error = Interpreter([], InterpretFile("TEST", None)).convertValue(lambda arguments, context, error: (arguments[-1].value * 2, None), position, None, "TEST", "DOUBLE", {"parameters": [1, 2]})
+		assert error is None
+
+		result, error = self.call(makeList([makeNumber(1, position, None), makeNumber(2, position, None)], position, None), name, double)
+
+		assert error is None
+		assert repr(result) == expected
+
+	def testSortPacked(self):
+		numbers = makeList([makeNumber(value, position, None) for value in [3.5, -1.0, 2.0] * 10], position, None)
+
+		_, error = self.call(numbers, "SORT")
+
+		assert error is None
+		assert numbers.numbers.typecode == "d"
+		assert list(numbers.numbers) == sorted([3.5, -1.0, 2.0] * 10)
+
+class TestStringBuilder:
+	def testLongStringsAreBuilt(self):
+		text = String("a" * STRING_BUILDER_MIN_LENGTH, position, None)
+
+		for _ in range(3):
+			text, error = text.added(String("b", position, None), position)
+			assert error is None
+
+		assert isinstance(text, StringBuilder)
+		assert text.count == 4
+		assert text.value == "a" * STRING_BUILDER_MIN_LENGTH + "bbb"
+		assert text.count == 1
+
+	def testShortStringsAreNotBuilt(self):
+		text, _ = String("a", position, None).added(String("b", position, None), position)
+
+		assert type(text) is String
+
+	def testSharedParts(self):
+		start, _ = String("a" * STRING_BUILDER_MIN_LENGTH, position, None).added(String("", position, None), position)
+
+		first, _ = start.added(String("1", position, None), position)
+		second, _ = start.added(String("2", position, None), position)
+		third, _ = first.added(String("3", position, None), position)
+
+		assert first.parts is third.parts
+		assert second.parts is not first.parts
+		assert [text.value[-2:] for text in (first, second, third)] == ["a1", "a2", "13"]
+
+	def testSameAsString(self):
+		built, _ = String("x" * STRING_BUILDER_MIN_LENGTH, position, None).added(String("y", position, None), position)
+		text = String("x" * STRING_BUILDER_MIN_LENGTH + "y", position, None)
+
+		assert built == text and hash(built) == hash(text)
+		assert built.equals(text, position)[0] is TRUE
+		assert Dictionary({text: makeNumber(1, position, None)}, position, None).getItem(built, position)[0].value == 1
+
+	def testToString(self):
+		numbers = List([makeNumber(1, position, None), String("a", position, None)], position, None)
+		dictionary = Dictionary({String("a", position, None): numbers}, position, None)
+
+		assert numbers.toString(position)[0].value == "[1, a]"
+		assert dictionary.toString(position)[0].value == "{a: [1, a]}"
+		assert List([], position, None).toString(position)[0].value == "[]"
+		assert Dictionary({}, position, None).toString(position)[0].value == "{}"
@@ -0,0 +1,129 @@
+import functools
+import pytest
+from vlbasic.tokenizer import Tokenizer
+from vlbasic.parser import Parser
+from vlbasic.contextclass import Context, VariableTable
+from vlbasic.interpreter import Interpreter
+from vlbasic.vm import VM
+from vlbasic.closurecompiler import ClosureInterpreter
+from vlbasic.utils import InterpretFile
+from vlbasic.statementclass import ReturnNode
+
+# Every source nests far past the recursion limit, DEPTH levels deep or a tenth
+# of that for the blocks that are slower to parse
+
+DEPTH = 100000
+BLOCKS = DEPTH // 10
+
+# Function calls still recurse, every engine has to reach at least its depth
+# here under the default recursion limit
+
+RECURSION = {Interpreter: 120, VM: 300, ClosureInterpreter: 120}
+
+ENGINES = [Interpreter, VM, ClosureInterpreter]
+
+SOURCES = {
+	"chain": (" + ".join(["1"] * DEPTH), f"[NUMBER({DEPTH})]"),
+	"right nested": ("(1 + " * DEPTH + "1" + ")" * DEPTH, f"[NUMBER({DEPTH + 1})]"),
+	"parentheses": ("(" * DEPTH + "2" + ")" * DEPTH + " ^ 3", "[NUMBER(8)]"),
+	"unary": ("-" * (DEPTH + 1) + "1", "[NUMBER(-1)]"),
+	"not": ("NOT " * DEPTH + "1 == 2", "[BOOLEAN(False)]"),
+	"elseif chain": ("LET a = 7\nIF a == -1 THEN\n\t0\n" + "".join(f"ELSEIF a == {i} THEN\n\t{i}\n" for i in range(DEPTH // 10)) + "END\na", "[NUMBER(7), NULL(), NUMBER(7)]"),
+	"call": ("NUMBER(" * DEPTH + "1" + ")" * DEPTH, "[NUMBER(1)]"),
+	"list": ("[" * DEPTH + "1" + "]" * DEPTH + " == 1", "[BOOLEAN(False)]"),
+	"if": ("IF TRUE THEN\n" * DEPTH + "1\n" + "END\n" * DEPTH, "[NULL()]"),
+	"for": ("FOR i IN [1] THEN\n" * BLOCKS + "1\n" + "END\n" * BLOCKS, "[NULL()]"),
+	"while": ("LET n = 0\n" + "WHILE n < 1 THEN\n" * BLOCKS + "n += 1\n" + "END\n" * BLOCKS + "n", "[NUMBER(0), NULL(), NUMBER(1)]"),
+	"function": ("FUNCTION f()\n" * BLOCKS + "END\n" * BLOCKS + "f()", "[NULL(), NULL()]"),
+	"return": ("FUNCTION f()\n" + "IF TRUE THEN\n" * BLOCKS + "RETURN 5\n" + "END\n" * BLOCKS + "END\nf()", "[NULL(), NUMBER(5)]"),
+	"break": ("FOR i IN [1, 2] THEN\n" + "IF TRUE THEN\n" * BLOCKS + "BREAK\n" + "END\n" * BLOCKS + "END\ni", "[NULL(), NUMBER(1)]"),
+	"continue": ("LET n = 0\nFOR i IN [1, 2] THEN\n" + "IF TRUE THEN\n" * BLOCKS + "CONTINUE\n" + "END\n" * BLOCKS + "n += 1\nEND\nn", "[NUMBER(0), NULL(), NUMBER(0)]"),
+	"error": (" + ".join(["1"] * DEPTH) + " + \"a\" + 1", None)
+}
+
+# Parsing is the slow part, every source is parsed once and run by all engines
+
+@functools.cache
+def parse(name):
+	tokens, error = Tokenizer("TEST", SOURCES[name][0]).tokenize()
+	assert not error
+
+	statements, error = Parser("TEST", tokens).parse()
+	assert not error
+
+	return statements
+
+def run(name, engine):
+	context = Context("TEST")
+	context.setVariableTable(VariableTable())
+
+	out, error = engine(parse(name), InterpretFile("TEST", None)).interpret(context)
+
+	return repr(out), error
+
+class TestDeepNesting:
+	@pytest.mark.parametrize("engine", ENGINES)
+	@pytest.mark.parametrize("name", [name for name in SOURCES if name != "error"])
+	def testRuns(self, name, engine):
+		assert run(name, engine) == (SOURCES[name][1], None)
+
+	@pytest.mark.parametrize("engine", ENGINES)
+	def testErrorDeepInside(self, engine):
+		out, error = run("error", engine)
+
+		assert out == "None"
+		assert (error.name, error.details) == ("ValueError", "Unable to add Number to String")
+		assert error.position.end == len(SOURCES["error"][0]) - 4
+
+# Only calls of functions recurse, too deep recursion is reported as an error
+# instead of crashing
+
+class TestTooDeep:
+	@pytest.mark.parametrize("engine", ENGINES)
+	def testRecursionIsError(self, engine):
+		tokens, _ = Tokenizer("TEST", "FUNCTION f(n)\n\tRETURN f(n + 1)\nEND\nf(0)").tokenize()
+		statements, _ = Parser("TEST", tokens).parse()
+
+		context = Context("TEST")
+		context.setVariableTable(VariableTable())
+
+		out, error = engine(statements, InterpretFile("TEST", None)).interpret(context)
+
+		assert out is None
+		assert (error.name, error.details) == ("RecursionError", "Functions are called too deeply")
+		assert error.position.file.lineColumn(error.position.start) == (2, 11)
+
+	@pytest.mark.parametrize("engine", ENGINES)
+	@pytest.mark.parametrize("body", ["IF n > 0 THEN\n\t\tf(n - 1)\n\tEND", "IF n > 0 THEN\n\t\tRETURN f(n - 1)\n\tEND", "WHILE n > 0 THEN\n\t\tf(n - 1)\n\t\tBREAK\n\tEND"])
+	def testRecursionDepth(self, engine, body):
+		tokens, _ = Tokenizer("TEST", f"FUNCTION f(n)\n\t{body}\nEND\nf({RECURSION[engine]})").tokenize()
+		statements, _ = Parser("TEST", tokens).parse()
+
+		context = Context("TEST")
+		context.setVariableTable(VariableTable())
+
+		out, error = engine(statements, InterpretFile("TEST", None)).interpret(context)
+
+		assert error is None
+		assert repr(out) == "[NULL(), NULL()]"
+
+	def testStateRestoredAfterRecursion(self):
+		tokens, _ = Tokenizer("TEST", "FUNCTION f()\n\tRETURN 1\nEND").tokenize()
+		statements, _ = Parser("TEST", tokens).parse()
+
+		context = Context("TEST")
+		context.setVariableTable(VariableTable())
+
+		interpreter = Interpreter(statements, InterpretFile("TEST", None))
+		interpreter.interpret(context)
+		func, _ = context.variableTable.lookupVariable("f", None)
+
+		def tooDeep(*arguments):
+			raise RecursionError
+
+		interpreter.dispatchTable = {**Interpreter.dispatchTable, ReturnNode: tooDeep}
+		_, error = interpreter.callFunction(func, [], statements[0].position, context)
+
+		assert error.name == "RecursionError"
+		assert interpreter.returnValue is None
+		assert not interpreter.isAFunction
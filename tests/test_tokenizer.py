@@ -0,0 +1,215 @@
+import glob
+import os
+import pytest
+from vlbasic.tokenizer import Tokenizer, CharacterTokenizer
+from vlbasic.tokenclass import TokenTypes
+from vlbasic.keywords import Keywords
+from vlbasic.parser import Parser
+from vlbasic.utils import File, readSource
+from .test_vm import PROGRAMS
+
+EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "examples", "*.vlb")))
+
+SOURCES = [
+	"",
+	" ",
+	"\n",
+	"a;b\n\n;",
+	"# only a comment",
+	"LET x = 1 # trailing comment\nx",
+	"1.5 + 2. - 3.25.4 * 1..2",
+	"12abc_d e_ 7",
+	"a+=1 b-=2 c*=3 d/=4 e->f g==h i!=j k>=l m<=n o>p q<r",
+	"[1->10->2] {\"a\": 1}.a ^ 2 % 3 (x)",
+	"'single \" quote' \"double ' quote\"",
+	"\"escapes \\\\ \\n \\r \\t \\b \\\" end\" 'and \\' this'",
+	"\tLET\ttabbed = 1\n\t\tx",
+	"WHILE NOT TRUE THEN\nEND",
+	"\"unterminated",
+	"\"unterminated\nnext line",
+	"'unterminated at end\n",
+	"\"bad \\q escape\"",
+	"'wrong \\\" quote'",
+	"\"escape at end \\",
+	"a ! b",
+	"a !",
+	"a ? b",
+	"1 + 2\r\n",
+	"x = 1 @"
+]
+
+def readExample(path):
+	with open(path, "r") as file:
+		return file.read()
+
+def scan(tokenizerClass, code):
+	tokens, error = tokenizerClass("TEST", code).tokenize()
+
+	if error:
+		return None, (error.name, error.details, error.position.start, error.position.end)
+
+	return [(token.type, token.value, token.position.start, token.position.end) for token in tokens], None
+
+class TestTokenizer:
+	@pytest.mark.parametrize("code", SOURCES + PROGRAMS + [readExample(path) for path in EXAMPLES])
+	def testSameAsCharacterTokenizer(self, code):
+		assert scan(Tokenizer, code) == scan(CharacterTokenizer, code)
+
+	def testTokens(self):
+		tokens, error = Tokenizer("TEST", "LET a1 = 2.5").tokenize()
+
+		assert error is None
+		assert [token.type for token in tokens] == [TokenTypes.KEYWORD, TokenTypes.IDENTIFIER, TokenTypes.INTEGER, TokenTypes.EQUALS, TokenTypes.FLOAT, TokenTypes.EOF]
+		assert [token.value for token in tokens[:-1]] == ["LET", "a", 1, None, 2.5]
+
+	@pytest.mark.parametrize("tokenizerClass", [Tokenizer, CharacterTokenizer])
+	def testKeywords(self, tokenizerClass):
+		tokens, error = tokenizerClass("TEST", "IF a THEN\nLET b = a\nEND").tokenize()
+
+		assert error is None
+		assert [token.keyword for token in tokens if token.type == TokenTypes.KEYWORD] == [Keywords.IF, Keywords.THEN, Keywords.LET, Keywords.END]
+		assert tokens[0].isKeyword(Keywords.IF)
+		assert tokens[0].isOneOfKeywords((Keywords.ELSE, Keywords.IF))
+		assert not tokens[1].isKeyword(Keywords.IF)
+
+	@pytest.mark.parametrize("code", ["total = total + 1", "total = total + 1".encode()])
+	def testIdentifiersAreInterned(self, code):
+		tokens, error = Tokenizer("TEST", code).tokenize()
+
+		assert error is None
+		assert tokens[0].value is tokens[2].value
+
+	def testErrors(self):
+		_, error = Tokenizer("TEST", "a ? b").tokenize()
+		assert error.name == "IllegalCharacterError"
+
+		_, error = Tokenizer("TEST", "\"abc").tokenize()
+		assert error.name == "ExpectedCharacterError"
+
+def parse(code, stream):
+	tokenizer = Tokenizer("TEST", code)
+
+	if stream:
+		tokens = tokenizer.generateTokens()
+	else:
+		tokens, error = tokenizer.tokenize()
+		if error:
+			return None, (error.name, error.details, error.position.start)
+
+	statements, error = Parser("TEST", tokens).parse()
+	if error:
+		return None, (error.name, error.details, error.position.start)
+
+	return repr(statements), None
+
+class TestStreaming:
+	@pytest.mark.parametrize("code", SOURCES + PROGRAMS + [readExample(path) for path in EXAMPLES] + [
+		"LET = 1\na ? b",
+		"LET a = (1 + \"abc",
+		"PRINT(1)\n\"abc"
+	])
+	def testSameAsList(self, code):
+		assert parse(code, True) == parse(code, False)
+
+	def testTokensAreReadLazily(self):
+		read = []
+
+		def counted(tokens):
+			for token in tokens:
+				read.append(token)
+				yield token
+
+		parser = Parser("TEST", counted(Tokenizer("TEST", "LET a = 1\n" * 100).generateTokens()))
+
+		assert len(read) == 2
+
+		statement, error = parser.statement()
+
+		assert error is None
+		assert len(read) < 10
+
+		statements, error = parser.parse()
+
+		assert error is None
+		assert len(statements) == 99
+
+class TestMappedSource:
+	@pytest.mark.parametrize("code", [code for code in SOURCES + PROGRAMS + [readExample(path) for path in EXAMPLES] if code.isascii() and "\r" not in code])
+	def testSameAsStr(self, code):
+		assert scan(Tokenizer, code.encode()) == scan(Tokenizer, code)
+
+	def testReadSource(self, tmp_path):
+		path = tmp_path / "source.vlb"
+		path.write_bytes("LET s = \"é\"\r\nPRINT(s, x)\r\n".encode())
+
+		tokens, error = Tokenizer(str(path), readSource(str(path))).tokenize()
+
+		assert error is None
+		assert tokens[3].value == "é"
+		assert [token.type for token in tokens].count(TokenTypes.NEW_LINE) == 2
+
+		line, column = tokens[-4].position.file.lineColumn(tokens[-4].position.start)
+		assert (tokens[-4].value, line, column) == ("x", 2, 9)
+
+	def testEmptyFile(self, tmp_path):
+		path = tmp_path / "empty.vlb"
+		path.write_bytes(b"")
+
+		tokens, error = Tokenizer(str(path), readSource(str(path))).tokenize()
+
+		assert error is None
+		assert [token.type for token in tokens] == [TokenTypes.EOF]
+
+	def testMappingClosed(self, tmp_path):
+		path = tmp_path / "source.vlb"
+		path.write_bytes(b"LET a = 1\nPRINT(a)\n")
+
+		tokens, error = Tokenizer(str(path), readSource(str(path))).tokenize()
+		file = tokens[0].position.file
+
+		assert error is None
+		assert type(file.text) is bytes
+
+		path.write_bytes(b"")
+
+		assert file.lineText(2) == "PRINT(a)"
+
+	def testMappingClosedWhenAbandoned(self, tmp_path):
+		path = tmp_path / "source.vlb"
+		path.write_bytes(b"LET a = 1\nPRINT(a)\n")
+
+		tokenizer = Tokenizer(str(path), readSource(str(path)))
+		tokens = tokenizer.generateTokens()
+		next(tokens)
+		tokens.close()
+
+		assert type(tokenizer.file.text) is bytes
+
+	def testErrorPositionsInBytes(self):
+		_, error = Tokenizer("TEST", "LET é = 1 ?".encode()).tokenize()
+
+		assert error.details == "'é' is not a valid character"
+		assert error.position.file.lineColumn(error.position.start) == (1, 4)
+
+		code = "\"é\" + 'ü\\q'"
+		_, error = Tokenizer("TEST", code.encode()).tokenize()
+		_, strError = Tokenizer("TEST", code).tokenize()
+
+		assert error.name == "ExpectedCharacterError"
+		assert error.position.file.lineColumn(error.position.start) == strError.position.file.lineColumn(strError.position.start) == (1, 9)
+
+class TestFile:
+	def testTabsExpandInColumns(self):
+		file = File("TEST", "a\n\tb\tc")
+
+		assert file.lineColumn(0) == (1, 0)
+		assert file.lineColumn(3) == (2, 4)
+		assert file.lineColumn(5) == (2, 9)
+		assert file.lineText(2) == "    b    c"
+
+	def testPastEnd(self):
+		file = File("TEST", "ab")
+
+		assert file.lineColumn(3) == (1, 3)
+		assert file.lineColumn(-1) == (-1, -1)
+		assert file.lineText(-1) == ""
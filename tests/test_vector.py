@@ -0,0 +1,98 @@
+import pytest
+from array import array
+from vlbasic import vector
+from vlbasic.runtimevaluesclass import NumberList, String, makeNumber, makeList
+from vlbasic.utils import StartEndPosition, File
+from vlbasic.interpreter import Interpreter
+from .test_vm import run
+
+position = StartEndPosition(File("TEST", ""), 0)
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+	if request.param == "python":
+		monkeypatch.setattr(vector, "numpy", None)
+	else:
+		monkeypatch.setattr(vector, "numpy", pytest.importorskip("numpy"))
+
+	return request.param
+
+def numbers(values):
+	return makeList([makeNumber(value, position, None) for value in values], position, None)
+
+def call(value, name, *arguments):
+	function, error = value.getAttribute(String(name, position, None), position)
+	assert error is None
+
+	return function.execute(list(arguments), position)
+
+class TestVector:
+	@pytest.mark.parametrize("operation, left, right", [
+		("+", range(20), range(20, 40)),
+		("-", [0.5 * i for i in range(20)], 3),
+		("*", range(-10, 10), 2.5),
+		("/", range(20), range(1, 21)),
+		("*", [2 ** 40] * 20, [2 ** 40] * 20),
+		("+", [2 ** 62] * 20, [2 ** 62] * 20),
+		("/", [2 ** 60 + 1] * 20, 3),
+		("+", range(20), 2 ** 70)
+	])
+	def testElementwise(self, backend, operation, left, right):
+		leftNumbers = numbers(left).numberValues()
+		rightNumbers = right if isinstance(right, (int, float)) else numbers(right).numberValues()
+
+		rightValues = [right] * len(left) if isinstance(right, (int, float)) else right
+
+		result = list(vector.elementwise(operation, leftNumbers, rightNumbers))
+		expected = list(map(vector.OPERATIONS[operation], left, rightValues))
+
+		assert result == expected
+		assert [type(number) for number in result] == [type(number) for number in expected]
+
+	@pytest.mark.parametrize("values", [
+		range(-50, 50),
+		[0.1 * i for i in range(100)],
+		[2 ** 62, 2 ** 62, -1] * 10,
+		[1, 2.5, 3]
+	])
+	def testReductions(self, backend, values):
+		packed = numbers(values).numberValues()
+
+		assert vector.sumOf(packed) == pytest.approx(sum(values))
+		assert vector.meanOf(packed) == pytest.approx(sum(values) / len(values))
+		assert vector.minOf(packed) == min(values)
+		assert vector.maxOf(packed) == max(values)
+		assert vector.dot(packed, packed) == pytest.approx(sum(value * value for value in values))
+
+	def testIntegerSumIsExact(self, backend):
+		assert vector.sumOf(array("q", [2 ** 62] * 20)) == 20 * 2 ** 62
+
+class TestListAttributes:
+	def testResultsArePacked(self, backend):
+		result, error = call(numbers(range(100)), "MULTIPLY", makeNumber(3, position, None))
+
+		assert error is None
+		assert isinstance(result, NumberList)
+		assert result.numbers.typecode == "q"
+		assert result.numberValues()[99] == 297
+
+	def testShortLists(self, backend):
+		result, error = call(numbers([1, 2.5]), "ADD", numbers([1, 1]))
+
+		assert error is None
+		assert repr(result) == "LIST([NUMBER(2), NUMBER(3.5)])"
+
+	@pytest.mark.parametrize("code, expected", [
+		("PRINT([1->5].SUM(), [1->5].MEAN(), [4, 2, 9].MIN(), [4, 2, 9].MAX(), [1, 2].DOT([3, 4]))", "10, 2.5, 2, 9, 11\n"),
+		("PRINT([1->4].ADD(1), [1->4].SUBTRACT([1, 1, 1]), [1->4].MULTIPLY(0.5), [2, 4].DIVIDE(2))", "[2, 3, 4], [0, 1, 2], [0.5, 1.0, 1.5], [1.0, 2.0]\n"),
+		("PRINT([1, 2].DIVIDE([1, 0]))", ""),
+		("PRINT([1, 2].ADD([1]))", ""),
+		("PRINT([1, \"a\"].SUM())", ""),
+		("PRINT([].MAX())", ""),
+		("PRINT([].SUM())", "0\n")
+	])
+	def testInPrograms(self, backend, code, expected, capsys):
+		_, error = run(code, Interpreter)
+
+		assert capsys.readouterr().out == expected
+		assert (error is None) == (expected != "")
@@ -0,0 +1,236 @@
+import pytest
+from vlbasic.tokenizer import Tokenizer
+from vlbasic.parser import Parser
+from vlbasic.contextclass import Context, VariableTable
+from vlbasic.interpreter import Interpreter
+from vlbasic.vm import VM
+from vlbasic.compiler import Compiler
+from vlbasic.closurecompiler import ClosureInterpreter, ClosureCompiler
+from vlbasic.utils import InterpretFile
+from vlbasic.statementclass import NumberNode
+
+PROGRAMS = [
+	"1 + 2 * 3 - 4 / 2",
+	"-(2 ^ 3) % 5",
+	"NOT 1 == 2",
+	'"abc" * 3',
+	"LET a = 1\na += 4\na -= 1\na *= 3\na /= 2\nPRINT(a)",
+	"CONST a = 1\na = 2",
+	"PRINT(b)",
+	"LET a = 1\nLET a = 2",
+	"1 / 0",
+	'1 + "a"',
+	"FUNCTION add(a, b)\n\tRETURN a + b\nEND\nPRINT(add(1, 2), add(\"a\", \"b\"))",
+	"FUNCTION a(text, times)\n\tFUNCTION b()\n\t\tPRINT(text * times)\n\tEND\n\tRETURN b\nEND\na(\"HI \", 3)()",
+	"FUNCTION fib(n)\n\tIF n < 2 THEN\n\t\tRETURN n\n\tEND\n\tRETURN fib(n - 1) + fib(n - 2)\nEND\nPRINT(fib(12))",
+	"FUNCTION f()\n\tPRINT(\"no return\")\nEND\nPRINT(f())",
+	"FUNCTION f(a)\n\tRETURN a\nEND\nf(1, 2)",
+	"FUNCTION f()\n\tRETURN 1 + \"a\"\nEND\nf()",
+	"RETURN 1",
+	"BREAK",
+	"CONTINUE",
+	"WHILE TRUE THEN\n\tPRINT((BREAK))\nEND",
+	"LET i = 0\nWHILE i < 10 THEN\n\ti += 1\n\tIF i % 2 == 0 THEN\n\t\tCONTINUE\n\tELSEIF i > 7 THEN\n\t\tBREAK\n\tEND\n\tPRINT(i)\nEND",
+	"LET i = 0\nWHILE i < 5 THEN\n\ti += 1\n\tCONTINUE\n\tPRINT(i)\nEND\nPRINT(i)",
+	"FOR x IN [1->10->3] THEN\n\tFOR y IN [\"a\", \"b\"] THEN\n\t\tIF y == \"b\" THEN\n\t\t\tBREAK\n\t\tEND\n\t\tPRINT(x, y)\n\tEND\nEND",
+	"FOR x IN [1, 2, 3] THEN\n\tBREAK\nEND\nPRINT(x)",
+	"FOR x IN 5 THEN\nEND",
+	"FOR x IN [1->3.5] THEN\nEND",
+	"FUNCTION f()\n\tFOR x IN [1->100] THEN\n\t\tIF x == 5 THEN\n\t\t\tRETURN x\n\t\tEND\n\tEND\nEND\nPRINT(f())",
+	"LET r = [0->10->2]\nPRINT(r[2], r.GET(1), r == [0->10->2], r == [0, 2, 4, 6, 8])\nr[0] = 9\nPRINT(r, [5->0->-2], [3->3])",
+	"[1->4]",
+	"FOR c IN \"abc\" THEN\n\tPRINT(c)\nEND\nLET d = {\"a\": 1, 2: 3}\nFOR k IN d THEN\n\td[STRING(k) + \"!\"] = d[k]\nEND\nPRINT(d)",
+	"LET l = [" + ", ".join(map(str, range(20))) + "]\nl[3] = 100\nPRINT(l, l[3], l.GET_FROM_LAST(0), l == [0->20])\nl[4] = 1.5\nl[5] = \"a\"\nPRINT(l)\nFOR x IN l THEN\n\tPRINT(x)\nEND",
+	"FUNCTION f()\n\tFOR x IN NULL THEN\n\tEND\nEND\nf()",
+	"CONST d = {1: 2, \"a\": [1, 2]}\nd[\"b\"] = 3\nPRINT(d, d[1], d[\"a\"][1], d.b)",
+	"LET l = [1, 2, 3]\nl[0] = \"x\"\nPRINT(l, l.GET(2), l.GET_FROM_LAST(0), \"abc\".GET(1))",
+	"PRINT([1, 2][5])",
+	"PRINT(STRING(12) + \"3\", NUMBER(\"12\") + 3)",
+	"IF FALSE THEN\n\tPRINT(1)\nELSEIF NULL THEN\n\tPRINT(2)\nELSE\n\tPRINT(3)\nEND",
+	"LET f = FUNCTION(x)\n\tRETURN x * 2\nEND\nPRINT(f(21))",
+	"IMPORT 1",
+	"PRINT(PRINT == PRINT, 1 != NULL, TRUE + 1, -TRUE)",
+	"FUNCTION f()\n\tLET TRUE = 1\nEND\nf()",
+	"FUNCTION f()\n\tFOR NULL IN [1] THEN\n\tEND\nEND\nf()",
+	"FUNCTION f(PRINT)\n\tPRINT(PRINT)\nEND\nf(3)",
+	"FUNCTION f()\n\tRETURN STRING(1, 2)\nEND\nf()",
+	"LET x = 1\nFUNCTION f()\n\tPRINT(x)\n\tLET x = 2\n\tPRINT(x)\nEND\nf()\nPRINT(x)",
+	"FUNCTION counter()\n\tLET n = 0\n\tFUNCTION inc()\n\t\tn += 1\n\t\tRETURN n\n\tEND\n\tRETURN inc\nEND\nLET c = counter()\nc()\nPRINT(c(), counter()())",
+	"FUNCTION outer()\n\tCONST k = 1\n\tFUNCTION inner()\n\t\tk = 2\n\tEND\n\tinner()\nEND\nouter()",
+	"FUNCTION outer()\n\tFUNCTION inner()\n\t\tRETURN y\n\tEND\n\tRETURN inner()\nEND\nouter()",
+	"FUNCTION f(a, a)\n\tLET b = 1\n\tLET b = 2\nEND\nf(1, 2)",
+	"LET l = [3, 1, 2]\nl.APPEND(4)\nl.EXTEND(l)\nPRINT(l.POP(), l.POP(0), l, l.SLICE(1, 3))\nl.SORT()\nPRINT(l)",
+	"FUNCTION k(x)\n\tRETURN 0 - x\nEND\nFUNCTION add(a, b)\n\tRETURN a + b\nEND\nFUNCTION even(x)\n\tRETURN x % 2 == 0\nEND\nLET l = [1->20]\nl.SORT(k)\nPRINT(l.SLICE(0, 3), l.MAP(k).SUM(), l.FILTER(even).REDUCE(add, 1))",
+	"FUNCTION f(x)\n\tRETURN x + \"a\"\nEND\nLET l = [1, 2]\nl.MAP(f)",
+	"LET l = [1, \"a\"]\nl.SORT()",
+	"LET l = []\nl.REDUCE(PRINT)",
+	"LET x = TRUE\nPRINT([x->3])",
+	"LET n = NULL\nLET one = 1\nPRINT([0->one->n])",
+	"LET zero = 0\nPRINT([1->5->zero])",
+	"LET l = [1, 2]\nFUNCTION grow(x)\n\tl.APPEND(x)\n\tRETURN x\nEND\nFUNCTION add(a, b)\n\tl.APPEND(b)\n\tRETURN a + b\nEND\nPRINT(l.MAP(grow), l.FILTER(grow), l.REDUCE(add), l)",
+	"LET l = [2, 1]\nFUNCTION grow(x)\n\tl.APPEND(x)\n\tRETURN x\nEND\nl.SORT(grow)",
+	"LET s = \"\"\nFOR i IN [0->200] THEN\n\ts = s + STRING(i % 10)\n\ts += \",\"\nEND\nLET t = s + \"\"\nPRINT(s.GET_FROM_LAST(1), s == t)",
+]
+
+def run(code, engine):
+	tokens, error = Tokenizer("TEST", code).tokenize()
+	assert not error
+
+	statements, error = Parser("TEST", tokens).parse()
+	assert not error
+
+	context = Context("TEST")
+	context.setVariableTable(VariableTable())
+
+	interpreter = engine(statements, InterpretFile("TEST", None))
+	out, error = interpreter.interpret(context)
+
+	return repr(out), repr(error) if error else None
+
+class TestVM:
+	@pytest.mark.parametrize("code", PROGRAMS)
+	def testSameAsInterpreter(self, code, capsys):
+		expected = run(code, Interpreter)
+		expectedOutput = capsys.readouterr().out
+
+		assert run(code, VM) == expected
+		assert capsys.readouterr().out == expectedOutput
+
+	def testResults(self):
+		out, error = run("1 + 1\nLET a = 3\na * 2", VM)
+
+		assert error is None
+		assert out == "[NUMBER(2), NUMBER(3), NUMBER(6)]"
+
+	def testDisassemble(self):
+		tokens, _ = Tokenizer("TEST", "LET a = 1 + 2").tokenize()
+		statements, _ = Parser("TEST", tokens).parse()
+
+		disassembly = VM(statements, InterpretFile("TEST", None)).compile().disassemble()
+
+		assert "LOAD_NUMBER" in disassembly
+		assert "BINARY_ADD" in disassembly
+		assert "DECLARE_NAME" in disassembly
+
+class TestClosureInterpreter:
+	@pytest.mark.parametrize("code", PROGRAMS)
+	def testSameAsInterpreter(self, code, capsys):
+		expected = run(code, Interpreter)
+		expectedOutput = capsys.readouterr().out
+
+		assert run(code, ClosureInterpreter) == expected
+		assert capsys.readouterr().out == expectedOutput
+
+	def testFunctionBodyCompiledOnce(self):
+		tokens, _ = Tokenizer("TEST", "FUNCTION f(x)\n\tRETURN x\nEND\nf(1)\nf(2)").tokenize()
+		statements, _ = Parser("TEST", tokens).parse()
+
+		context = Context("TEST")
+		context.setVariableTable(VariableTable())
+
+		interpreter = ClosureInterpreter(statements, InterpretFile("TEST", None))
+	
+		interpreter.interpret(context)
+		func, _ = context.variableTable.lookupVariable("f", None)
+		compiledBody = func.compiledBody[0]
+
+		assert compiledBody is not None
+
+		interpreter.callFunction(func, [], statements[1].position, context)
+
+		assert func.compiledBody[0] is compiledBody
+
+	def testUncalledFunctionNotCompiled(self):
+		tokens, _ = Tokenizer("TEST", "FUNCTION f()\n\tFUNCTION g()\n\tEND\nEND").tokenize()
+		statements, _ = Parser("TEST", tokens).parse()
+
+		context = Context("TEST")
+		context.setVariableTable(VariableTable())
+
+		interpreter = ClosureInterpreter(statements, InterpretFile("TEST", None))
+
+		interpreter.interpret(context)
+		func, _ = context.variableTable.lookupVariable("f", None)
+
+		assert func.compiledBody == [None]
+
+	def testInnerFunctionCompiledOnce(self):
+		tokens, _ = Tokenizer("TEST", "FUNCTION outer()\n\tFUNCTION inner()\n\tEND\n\tRETURN inner\nEND").tokenize()
+		statements, _ = Parser("TEST", tokens).parse()
+
+		context = Context("TEST")
+		context.setVariableTable(VariableTable())
+
+		interpreter = ClosureInterpreter(statements, InterpretFile("TEST", None))
+
+		interpreter.interpret(context)
+		outer, _ = context.variableTable.lookupVariable("outer", None)
+
+		first, _ = interpreter.callFunction(outer, [], statements[0].position, context)
+		second, _ = interpreter.callFunction(outer, [], statements[0].position, context)
+
+		assert first is not second
+		assert first.compiledBody is second.compiledBody
+		assert first.compiledBody[0] is None
+
+		interpreter.callFunction(first, [], statements[0].position, context)
+		compiledBody = first.compiledBody[0]
+		interpreter.callFunction(second, [], statements[0].position, context)
+
+		assert compiledBody is not None
+		assert second.compiledBody[0] is compiledBody
+
+class TestBuiltins:
+	def testSharedBetweenCalls(self):
+		out, error = run("FUNCTION f()\n\tRETURN PRINT\nEND\nf() == f()", Interpreter)
+
+		assert error is None
+		assert out.endswith("BOOLEAN(True)]")
+
+	def testRootOfScopeChain(self):
+		context = Context("TEST")
+		context.setVariableTable(VariableTable())
+
+		assert context.variableTable.parent is VariableTable.builtins
+		assert "PRINT" not in context.variableTable.variables
+
+	def testRedeclare(self):
+		_, error = run("LET TRUE = 1", Interpreter)
+		assert "VariableDeclarationError" in error
+
+		_, error = run("PRINT = 1", Interpreter)
+		assert "VariableConstantAssignmentError" in error
+
+class TestDispatchTable:
+	def testTablePerClass(self):
+		assert Interpreter.dispatchTable is not VM.dispatchTable
+		assert Interpreter.dispatchTable[NumberNode] is Interpreter.visit_NumberNode
+
+	def testUnknownNode(self):
+		class UnknownNode:
+			pass
+
+		with pytest.raises(NotImplementedError):
+			Interpreter([], InterpretFile("TEST", None)).visit(UnknownNode(), Context("TEST"))
+
+	def testEveryNodeCompiles(self):
+		for nodeClass in Interpreter.dispatchTable:
+			assert hasattr(Compiler, f"compile_{nodeClass.__name__}")
+
+	def testUnknownNodeIsNotCompiled(self):
+		class UnknownNode:
+			pass
+
+		with pytest.raises(AssertionError):
+			list(Compiler().compile(UnknownNode()))
+
+	def testEveryNodeCompilesToClosure(self):
+		for nodeClass in Interpreter.dispatchTable:
+			assert hasattr(ClosureCompiler, f"compile_{nodeClass.__name__}")
+
+	def testUnknownNodeIsNotCompiledToClosure(self):
+		class UnknownNode:
+			pass
+
+		with pytest.raises(AssertionError):
+			ClosureCompiler(None, False).compile(UnknownNode())
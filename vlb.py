@@ -10,7 +10,11 @@ from vlbasic.vlbasic.tokenizer import Tokenizer
 from vlbasic.vlbasic.parser import Parser
 from vlbasic.vlbasic.contextclass import Context, VariableTable
 from vlbasic.vlbasic.interpreter import Interpreter
-from vlbasic.vlbasic.utils import InterpretFile
+from vlbasic.vlbasic.vm import VM
+from vlbasic.vlbasic.closurecompiler import ClosureInterpreter
+from vlbasic.vlbasic.utils import InterpretFile, readSource
+from vlbasic.vlbasic.cache import parseFile, compileTree
+from vlbasic.vlbasic.moduleclass import ModuleSearchPath
 
 ########################################
 #	COMMAND LINE TOOL
@@ -22,11 +26,22 @@ args = sys.argv[1:]
 #	UTILS
 ########################################
 
+ENGINES = {
+	"interpreter": Interpreter,
+	"vm": VM,
+	"closure": ClosureInterpreter
+}
+
 helpText = """Commands:
 	run
 		[0]/--file: The file you want to run
 		--debug: If you want to get debug messages from the interpreter, values: stages | all
 		--time: If you want to time how long it takes to run the program
+		--engine: The engine used to run the program, values: interpreter | vm | closure, default: interpreter
+		--no-cache: If you want to parse the file again instead of loading it from __vlbcache__
+
+	compile
+		[0]/--directory: The directory to build the __vlbcache__ caches in, default: the current directory
 
 	--help
 """
@@ -78,32 +93,25 @@ def makeArguments(arguments: list[str]):
 
 	return argumentsParsed, keysStarted, None
 
-def run(file: str, debug = False):
-	if debug == "stages":
-		print("READING FILE")
-
-	with open(file, "r") as f:
-		inputText = f.read()
-
-	if debug == "stages":
-		print("TOKENIZING")
+def run(file: str, debug = False, engine = "interpreter", useCache = True):
+	# Tokens are printed with all, the file is tokenized and parsed without the
+	# cache. Otherwise the tokens are streamed into the parser and unchanged files
+	# are loaded from their cache
+	if debug == "all":
+		tokens, error = Tokenizer(file, readSource(file)).tokenize()
 
-	tokenizer = Tokenizer(file, inputText)
-	tokens, error = tokenizer.tokenize()
+		if error:
+			print(repr(error))
+			return
 
-	if error:
-		print(repr(error))
-		return
-	
-	if debug == "all":
 		print(tokens)
 
-	if debug == "stages":
-		print("PARSING")
-
-	parser = Parser(file, tokens)
+		statements, error = Parser(file, tokens).parse()
+	else:
+		if debug == "stages":
+			print("PARSING")
 
-	statements, error = parser.parse()
+		statements, error = parseFile(file, useCache=useCache)
 
 	if error:
 		print(repr(error))
@@ -118,8 +126,11 @@ def run(file: str, debug = False):
 	if debug == "stages":
 		print("INTERPRETING")
 	
-	interpreter = Interpreter(statements, InterpretFile(file, None))
-	interpreter.addDefaultVariables(context)
+	interpreter = ENGINES[engine](statements, InterpretFile(file, None))
+
+	if debug == "all" and isinstance(interpreter, VM):
+		print(interpreter.compile().disassemble())
+
 	out, error = interpreter.interpret(context)
 
 	if error:
@@ -166,14 +177,23 @@ def main():
 		if "--time" in arguments.keys():
 			measureTime = True
 
+		engine = "interpreter"
+		if "--engine" in arguments.keys():
+			engine = arguments["--engine"]
+			if engine not in ENGINES.keys():
+				print(f"run parameter --engine only accepts {', '.join(ENGINES.keys())} as its value, not {engine}, use --help to get help")
+				return
+
 		if not os.path.exists(filename):
 			print(f"file not found, {filename}, use --help to get help")
 			return
 
+		useCache = "--no-cache" not in arguments.keys()
+
 		print(f"Running {filename}...")
 		startTime = time.time()
 		
-		run(filename, debug)
+		run(filename, debug, engine, useCache)
 
 		endTime = time.time()
 		if measureTime:
@@ -181,6 +201,31 @@ def main():
 		else:
 			print("Finished")
 
+	elif action == "compile":
+		arguments, onlyUnnamedArgs, error = makeArguments(args[1:])
+		if error:
+			print(error, "use --help to get help")
+			return
+
+		directory = "."
+		if "--directory" in arguments.keys():
+			directory = arguments["--directory"]
+		elif 0 in arguments.keys():
+			directory = arguments[0]
+
+		if not os.path.isdir(directory):
+			print(f"directory not found, {directory}, use --help to get help")
+			return
+
+		results = compileTree(directory)
+
+		for path, error in results:
+			if error:
+				print(repr(error))
+
+		failed = len([path for path, error in results if error])
+		print(f"Compiled {len(results) - failed} files, {failed} failed")
+
 	elif action == "modules":
 		arguments, onlyUnnamedArgs, error = makeArguments(args[1:])
 		if error:
@@ -201,16 +246,10 @@ def main():
 				print("modules folder not found(/vlbasic/modules)")
 				return
 
-			vlbFiles = glob.glob("./vlbasic/modules/*.vlb")
-			pyFiles = glob.glob("./vlbasic/modules/*.py")
-
 			outData = ""
-			
-			for file in vlbFiles:
-				outData += ".".join(os.path.basename(file).split(".")[:-1]) + "\n"
 
-			for file in pyFiles:
-				outData += ".".join(os.path.basename(file).split(".")[:-1]) + "(py)\n"
+			for name, extension in ModuleSearchPath.installed().listModules():
+				outData += name + ("(py)" if extension == ".py" else "") + "\n"
 
 			print("Currently installed modules: \n" + outData[:-1])
 
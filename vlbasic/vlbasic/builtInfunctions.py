@@ -2,17 +2,17 @@
 #	IMPORTS
 ########################################
 
-from .runtimevaluesclass import Null
-from .utils import Position, File
+from .runtimevaluesclass import makeNull
+from .utils import File, StartEndPosition
 from .error import RTError, ArgumentError
-from .runtimevaluesclass import String, Number
+from .runtimevaluesclass import String, makeNumber, makeBoolean, BuiltInFunction
+from .contextclass import Context, VariableTable
 
 ########################################
 #	VARS
 ########################################
 
-placeholderPosition = Position(0, 0, 0, File("<FUNC_RETURN>", ""))
-placeholderStartEndPosition = placeholderPosition.asStartEndPosition()
+placeholderStartEndPosition = StartEndPosition(File("<FUNC_RETURN>", ""), 0)
 
 ########################################
 #	FUNCTIONS
@@ -22,7 +22,7 @@ def funcPrint(arguments, executeContext):
 	textConcatenated = ""
 
 	for argument in arguments:
-		string, error = argument.toString(placeholderStartEndPosition.copy())
+		string, error = argument.toString(placeholderStartEndPosition)
 		if error:
 			return None, error
 
@@ -30,28 +30,51 @@ def funcPrint(arguments, executeContext):
 
 	print(textConcatenated[:-2])
 
-	return Null(placeholderStartEndPosition.copy(), executeContext), None
+	return makeNull(placeholderStartEndPosition, executeContext), None
 
 def funcToString(arguments, executeContext):
 	if len(arguments) > 1:
-		return None, ArgumentError(1, len(arguments), "STRING", placeholderStartEndPosition.copy(), executeContext)
+		return None, ArgumentError(1, len(arguments), "STRING", placeholderStartEndPosition, executeContext)
 
 	argument = arguments[0]
 
-	asString, error = argument.toString(placeholderStartEndPosition.copy())
+	asString, error = argument.toString(placeholderStartEndPosition)
 	if error:
 		return None, error
 
-	return String(asString.value, placeholderStartEndPosition.copy(), executeContext), None
+	return String(asString.value, placeholderStartEndPosition, executeContext), None
 
 def funcToNumber(arguments, executeContext):
 	if len(arguments) > 1:
-		return None, ArgumentError(1, len(arguments), "NUMBER", placeholderStartEndPosition.copy(), executeContext)
+		return None, ArgumentError(1, len(arguments), "NUMBER", placeholderStartEndPosition, executeContext)
 
 	argument = arguments[0]
 
-	asNumber, error = argument.toNumber(placeholderStartEndPosition.copy())
+	asNumber, error = argument.toNumber(placeholderStartEndPosition)
 	if error:
 		return None, error
 
-	return Number(asNumber.value, placeholderStartEndPosition.copy(), executeContext), None
\ No newline at end of file
+	return makeNumber(asNumber.value, placeholderStartEndPosition, executeContext), None
+
+########################################
+#	BUILTINS
+########################################
+
+# Every builtin is created once for the whole process, the values are constant
+# so all scopes can share the same Variable objects
+
+builtinsFile = File("<DEFAULT_VARIABLE>", "")
+builtinsPosition = StartEndPosition(builtinsFile, -1)
+
+builtinsContext = Context("<BUILTINS>")
+builtinsContext.setVariableTable(VariableTable())
+
+builtinsTable = builtinsContext.variableTable
+builtinsTable.declareVariable("TRUE", makeBoolean(True, builtinsPosition, builtinsContext), True, builtinsPosition, True)
+builtinsTable.declareVariable("FALSE", makeBoolean(False, builtinsPosition, builtinsContext), True, builtinsPosition, True)
+builtinsTable.declareVariable("NULL", makeNull(builtinsPosition, builtinsContext), True, builtinsPosition, True)
+builtinsTable.declareVariable("PRINT", BuiltInFunction("PRINT", funcPrint, builtinsPosition, builtinsContext), True, builtinsPosition, True)
+builtinsTable.declareVariable("STRING", BuiltInFunction("STRING", funcToString, builtinsPosition, builtinsContext), True, builtinsPosition, True)
+builtinsTable.declareVariable("NUMBER", BuiltInFunction("NUMBER", funcToNumber, builtinsPosition, builtinsContext), True, builtinsPosition, True)
+
+VariableTable.builtins = builtinsTable
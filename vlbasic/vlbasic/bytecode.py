@@ -0,0 +1,109 @@
+########################################
+#	IMPORTS
+########################################
+
+from __future__ import annotations
+
+########################################
+#	OPCODES
+########################################
+
+# The opcodes are plain integers so the dispatch loop in vm.py only has to do
+# integer comparisons, they are ordered roughly by how often they are executed
+
+LOAD_NAME =				0
+LOAD_NUMBER =			1
+LOAD_STRING =			2
+POP_TOP =				3
+JUMP =					4
+POP_JUMP_IF_FALSE =		5
+FOR_ITER =				6
+
+BINARY_ADD =			7
+BINARY_SUBTRACT =		8
+BINARY_MULTIPLY =		9
+BINARY_DIVIDE =			10
+BINARY_POWER =			11
+BINARY_MODULUS =		12
+BINARY_EQUALS =			13
+BINARY_NOT_EQUALS =		14
+BINARY_GRATER_THAN =	15
+BINARY_LESS_THAN =		16
+BINARY_GREATER_EQUALS =	17
+BINARY_LESS_EQUALS =	18
+
+UNARY_PLUS =			19
+UNARY_MINUS =			20
+UNARY_NOT =				21
+
+ASSIGN_NAME =			22
+DECLARE_NAME =			23
+CALL_FUNCTION =			24
+RETURN_VALUE =			25
+RETURN_NULL =			26
+PUSH_NULL =				27
+STORE_RESULT =			28
+
+GET_ITEM =				29
+SET_ITEM =				30
+GET_ATTRIBUTE =			31
+BUILD_LIST =			32
+BUILD_DICTIONARY =		33
+BUILD_RANGE =			34
+SETUP_FOR =				35
+MAKE_FUNCTION =			36
+IMPORT =				37
+
+BREAK_OUTSIDE_LOOP =	38
+CONTINUE_OUTSIDE_LOOP =	39
+RETURN_OUTSIDE_FUNCTION = 40
+
+END =					41
+
+OPCODE_NAMES = {value: name for name, value in dict(globals()).items() if name.isupper() and isinstance(value, int)}
+
+########################################
+#	CODE OBJECT
+########################################
+
+class CodeObject:
+	def __init__(self, name: str, isAFunction: bool) -> None:
+		self.name = name
+		self.isAFunction = isAFunction
+		self.instructions: list[tuple[int, int | object, object]] = []
+
+	def __repr__(self) -> str:
+		return f"CODE_OBJECT({self.name}, {len(self.instructions)} instructions)"
+
+	def emit(self, opcode: int, argument: int | object = 0, node: object = None) -> int:
+		self.instructions.append((opcode, argument, node))
+		return len(self.instructions) - 1
+
+	def patch(self, index: int, argument: int) -> None:
+		opcode, _, node = self.instructions[index]
+		self.instructions[index] = (opcode, argument, node)
+
+	def nextIndex(self) -> int:
+		return len(self.instructions)
+
+	def disassemble(self) -> str:
+		lines = [f"{self.name}:"]
+		children = []
+
+		for index, (opcode, argument, node) in enumerate(self.instructions):
+			if isinstance(argument, CodeObject):
+				children.append(argument)
+				argumentText = repr(argument)
+			elif opcode in (LOAD_NAME, DECLARE_NAME, ASSIGN_NAME):
+				argumentText = str(node.token.value)
+			elif opcode in (LOAD_NUMBER, LOAD_STRING):
+				argumentText = repr(node.token.value)
+			else:
+				argumentText = str(argument)
+
+			lines.append(f"\t{index:>4} {OPCODE_NAMES[opcode]:<24}{argumentText}")
+
+		for child in children:
+			lines.append(child.disassemble())
+
+		return "\n".join(lines)
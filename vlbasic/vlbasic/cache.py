@@ -0,0 +1,206 @@
+########################################
+#	IMPORTS
+########################################
+
+import gc
+import hashlib
+import io
+import os
+import pickle
+import sys
+from contextlib import contextmanager
+from . import tokenclass, keywords, statementclass, parser, resolver, utils
+from .tokenizer import Tokenizer
+from .tokenclass import Token, TokenTypes
+from .keywords import Keywords
+from .parser import Parser
+from .statementclass import StatementNode
+from .error import Error
+from .utils import File, StartEndPosition, readSource
+
+########################################
+#	CONSTANTS
+########################################
+
+# The version is a hash of the modules that define tokens and nodes and fill
+# them in, so changing any of them rebuilds older caches without bumping a
+# number by hand. Pickled enums and slots can change between Python versions
+# as well
+
+def definitionsHash() -> str:
+	digest = hashlib.sha256()
+
+	for module in (tokenclass, keywords, statementclass, parser, resolver, utils):
+		with open(module.__file__, "rb") as source:
+			digest.update(source.read())
+
+	return digest.hexdigest()[:16]
+
+CACHE_VERSION = definitionsHash()
+VERSION = f"vlbasic-{CACHE_VERSION}-python-{sys.version_info.major}.{sys.version_info.minor}"
+
+CACHE_DIRECTORY = "__vlbcache__"
+CACHE_EXTENSION = ".vlbc"
+
+########################################
+#	PICKLING
+########################################
+
+# Positions point to the File of the source, the cache stores a reference to it
+# instead of the text. Loading points them to the File that was just read, so
+# errors show the current text. The reference is pickled once and memoized like
+# any other object
+
+def sourceFile() -> File:
+	raise pickle.UnpicklingError("The source file is only available while loading a cache")
+
+class StatementPickler(pickle.Pickler):
+	dispatch_table = {File: lambda file: (sourceFile, ())}
+
+# Loading a pickle can call any global it names, a cache may only name the
+# classes statements are made of. A cache file naming anything else is refused
+# like a broken one, so a planted file can't run code
+
+CACHE_CLASSES = {
+	(cls.__module__, cls.__name__): cls
+	for cls in [Token, TokenTypes, Keywords, StartEndPosition] + [value for value in vars(statementclass).values() if isinstance(value, type) and value.__module__ == statementclass.__name__]
+}
+
+class StatementUnpickler(pickle.Unpickler):
+	def __init__(self, cacheFile: io.BufferedReader, file: File) -> None:
+		super().__init__(cacheFile)
+		self.file = file
+
+	def find_class(self, module: str, name: str) -> object:
+		if module == __name__ and name == "sourceFile":
+			return lambda: self.file
+
+		cls = CACHE_CLASSES.get((module, name))
+		if cls is None:
+			raise pickle.UnpicklingError(f"{module}.{name} can't be loaded from a cache")
+
+		return cls
+
+# Every object of a cache stays alive, the garbage collector would only walk
+# them over and over again while they are pickled or loaded
+
+@contextmanager
+def pausedGarbageCollection():
+	enabled = gc.isenabled()
+	gc.disable()
+
+	try:
+		yield
+	finally:
+		if enabled:
+			gc.enable()
+
+########################################
+#	CACHE
+########################################
+
+# A source file a.vlb is cached in __vlbcache__/a.vlbc next to it. The cache
+# starts with a plain text header of the version and the hash of the source it
+# was made from, any other source or version parses the file again and replaces
+# the cache. The header is compared as bytes, nothing is unpickled before it
+# matches
+
+def cachePath(path: str) -> str:
+	name = os.path.splitext(os.path.basename(path))[0]
+	return os.path.join(os.path.dirname(path), CACHE_DIRECTORY, name + CACHE_EXTENSION)
+
+def sourceHash(source: bytes) -> str:
+	return hashlib.sha256(source).hexdigest()
+
+def cacheHeader(key: str) -> bytes:
+	return f"{VERSION}\n{key}\n".encode()
+
+def loadCache(path: str, file: File, key: str) -> list[StatementNode] | None:
+	try:
+		with open(cachePath(path), "rb") as cacheFile:
+			header = cacheHeader(key)
+			if cacheFile.read(len(header)) != header:
+				return None
+
+			with pausedGarbageCollection():
+				return StatementUnpickler(cacheFile, file).load()
+
+	# A missing, unreadable or broken cache is the same as no cache
+	except Exception:
+		return None
+
+def writeCache(path: str, statements: list[StatementNode], key: str) -> bool:
+	data = io.BytesIO()
+
+	try:
+		data.write(cacheHeader(key))
+
+		with pausedGarbageCollection():
+			StatementPickler(data, pickle.HIGHEST_PROTOCOL).dump(statements)
+	# Too deeply nested to pickle, the file is parsed every time instead
+	except RecursionError:
+		return False
+
+	path = cachePath(path)
+	temporaryPath = f"{path}.{os.getpid()}.tmp"
+
+	# Written to a temporary file first so another run never reads half a cache
+	try:
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+
+		with open(temporaryPath, "wb") as cacheFile:
+			cacheFile.write(data.getbuffer())
+
+		os.replace(temporaryPath, path)
+	except OSError:
+		if os.path.exists(temporaryPath):
+			os.remove(temporaryPath)
+
+		return False
+
+	return True
+
+# Reads and parses a source file, unchanged files are loaded from their cache
+# without tokenizing or parsing. filename is the name positions show, the path
+# by default
+
+def parseFile(path: str, filename: str | None = None, useCache: bool = True) -> tuple[list[StatementNode], Error]:
+	source = readSource(path)
+	tokenizer = Tokenizer(filename or path, source)
+
+	if useCache:
+		key = sourceHash(source)
+
+		statements = loadCache(path, tokenizer.file, key)
+		if statements is not None:
+			tokenizer.file.closeMapping()
+			return statements, None
+
+	statements, error = Parser(filename or path, tokenizer.generateTokens()).parse()
+	if error:
+		return None, error
+
+	if useCache:
+		writeCache(path, statements, key)
+
+	return statements, None
+
+# Builds the cache of every .vlb file in a directory tree, returns the path and
+# the syntax error, if any, of every file
+
+def compileTree(directory: str) -> list[tuple[str, Error | None]]:
+	results = []
+
+	for root, directories, files in os.walk(directory):
+		directories[:] = sorted(name for name in directories if name != CACHE_DIRECTORY)
+
+		for name in sorted(files):
+			if not name.endswith(".vlb"):
+				continue
+
+			path = os.path.join(root, name)
+			_, error = parseFile(path)
+
+			results.append((path, error))
+
+	return results
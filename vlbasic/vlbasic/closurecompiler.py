@@ -0,0 +1,733 @@
+########################################
+#	IMPORTS
+########################################
+
+from __future__ import annotations
+from typing import Callable
+from .statementclass import StatementNode, ExpressionNode, NumberNode, BinaryOperationNode, UnaryOperationNode, VariableAccessNode, VariableAssignNode, VariableDeclareNode, WhileNode, FunctionCallNode, StringNode, ListNode, GetItemNode, FunctionDefineNode, ReturnNode, IfContainerNode, SetItemNode, ImportNode, DictionaryNode, ContinueNode, BreakNode, ForNode, RangeNode, GetAttributeNode, OPERATION_NODES, flattenOperations
+from .contextclass import Context
+from .runtimevaluesclass import RuntimeValue, Number, Null, String, List, Function, Dictionary, makeNumber, makeNull, makeList
+from .tokenclass import TokenTypes
+from .keywords import Keywords
+from .error import RTError, ReturnOutsideFunctionError, ContinueOutsideLoopError, BreakOutsideLoopError, ValueError_
+from .utils import StartEndPosition, File, InterpretFile
+from .interpreter import Interpreter, popValues
+
+########################################
+#	SIGNALS
+########################################
+
+# BREAK, CONTINUE and RETURN travel up through the closures in the error slot
+# of the returned tuple, so the existing "if error: return None, error" checks
+# unwind them without any extra work on the normal path
+
+class LoopSignal:
+	def __init__(self, name: str) -> None:
+		self.name = name
+
+	def __repr__(self) -> str:
+		return f"LOOP_SIGNAL({self.name})"
+
+class ReturnSignal:
+	def __init__(self, value: RuntimeValue) -> None:
+		self.value = value
+
+	def __repr__(self) -> str:
+		return f"RETURN_SIGNAL({self.value})"
+
+BREAK = LoopSignal("BREAK")
+CONTINUE = LoopSignal("CONTINUE")
+
+Closure = Callable[[Context], tuple[RuntimeValue, RTError]]
+
+########################################
+#	CONSTANTS
+########################################
+
+# Closures call the closures of what they contain, so how deep they nest is
+# limited. Expressions with more operations than NESTED_OPERATIONS and
+# statements nested deeper than NESTED_CLOSURES run on the tree walker instead,
+# which evaluates both without recursion
+
+NESTED_OPERATIONS = 64
+NESTED_CLOSURES = 100
+
+BINARY_OPERATIONS = {
+	TokenTypes.PLUS: lambda left, right, position: left.added(right, position),
+	TokenTypes.MINUS: lambda left, right, position: left.subtracted(right, position),
+	TokenTypes.MULTIPLY: lambda left, right, position: left.multiplied(right, position),
+	TokenTypes.DIVIDE: lambda left, right, position: left.divided(right, position),
+	TokenTypes.POWER: lambda left, right, position: left.power(right, position),
+	TokenTypes.MODULUS: lambda left, right, position: left.modulus(right, position),
+	TokenTypes.DOUBLE_EQUALS: lambda left, right, position: left.equals(right, position),
+	TokenTypes.NOT_EQUALS: lambda left, right, position: left.notEquals(right, position),
+	TokenTypes.GRATER_THAN: lambda left, right, position: left.graterThan(right, position),
+	TokenTypes.LESS_THAN: lambda left, right, position: left.lessThan(right, position),
+	TokenTypes.GREATER_EQUALS: lambda left, right, position: left.graterThanEquals(right, position),
+	TokenTypes.LESS_EQUALS: lambda left, right, position: left.lessThanEquals(right, position)
+}
+
+ASSIGN_OPERATIONS = {
+	"+=": lambda left, right, position: left.added(right, position),
+	"-=": lambda left, right, position: left.subtracted(right, position),
+	"*=": lambda left, right, position: left.multiplied(right, position),
+	"/=": lambda left, right, position: left.divided(right, position)
+}
+
+########################################
+#	CLOSURE COMPILER
+########################################
+
+class ClosureCompiler:
+	def __init__(self, interpreter: ClosureInterpreter, isAFunction: bool) -> None:
+		self.interpreter = interpreter
+		self.isAFunction = isAFunction
+
+		# How deep the closure being compiled is nested
+		self.depth = 0
+
+	def compileBody(self, statements: list[StatementNode], insideLoop: bool) -> Closure:
+		closures = [self.compileStatement(statement, insideLoop) for statement in statements]
+
+		def body(context: Context) -> tuple[RuntimeValue, RTError]:
+			for closure in closures:
+				_, error = closure(context)
+				if error:
+					return None, error
+
+			return None, None
+
+		return body
+
+	def compileStatement(self, node: StatementNode, insideLoop: bool) -> Closure:
+		if isinstance(node, BreakNode) and insideLoop:
+			return lambda context: (None, BREAK)
+		elif isinstance(node, ContinueNode) and insideLoop:
+			return lambda context: (None, CONTINUE)
+		elif isinstance(node, IfContainerNode):
+			if self.depth >= NESTED_CLOSURES:
+				return self.interpreted(node, insideLoop)
+
+			self.depth += 1
+			closure = self.compileIf(node, insideLoop)
+			self.depth -= 1
+
+			return closure
+
+		return self.compile(node)
+
+	def compile(self, node: StatementNode) -> Closure:
+		if self.depth >= NESTED_CLOSURES:
+			return self.interpreted(node, False)
+
+		functionName = f"compile_{type(node).__name__}"
+		func = getattr(self, functionName, self.compileFunctionNotFound)
+
+		self.depth += 1
+		closure = func(node)
+		self.depth -= 1
+
+		return closure
+
+	def interpreted(self, node: StatementNode, insideLoop: bool) -> Closure:
+		visitNested = self.interpreter.visitNested
+		isAFunction = self.isAFunction
+
+		return lambda context: visitNested(node, context, insideLoop, isAFunction)
+
+	# The parser only makes nodes and operators the compiler knows, reaching one
+	# it doesn't is a bug in the compiler and not an error of the program
+
+	def compileFunctionNotFound(self, node: StatementNode) -> Closure:
+		raise AssertionError(f"compile_{type(node).__name__} is missing")
+
+	def compileCondition(self, node: StatementNode) -> Closure:
+		condition = self.compile(node)
+		position = node.position
+
+		def conditionAsBoolean(context: Context) -> tuple[bool, RTError]:
+			value, error = condition(context)
+			if error:
+				return None, error
+
+			valueAsBoolean, error = value.toBoolean(position)
+			if error:
+				return None, error
+
+			return valueAsBoolean.value, None
+
+		return conditionAsBoolean
+
+	def compileIf(self, node: IfContainerNode, insideLoop: bool) -> Closure:
+		branches = [(self.compileCondition(ifNode.condition), self.compileBody(ifNode.body, insideLoop), ifNode.position) for ifNode in [node.ifNode] + node.elseIfNodes]
+		elseBody = self.compileBody(node.elseNode.body, insideLoop) if node.elseNode else None
+		elsePosition = node.elseNode.position if node.elseNode else node.position
+
+		def ifContainer(context: Context) -> tuple[Null, RTError]:
+			for condition, body, position in branches:
+				conditionValue, error = condition(context)
+				if error:
+					return None, error
+
+				if conditionValue:
+					_, error = body(context)
+					if error:
+						return None, error
+
+					return makeNull(position, context), None
+
+			if elseBody:
+				_, error = elseBody(context)
+				if error:
+					return None, error
+
+			return makeNull(elsePosition, context), None
+
+		return ifContainer
+
+	def compile_NumberNode(self, node: NumberNode) -> Closure:
+		value = node.token.value
+		position = node.position
+
+		return lambda context: (makeNumber(value, position, context), None)
+
+	def compile_StringNode(self, node: StringNode) -> Closure:
+		value = node.token.value
+		position = node.position
+
+		return lambda context: (String(value, position, context), None)
+
+	# Operators, calls, lists and so on are compiled from a flattened list so
+	# compiling them never recurses. Small ones become nested closures, bigger
+	# ones run on the tree walker so they can't hit the recursion limit while
+	# running either
+
+	def compileOperations(self, node: ExpressionNode) -> Closure:
+		operations = flattenOperations(node)
+		if len(operations) > NESTED_OPERATIONS:
+			return self.interpreted(node, False)
+
+		closures = []
+
+		# The operands end up nested inside of every operation around them
+		self.depth += len(operations)
+
+		for operation in operations:
+			operationType = type(operation)
+
+			if operationType not in OPERATION_NODES:
+				closures.append(self.compile(operation))
+			elif operationType is BinaryOperationNode:
+				right = closures.pop()
+				closures.append(self.binaryOperation(operation, closures.pop(), right))
+			elif operationType is UnaryOperationNode:
+				closures.append(self.unaryOperation(operation, closures.pop()))
+			elif operationType is FunctionCallNode:
+				arguments = popValues(closures, len(operation.arguments))
+				closures.append(self.functionCall(operation, closures.pop(), arguments))
+			elif operationType is ListNode:
+				closures.append(self.listExpression(operation, popValues(closures, len(operation.expressions))))
+			elif operationType is DictionaryNode:
+				items = popValues(closures, len(operation.expressions) * 2)
+				closures.append(self.dictionaryExpression(operation, list(zip(items[::2], items[1::2]))))
+			elif operationType is GetItemNode:
+				item = closures.pop()
+				closures.append(self.getItem(operation, closures.pop(), item))
+			elif operationType is GetAttributeNode:
+				item = closures.pop()
+				closures.append(self.getAttribute(operation, closures.pop(), item))
+			elif operationType is SetItemNode:
+				value = closures.pop()
+				item = closures.pop()
+				closures.append(self.setItem(operation, closures.pop(), item, value))
+			else:
+				step = closures.pop()
+				end = closures.pop()
+				closures.append(self.rangeExpression(operation, closures.pop(), end, step))
+
+		self.depth -= len(operations)
+
+		return closures[0]
+
+	compile_BinaryOperationNode = compile_UnaryOperationNode = compile_FunctionCallNode = compile_ListNode = compile_DictionaryNode = compile_RangeNode = compile_GetItemNode = compile_GetAttributeNode = compile_SetItemNode = compileOperations
+
+	def binaryOperation(self, node: BinaryOperationNode, left: Closure, right: Closure) -> Closure:
+		if node.operationToken.type not in BINARY_OPERATIONS:
+			raise AssertionError(f"{node.operationToken.type} has no closure")
+
+		operation = BINARY_OPERATIONS[node.operationToken.type]
+		position = node.position
+
+		def binaryOperation(context: Context) -> tuple[RuntimeValue, RTError]:
+			leftValue, error = left(context)
+			if error:
+				return None, error
+
+			rightValue, error = right(context)
+			if error:
+				return None, error
+
+			return operation(leftValue, rightValue, position)
+
+		return binaryOperation
+
+	def unaryOperation(self, node: UnaryOperationNode, expression: Closure) -> Closure:
+		position = node.operationToken.position.until(node.expression.position)
+
+		if node.operationToken.type in (TokenTypes.MINUS, TokenTypes.PLUS):
+			multiplier = -1 if node.operationToken.type == TokenTypes.MINUS else 1
+
+			def unaryOperation(context: Context) -> tuple[RuntimeValue, RTError]:
+				number, error = expression(context)
+				if error:
+					return None, error
+
+				return number.multiplied(makeNumber(multiplier, position, context), position)
+		elif node.operationToken.isKeyword(Keywords.NOT):
+			def unaryOperation(context: Context) -> tuple[RuntimeValue, RTError]:
+				number, error = expression(context)
+				if error:
+					return None, error
+
+				return number.notted(position)
+		else:
+			raise AssertionError(f"{node.operationToken.type} has no closure")
+
+		return unaryOperation
+
+	def compile_VariableAccessNode(self, node: VariableAccessNode) -> Closure:
+		name = node.token.value
+		depth = node.depth
+		slot = node.slot
+		position = node.position
+
+		return lambda context: context.variableTable.lookupVariableAt(name, depth, slot, position)
+
+	def compile_VariableAssignNode(self, node: VariableAssignNode) -> Closure:
+		valueNode = self.compile(node.valueNode)
+		name = node.token.value
+		depth = node.depth
+		slot = node.slot
+		tokenPosition = node.token.position
+		position = node.position
+
+		if node.type == "=":
+			def variableAssign(context: Context) -> tuple[RuntimeValue, RTError]:
+				result, error = valueNode(context)
+				if error:
+					return None, error
+
+				return context.variableTable.assignVariableAt(name, depth, slot, result, position)
+
+			return variableAssign
+
+		operation = ASSIGN_OPERATIONS[node.type]
+
+		def variableAugmentedAssign(context: Context) -> tuple[RuntimeValue, RTError]:
+			result, error = valueNode(context)
+			if error:
+				return None, error
+
+			variableValue, error = context.variableTable.lookupVariableAt(name, depth, slot, tokenPosition)
+			if error:
+				return None, error
+
+			assignTo, error = operation(variableValue, result, position)
+			if error:
+				return None, error
+
+			return context.variableTable.assignVariableAt(name, depth, slot, assignTo, position)
+
+		return variableAugmentedAssign
+
+	def compile_VariableDeclareNode(self, node: VariableDeclareNode) -> Closure:
+		valueNode = self.compile(node.valueNode)
+		name = node.token.value
+		slot = node.slot
+		isConstant = node.declareToken.isKeyword(Keywords.CONST)
+		position = node.position
+
+		def variableDeclare(context: Context) -> tuple[RuntimeValue, RTError]:
+			result, error = valueNode(context)
+			if error:
+				return None, error
+
+			return context.variableTable.declareVariableAt(name, slot, result, isConstant, position)
+
+		return variableDeclare
+
+	def compile_WhileNode(self, node: WhileNode) -> Closure:
+		condition = self.compileCondition(node.condition)
+		body = self.compileBody(node.body, True)
+		position = node.position
+
+		def whileLoop(context: Context) -> tuple[Null, RTError]:
+			while True:
+				conditionValue, error = condition(context)
+				if error:
+					return None, error
+
+				if not conditionValue:
+					break
+
+				_, error = body(context)
+				if error:
+					if error is BREAK:
+						break
+					elif error is CONTINUE:
+						continue
+
+					return None, error
+
+			return makeNull(position, context), None
+
+		return whileLoop
+
+	def compile_ForNode(self, node: ForNode) -> Closure:
+		iterator = self.compile(node.iterator)
+		body = self.compileBody(node.body, True)
+		iteratorPosition = node.iterator.position
+		name = node.item.value
+		slot = node.slot
+		itemPosition = node.item.position
+		position = node.position
+
+		def forLoop(context: Context) -> tuple[Null, RTError]:
+			iteratorVisited, error = iterator(context)
+			if error:
+				return None, error
+
+			items, error = iteratorVisited.iterate(iteratorPosition, context)
+			if error:
+				return None, error
+
+			variableTable = context.variableTable
+
+			if variableTable.isDeclared(name):
+				_, error = variableTable.assignVariable(name, makeNull(itemPosition, context), itemPosition)
+			else:
+				_, error = variableTable.declareVariable(name, makeNull(itemPosition, context), False, itemPosition)
+
+			if error:
+				return None, error
+
+			for item in items:
+				if isinstance(item, RTError):
+					return None, item
+
+				variableTable.assignVariableAt(name, 0, slot, item, itemPosition)
+
+				_, error = body(context)
+				if error:
+					if error is BREAK:
+						break
+					elif error is CONTINUE:
+						continue
+
+					return None, error
+
+			return makeNull(position, context), None
+
+		return forLoop
+
+	def functionCall(self, node: FunctionCallNode, func: Closure, arguments: list[Closure]) -> Closure:
+		callFunction = self.interpreter.callFunction
+		position = node.position
+
+		def functionCall(context: Context) -> tuple[RuntimeValue, RTError]:
+			funcValue, error = func(context)
+			if error:
+				return None, error
+
+			argumentsVisited = []
+			for argument in arguments:
+				argumentVisited, error = argument(context)
+				if error:
+					return None, error
+
+				argumentsVisited.append(argumentVisited)
+
+			return callFunction(funcValue, argumentsVisited, position, context)
+
+		return functionCall
+
+	def listExpression(self, node: ListNode, expressions: list[Closure]) -> Closure:
+		position = node.position
+
+		def listExpression(context: Context) -> tuple[List, RTError]:
+			expressionsVisited = []
+
+			for expression in expressions:
+				expressionVisited, error = expression(context)
+				if error:
+					return None, error
+
+				expressionsVisited.append(expressionVisited)
+
+			return makeList(expressionsVisited, position, context), None
+
+		return listExpression
+
+	def dictionaryExpression(self, node: DictionaryNode, expressions: list[tuple[Closure, Closure]]) -> Closure:
+		position = node.position
+
+		def dictionaryExpression(context: Context) -> tuple[Dictionary, RTError]:
+			valuesVisited = {}
+
+			for key, value in expressions:
+				keyVisited, error = key(context)
+				if error:
+					return None, error
+
+				valueVisited, error = value(context)
+				if error:
+					return None, error
+
+				valuesVisited[keyVisited] = valueVisited
+
+			return Dictionary(valuesVisited, position, context), None
+
+		return dictionaryExpression
+
+	def rangeExpression(self, node: RangeNode, start: Closure, end: Closure, step: Closure) -> Closure:
+		makeRange = self.interpreter.makeRange
+
+		def rangeExpression(context: Context) -> tuple[List, RTError]:
+			startValue, error = start(context)
+			if error:
+				return None, error
+
+			stopValue, error = end(context)
+			if error:
+				return None, error
+
+			stepValue, error = step(context)
+			if error:
+				return None, error
+
+			return makeRange(node, startValue, stopValue, stepValue, context)
+
+		return rangeExpression
+
+	def getItem(self, node: GetItemNode, variable: Closure, item: Closure) -> Closure:
+		position = node.position
+
+		def getItem(context: Context) -> tuple[RuntimeValue, RTError]:
+			variableValue, error = variable(context)
+			if error:
+				return None, error
+
+			itemValue, error = item(context)
+			if error:
+				return None, error
+
+			return variableValue.getItem(itemValue, position)
+
+		return getItem
+
+	def getAttribute(self, node: GetAttributeNode, variable: Closure, item: Closure) -> Closure:
+		position = node.position
+
+		def getAttribute(context: Context) -> tuple[RuntimeValue, RTError]:
+			variableValue, error = variable(context)
+			if error:
+				return None, error
+
+			itemValue, error = item(context)
+			if error:
+				return None, error
+
+			return variableValue.getAttribute(itemValue, position)
+
+		return getAttribute
+
+	def setItem(self, node: SetItemNode, variable: Closure, item: Closure, value: Closure) -> Closure:
+		position = node.position
+
+		def setItem(context: Context) -> tuple[Null, RTError]:
+			variableValue, error = variable(context)
+			if error:
+				return None, error
+
+			itemValue, error = item(context)
+			if error:
+				return None, error
+
+			valueVisited, error = value(context)
+			if error:
+				return None, error
+
+			_, error = variableValue.setItem(itemValue, valueVisited, position)
+			if error:
+				return None, error
+
+			return makeNull(position, context), None
+
+		return setItem
+
+	def compile_FunctionDefineNode(self, node: FunctionDefineNode) -> Closure:
+		position = node.position
+		interpreter = self.interpreter
+
+		# A Function is made every time the definition runs, they all share this
+		# cell. The body is compiled into it on the first call of any of them
+		compiledBody = [None]
+
+		def functionDefine(context: Context) -> tuple[RuntimeValue, RTError]:
+			func = Function(node.variable, node.arguments, node.body, node.position, node.anonymous, context, node.layout, interpreter)
+			func.compiledBody = compiledBody
+
+			if node.anonymous:
+				return func, None
+
+			_, error = context.variableTable.declareVariable(node.variable, func, True, position)
+			if error:
+				return None, error
+
+			return makeNull(position, context), None
+
+		return functionDefine
+
+	def compile_ReturnNode(self, node: ReturnNode) -> Closure:
+		position = node.position
+
+		if not self.isAFunction:
+			return lambda context: (None, ReturnOutsideFunctionError(position, context))
+
+		if not node.value:
+			return lambda context: (None, ReturnSignal(makeNull(position, context)))
+
+		value = self.compile(node.value)
+
+		def returnStatement(context: Context) -> tuple[RuntimeValue, RTError]:
+			valueVisited, error = value(context)
+			if error:
+				return None, error
+
+			return None, ReturnSignal(valueVisited)
+
+		return returnStatement
+
+	def compile_IfContainerNode(self, node: IfContainerNode) -> Closure:
+		return self.compileIf(node, False)
+
+	def compile_ImportNode(self, node: ImportNode) -> Closure:
+		moduleName = self.compile(node.moduleName)
+		importModule = self.interpreter.importModule
+		moduleNamePosition = node.moduleName.position
+		position = node.position
+
+		def importStatement(context: Context) -> tuple[Null, RTError]:
+			moduleNameValue, error = moduleName(context)
+			if error:
+				return None, error
+
+			if not isinstance(moduleNameValue, String):
+				return None, ValueError_(["string"], moduleNameValue.__class__.__name__, moduleNamePosition, context)
+
+			_, error = importModule(moduleNameValue.value, context, position, node.asName)
+			if error:
+				return None, error
+
+			return makeNull(position, context), None
+
+		return importStatement
+
+	def compile_BreakNode(self, node: BreakNode) -> Closure:
+		position = node.position
+
+		return lambda context: (None, BreakOutsideLoopError(position, context))
+
+	def compile_ContinueNode(self, node: ContinueNode) -> Closure:
+		position = node.position
+
+		return lambda context: (None, ContinueOutsideLoopError(position, context))
+
+########################################
+#	CLOSURE INTERPRETER
+########################################
+
+class ClosureInterpreter(Interpreter):
+	def __init__(self, statements: list[StatementNode], interpretFile: InterpretFile, isAFunction: bool = False) -> None:
+		super().__init__(statements, interpretFile, isAFunction)
+		self.closures: list[Closure] = None
+
+	def compile(self) -> list[Closure]:
+		if self.closures is None:
+			compiler = ClosureCompiler(self, self.isAFunction)
+			self.closures = [compiler.compileStatement(statement, False) for statement in self.statements]
+
+		return self.closures
+
+	def interpret(self, context: Context) -> tuple[list[RuntimeValue], RTError]:
+		values: list[RuntimeValue] = []
+
+		for closure in self.compile():
+			value, error = closure(context)
+			if error:
+				if isinstance(error, ReturnSignal):
+					self.returnValue = error.value
+					return values, None
+
+				return None, self.setErrorContext(error, context)
+
+			values.append(value)
+
+		if self.isAFunction:
+			file = File("<DEFAULT_VARIABLE>", "")
+			self.returnValue = makeNull(StartEndPosition(file, -1), context)
+
+		return values, None
+
+	# Runs a statement on the tree walker for a closure. RETURN, BREAK and
+	# CONTINUE only set the state of the interpreter there, they are turned into
+	# the signals of the closures
+
+	def visitNested(self, node: StatementNode, context: Context, insideLoop: bool, isAFunction: bool) -> tuple[RuntimeValue, RTError]:
+		returnValue = self.returnValue
+		wasAFunction = self.isAFunction
+
+		self.returnValue = None
+		self.isAFunction = isAFunction
+
+		try:
+			value, error = self.visit(node, context, insideLoop)
+			nestedReturnValue = self.returnValue
+		finally:
+			self.returnValue = returnValue
+			self.isAFunction = wasAFunction
+
+		if error:
+			return None, error
+
+		if nestedReturnValue:
+			return None, ReturnSignal(nestedReturnValue)
+
+		if self.breakLoop:
+			self.breakLoop = False
+			return None, BREAK
+
+		if self.continueLoop:
+			self.continueLoop = False
+			return None, CONTINUE
+
+		return value, None
+
+	def runFunction(self, func: Function, executeContext: Context) -> tuple[RuntimeValue, RTError]:
+		# Functions defined on the tree walker have no cell to compile into yet
+		if func.compiledBody is None:
+			func.compiledBody = [None]
+
+		body = func.compiledBody[0]
+		if body is None:
+			body = func.compiledBody[0] = ClosureCompiler(self, True).compileBody(func.body, False)
+
+		_, error = body(executeContext)
+		if error:
+			if isinstance(error, ReturnSignal):
+				return error.value, None
+
+			return None, self.setErrorContext(error, executeContext)
+
+		file = File("<DEFAULT_VARIABLE>", "")
+		return makeNull(StartEndPosition(file, -1), executeContext), None
@@ -0,0 +1,285 @@
+########################################
+#	IMPORTS
+########################################
+
+from __future__ import annotations
+from .statementclass import StatementNode, NumberNode, BinaryOperationNode, UnaryOperationNode, VariableAccessNode, VariableAssignNode, VariableDeclareNode, WhileNode, FunctionCallNode, StringNode, ListNode, GetItemNode, FunctionDefineNode, ReturnNode, IfContainerNode, SetItemNode, ImportNode, DictionaryNode, ContinueNode, BreakNode, ForNode, RangeNode, GetAttributeNode, OPERATION_NODES, flattenOperations
+from .tokenclass import TokenTypes
+from .keywords import Keywords
+from .bytecode import *
+from .utils import Nested, runNested
+
+########################################
+#	CONSTANTS
+########################################
+
+BINARY_OPCODES = {
+	TokenTypes.PLUS: BINARY_ADD,
+	TokenTypes.MINUS: BINARY_SUBTRACT,
+	TokenTypes.MULTIPLY: BINARY_MULTIPLY,
+	TokenTypes.DIVIDE: BINARY_DIVIDE,
+	TokenTypes.POWER: BINARY_POWER,
+	TokenTypes.MODULUS: BINARY_MODULUS,
+	TokenTypes.DOUBLE_EQUALS: BINARY_EQUALS,
+	TokenTypes.NOT_EQUALS: BINARY_NOT_EQUALS,
+	TokenTypes.GRATER_THAN: BINARY_GRATER_THAN,
+	TokenTypes.LESS_THAN: BINARY_LESS_THAN,
+	TokenTypes.GREATER_EQUALS: BINARY_GREATER_EQUALS,
+	TokenTypes.LESS_EQUALS: BINARY_LESS_EQUALS
+}
+
+# Operations other than operators and the ones taking any number of operands
+OPERATION_OPCODES = {
+	GetItemNode: GET_ITEM,
+	GetAttributeNode: GET_ATTRIBUTE,
+	SetItemNode: SET_ITEM,
+	RangeNode: BUILD_RANGE
+}
+
+ASSIGN_TYPES = {
+	"=": 0,
+	"+=": 1,
+	"-=": 2,
+	"*=": 3,
+	"/=": 4
+}
+
+########################################
+#	LOOP
+########################################
+
+class Loop:
+	def __init__(self, continueTarget: int, isForLoop: bool) -> None:
+		self.continueTarget = continueTarget
+		self.isForLoop = isForLoop
+		self.breakJumps: list[int] = []
+
+########################################
+#	COMPILER
+########################################
+
+# Statements that contain other statements or expressions compile as generators
+# on runNested. They yield the compilation of what they contain instead of
+# calling it, so deeply nested blocks, calls and lists compile without recursion
+
+class Compiler:
+	def __init__(self) -> None:
+		self.code: CodeObject = None
+
+	def compileModule(self, statements: list[StatementNode], name: str) -> CodeObject:
+		self.code = CodeObject(name, False)
+
+		for statement in statements:
+			runNested(self.compileStatement(statement, None))
+			self.code.emit(STORE_RESULT)
+
+		self.code.emit(END)
+
+		return self.code
+
+	def compileFunction(self, statements: list[StatementNode], name: str) -> CodeObject:
+		self.code = CodeObject(name, True)
+
+		runNested(self.compileBody(statements, None))
+		self.code.emit(END)
+
+		return self.code
+
+	def compileBody(self, statements: list[StatementNode], loop: Loop | None) -> Nested[None]:
+		for statement in statements:
+			yield self.compileStatement(statement, loop)
+			self.code.emit(POP_TOP)
+
+	# Statements directly inside of loop and if bodies are the only places where
+	# BREAK and CONTINUE affect the loop, everywhere else they are errors
+
+	def compileStatement(self, node: StatementNode, loop: Loop | None) -> Nested[None]:
+		if isinstance(node, BreakNode):
+			if not loop:
+				self.code.emit(BREAK_OUTSIDE_LOOP, 0, node)
+				return
+
+			if loop.isForLoop:
+				self.code.emit(POP_TOP)
+
+			loop.breakJumps.append(self.code.emit(JUMP, 0, node))
+		elif isinstance(node, ContinueNode):
+			if not loop:
+				self.code.emit(CONTINUE_OUTSIDE_LOOP, 0, node)
+				return
+
+			self.code.emit(JUMP, loop.continueTarget, node)
+		elif isinstance(node, IfContainerNode):
+			yield self.compileIf(node, loop)
+		else:
+			yield self.compile(node)
+
+	# Nodes without anything to compile inside of them are emitted right away,
+	# the others return the generator compiling them
+
+	def compile(self, node: StatementNode) -> Nested[None]:
+		functionName = f"compile_{type(node).__name__}"
+		func = getattr(self, functionName, self.compileFunctionNotFound)
+
+		compiled = func(node)
+		if compiled is not None:
+			yield compiled
+
+	# The parser only makes nodes and operators the compiler knows, reaching one
+	# it doesn't is a bug in the compiler and not an error of the program
+
+	def compileFunctionNotFound(self, node: StatementNode) -> None:
+		raise AssertionError(f"compile_{type(node).__name__} is missing")
+
+	def compileIf(self, node: IfContainerNode, loop: Loop | None) -> Nested[None]:
+		endJumps = []
+
+		for ifNode in [node.ifNode] + node.elseIfNodes:
+			yield self.compile(ifNode.condition)
+			nextJump = self.code.emit(POP_JUMP_IF_FALSE, 0, ifNode.condition)
+
+			yield self.compileBody(ifNode.body, loop)
+			self.code.emit(PUSH_NULL, 0, ifNode)
+			endJumps.append(self.code.emit(JUMP, 0, ifNode))
+
+			self.code.patch(nextJump, self.code.nextIndex())
+
+		if node.elseNode:
+			yield self.compileBody(node.elseNode.body, loop)
+			self.code.emit(PUSH_NULL, 0, node.elseNode)
+		else:
+			self.code.emit(PUSH_NULL, 0, node)
+
+		for endJump in endJumps:
+			self.code.patch(endJump, self.code.nextIndex())
+
+	def compile_NumberNode(self, node: NumberNode) -> None:
+		self.code.emit(LOAD_NUMBER, 0, node)
+
+	def compile_StringNode(self, node: StringNode) -> None:
+		self.code.emit(LOAD_STRING, 0, node)
+
+	# Operands are emitted from a flattened list instead of compiling them
+	# recursively, deep operator expressions, calls and lists compile to flat
+	# bytecode
+
+	def compileOperations(self, node: StatementNode) -> Nested[None]:
+		for operation in flattenOperations(node):
+			operationType = type(operation)
+
+			if operationType not in OPERATION_NODES:
+				yield self.compile(operation)
+			elif operationType is BinaryOperationNode:
+				self.emitBinaryOperation(operation)
+			elif operationType is UnaryOperationNode:
+				self.emitUnaryOperation(operation)
+			elif operationType is FunctionCallNode:
+				self.code.emit(CALL_FUNCTION, len(operation.arguments), operation)
+			elif operationType is ListNode:
+				self.code.emit(BUILD_LIST, len(operation.expressions), operation)
+			elif operationType is DictionaryNode:
+				self.code.emit(BUILD_DICTIONARY, len(operation.expressions), operation)
+			else:
+				self.code.emit(OPERATION_OPCODES[operationType], 0, operation)
+
+	compile_BinaryOperationNode = compile_UnaryOperationNode = compile_FunctionCallNode = compile_ListNode = compile_DictionaryNode = compile_RangeNode = compile_GetItemNode = compile_GetAttributeNode = compile_SetItemNode = compileOperations
+
+	def emitBinaryOperation(self, node: BinaryOperationNode) -> None:
+		if node.operationToken.type not in BINARY_OPCODES:
+			raise AssertionError(f"{node.operationToken.type} has no opcode")
+
+		self.code.emit(BINARY_OPCODES[node.operationToken.type], 0, node)
+
+	def emitUnaryOperation(self, node: UnaryOperationNode) -> None:
+		if node.operationToken.type == TokenTypes.MINUS:
+			self.code.emit(UNARY_MINUS, 0, node)
+		elif node.operationToken.type == TokenTypes.PLUS:
+			self.code.emit(UNARY_PLUS, 0, node)
+		elif node.operationToken.isKeyword(Keywords.NOT):
+			self.code.emit(UNARY_NOT, 0, node)
+		else:
+			raise AssertionError(f"{node.operationToken.type} has no opcode")
+
+	def compile_VariableAccessNode(self, node: VariableAccessNode) -> None:
+		self.code.emit(LOAD_NAME, 0, node)
+
+	def compile_VariableAssignNode(self, node: VariableAssignNode) -> Nested[None]:
+		yield self.compile(node.valueNode)
+		self.code.emit(ASSIGN_NAME, ASSIGN_TYPES[node.type], node)
+
+	def compile_VariableDeclareNode(self, node: VariableDeclareNode) -> Nested[None]:
+		yield self.compile(node.valueNode)
+		self.code.emit(DECLARE_NAME, 1 if node.declareToken.isKeyword(Keywords.CONST) else 0, node)
+
+	def compile_WhileNode(self, node: WhileNode) -> Nested[None]:
+		startIndex = self.code.nextIndex()
+
+		yield self.compile(node.condition)
+		exitJump = self.code.emit(POP_JUMP_IF_FALSE, 0, node.condition)
+
+		loop = Loop(startIndex, False)
+		yield self.compileBody(node.body, loop)
+		self.code.emit(JUMP, startIndex, node)
+
+		endIndex = self.code.nextIndex()
+		self.code.patch(exitJump, endIndex)
+		for breakJump in loop.breakJumps:
+			self.code.patch(breakJump, endIndex)
+
+		self.code.emit(PUSH_NULL, 0, node)
+
+	def compile_ForNode(self, node: ForNode) -> Nested[None]:
+		yield self.compile(node.iterator)
+		self.code.emit(SETUP_FOR, 0, node)
+		startIndex = self.code.emit(FOR_ITER, 0, node)
+
+		loop = Loop(startIndex, True)
+		yield self.compileBody(node.body, loop)
+		self.code.emit(JUMP, startIndex, node)
+
+		endIndex = self.code.nextIndex()
+		self.code.patch(startIndex, endIndex)
+		for breakJump in loop.breakJumps:
+			self.code.patch(breakJump, endIndex)
+
+		self.code.emit(PUSH_NULL, 0, node)
+
+	# The body is compiled into a code object of its own, which is swapped in
+	# while the body compiles
+
+	def compile_FunctionDefineNode(self, node: FunctionDefineNode) -> Nested[None]:
+		code = self.code
+		self.code = CodeObject(f"<FUNCTION {node.variable}>", True)
+
+		yield self.compileBody(node.body, None)
+		self.code.emit(END)
+
+		functionCode = self.code
+		self.code = code
+
+		self.code.emit(MAKE_FUNCTION, functionCode, node)
+
+	def compile_ReturnNode(self, node: ReturnNode) -> Nested[None]:
+		if not self.code.isAFunction:
+			self.code.emit(RETURN_OUTSIDE_FUNCTION, 0, node)
+			return
+
+		if node.value:
+			yield self.compile(node.value)
+			self.code.emit(RETURN_VALUE, 0, node)
+			return
+
+		self.code.emit(RETURN_NULL, 0, node)
+
+	def compile_IfContainerNode(self, node: IfContainerNode) -> Nested[None]:
+		return self.compileIf(node, None)
+
+	def compile_ImportNode(self, node: ImportNode) -> Nested[None]:
+		yield self.compile(node.moduleName)
+		self.code.emit(IMPORT, 0, node)
+
+	def compile_BreakNode(self, node: BreakNode) -> None:
+		self.code.emit(BREAK_OUTSIDE_LOOP, 0, node)
+
+	def compile_ContinueNode(self, node: ContinueNode) -> None:
+		self.code.emit(CONTINUE_OUTSIDE_LOOP, 0, node)
@@ -11,6 +11,8 @@ from .utils import StartEndPosition
 ########################################
 
 class Variable:
+	__slots__ = ("constant", "value", "builtIn")
+
 	def __init__(self, value: any, constant: bool, builtIn: bool) -> None:
 		self.constant = constant
 		self.value = value
@@ -21,53 +23,135 @@ class Variable:
 ########################################
 
 class VariableTable:
-	def __init__(self) -> None:
+	# The process wide table holding TRUE, FALSE, NULL and the builtin functions,
+	# set by builtInfunctions once it has been built, it is the root parent of
+	# every scope chain
+
+	builtins: VariableTable = None
+
+	# Function frames are given the layout the resolver computed for the function
+	# body, the names in it live in the slots list and every other name in the
+	# variables dict
+
+	def __init__(self, layout: dict[str, int] = None) -> None:
 		self.variables: dict[str, Variable] = {}
+		self.layout = layout if layout else {}
+		self.slots: list[Variable | None] = [None] * len(self.layout)
 		self.parent: VariableTable = None
 		self.context: Context = None
-	
+
+	def getVariable(self, key: str) -> Variable | None:
+		if self.layout:
+			slot = self.layout.get(key)
+			if slot is not None:
+				return self.slots[slot]
+
+		return self.variables.get(key)
+
+	def isDeclared(self, key: str) -> bool:
+		return self.getVariable(key) is not None or (VariableTable.builtins is not None and key in VariableTable.builtins.variables)
+
 	def declareVariable(self, key: str, value: any, constant: bool, position: StartEndPosition, builtIn: bool = False) -> tuple[any, Error]:
-		if key in self.variables.keys():
-			return None, VariableDeclarationError(key, position.copy(), self.context)
+		if self.isDeclared(key):
+			return None, VariableDeclarationError(key, position, self.context)
 
-		self.variables[key] = Variable(value, constant, builtIn)
+		variable = Variable(value, constant, builtIn)
+
+		slot = self.layout.get(key) if self.layout else None
+		if slot is None:
+			self.variables[key] = variable
+		else:
+			self.slots[slot] = variable
 
 		self.test = "abc"
 
 		return value, None
 
 	def assignVariable(self, key: str, value: any, position: StartEndPosition) -> tuple[any, RTError]:
-		environment, error = self.resolve(key, position)
+		variable, error = self.resolve(key, position)
 		if error:
 			return None, error
 
-		variable = environment.variables[key]
 		if variable.constant:
-			return None, VariableConstantAssignmentError(key, position.copy(), self.context)
+			return None, VariableConstantAssignmentError(key, position, self.context)
 
 		variable.value = value
 
 		return value, None
 
 	def lookupVariable(self, key: str, position: StartEndPosition) -> tuple[any, RTError]:
-		environment, error = self.resolve(key, position)
+		variable, error = self.resolve(key, position)
 		if error:
 			return None, error
 
-		return environment.variables[key].value, None
+		return variable.value, None
 
-	def resolve(self, key: str, position: StartEndPosition) -> tuple[VariableTable, RTError]:
-		if key in self.variables.keys():
-			return self, None
+	# Errors are reported in the outermost scope that isn't the builtins table, the
+	# same scope the error came from before the builtins were shared
 
-		if not self.parent:
-			return None, VariableNotDefinedError(key, position.copy(), self.context)
+	def resolve(self, key: str, position: StartEndPosition) -> tuple[Variable, RTError]:
+		environment = self
+		outermost = self
 
-		parentResolve, error = self.parent.resolve(key, position)
-		if error:
-			return None, error
+		while True:
+			variable = environment.getVariable(key)
+			if variable is not None:
+				return variable, None
+
+			if not environment.parent:
+				return None, VariableNotDefinedError(key, position, outermost.context)
+
+			environment = environment.parent
+			if environment is not VariableTable.builtins:
+				outermost = environment
+
+	# The At functions take the (depth, slot) the resolver gave the node, an empty
+	# slot means the variable hasn't been declared yet so the name based lookup is
+	# used to find it in an outer scope or to produce the same error as before
+
+	def getSlot(self, depth: int, slot: int) -> Variable | None:
+		environment = self
+		while depth:
+			environment = environment.parent
+			depth -= 1
+
+		return environment.slots[slot]
+
+	def declareVariableAt(self, key: str, slot: int | None, value: any, constant: bool, position: StartEndPosition) -> tuple[any, Error]:
+		if slot is None:
+			return self.declareVariable(key, value, constant, position)
+
+		if self.slots[slot] is not None:
+			return None, VariableDeclarationError(key, position, self.context)
+
+		self.slots[slot] = Variable(value, constant, False)
+
+		return value, None
+
+	def assignVariableAt(self, key: str, depth: int, slot: int | None, value: any, position: StartEndPosition) -> tuple[any, RTError]:
+		if slot is None:
+			return self.assignVariable(key, value, position)
+
+		variable = self.getSlot(depth, slot)
+		if variable is None:
+			return self.assignVariable(key, value, position)
+
+		if variable.constant:
+			return None, VariableConstantAssignmentError(key, position, self.context)
+
+		variable.value = value
+
+		return value, None
+
+	def lookupVariableAt(self, key: str, depth: int, slot: int | None, position: StartEndPosition) -> tuple[any, RTError]:
+		if slot is None:
+			return self.lookupVariable(key, position)
+
+		variable = self.getSlot(depth, slot)
+		if variable is None:
+			return self.lookupVariable(key, position)
 
-		return parentResolve, None
+		return variable.value, None
 
 ########################################
 #	CONTEXT
@@ -85,5 +169,5 @@ class Context:
 	def setVariableTable(self, variableTable: VariableTable) -> None:
 		self.variableTable = variableTable
 		self.variableTable.context = self
-		self.variableTable.parent = self.parent.variableTable if self.parent else None
+		self.variableTable.parent = self.parent.variableTable if self.parent else VariableTable.builtins
 	
\ No newline at end of file
@@ -17,11 +17,12 @@ class Error:
 
 	def __repr__(self) -> str:
 		errorText = f"{self.name}: {self.details}\n"
-		errorText += f"file: {self.position.file.name}, ln: {self.position.start.line}, col: {self.position.start.column}"
+		line, column = self.position.file.lineColumn(self.position.start)
+		errorText += f"file: {self.position.file.name}, ln: {line}, col: {column}"
 		return errorText
 
 	def copy(self) -> Error:
-		return Error(self.name, self.details, self.position.copy())
+		return Error(self.name, self.details, self.position)
 
 ########################################
 #	ERRORS
@@ -66,8 +67,11 @@ class RTError(Error):
 			errorText += "\n" + self.context.displayName
 			errorText += "\n\n"
 
-		codeAtLine = self.position.file.text.split("\n")[self.position.start.line - 1]
-		arrows = (" " * (self.position.start.column)) + ("^" * (self.position.end.column - self.position.start.column))
+		line, column = self.position.file.lineColumn(self.position.start)
+		_, endColumn = self.position.file.lineColumn(self.position.end)
+
+		codeAtLine = self.position.file.lineText(line)
+		arrows = (" " * column) + ("^" * (endColumn - column))
 
 		errorText += codeAtLine + "\n"
 		errorText += arrows + "\n"
@@ -77,7 +81,7 @@ class RTError(Error):
 
 		errorText += f"{self.name}: {self.details}\n"
 
-		errorText += f"\nfile: {self.position.file.name}, ln: {self.position.start.line}, col: {self.position.start.column}"
+		errorText += f"\nfile: {self.position.file.name}, ln: {line}, col: {column}"
 		
 
 		return errorText
@@ -104,7 +108,7 @@ class CircularImportError(RTError):
 
 class InvalidIteratorError(RTError):
 	def __init__(self, position: StartEndPosition, context) -> None:
-		super().__init__("Iterator inside of for loops can only be of type list", position, context, "InvalidIteratorError")
+		super().__init__("Iterator inside of for loops can only be a list, range, string, dictionary or generator", position, context, "InvalidIteratorError")
 
 class ReturnOutsideFunctionError(RTError):
 	def __init__(self, position: StartEndPosition, context) -> None:
@@ -136,4 +140,8 @@ class InvalidStringError(RTError):
 
 class KeyError_(RTError):
 	def __init__(self, key: str, position: StartEndPosition, context) -> None:
-		super().__init__(f"Invalid key with value {key}", position, context, "KeyError")
\ No newline at end of file
+		super().__init__(f"Invalid key with value {key}", position, context, "KeyError")
+
+class RecursionError_(RTError):
+	def __init__(self, position: StartEndPosition, context) -> None:
+		super().__init__("Functions are called too deeply", position, context, "RecursionError")
\ No newline at end of file
@@ -4,6 +4,7 @@ from .interpreter import Interpreter
 from .contextclass import Context, VariableTable
 from .tokenizer import Tokenizer
 from .runtimevaluesclass import RuntimeValue
+from .utils import InterpretFile
 
 v = VariableTable()
 i: Interpreter = None
@@ -11,20 +12,13 @@ context: Context = None
 
 def resetVariables():
 	v.variables = {}
-	if i and context:
-		i.addDefaultVariables(context)
 
 def interpret(code, name) -> list[RuntimeValue]:
 	global i
 	global context
 
 	t = Tokenizer(name, code)
-	tokens, error = t.tokenize()
-
-	if error:
-		raise error
-	
-	p = Parser(name, tokens)
+	p = Parser(name, t.generateTokens())
 
 	statements, error = p.parse()
 
@@ -34,8 +28,7 @@ def interpret(code, name) -> list[RuntimeValue]:
 	context = Context("SHELL")
 	context.setVariableTable(v)
 
-	i = Interpreter(statements)
-	i.addDefaultVariables(context)
+	i = Interpreter(statements, InterpretFile(name, None))
 	out, error = i.interpret(context)
 
 	if error:
@@ -2,17 +2,51 @@
 #	IMPORTS
 ########################################
 
-from .statementclass import StatementNode, NumberNode, BinaryOperationNode, UnaryOperationNode, VariableAccessNode, VariableAssignNode, VariableDeclareNode, WhileNode, FunctionCallNode, StringNode, ListNode, GetItemNode, FunctionDefineNode, ReturnNode, IfContainerNode, SetItemNode, ImportNode, DictionaryNode, ContinueNode, BreakNode, ForNode, RangeNode, GetAttributeNode
+from .statementclass import StatementNode, NumberNode, BinaryOperationNode, UnaryOperationNode, VariableAccessNode, VariableAssignNode, VariableDeclareNode, WhileNode, FunctionCallNode, StringNode, ListNode, GetItemNode, FunctionDefineNode, ReturnNode, IfContainerNode, SetItemNode, ImportNode, DictionaryNode, ContinueNode, BreakNode, ForNode, RangeNode, GetAttributeNode, ExpressionNode, OPERATION_NODES, flattenOperations
 from .contextclass import Context, VariableTable
-from .runtimevaluesclass import RuntimeValue, Number, Boolean, Null, BuiltInFunction, String, List, Function, Dictionary, PythonFunction
+from .runtimevaluesclass import RuntimeValue, Number, Boolean, Null, BuiltInFunction, String, List, Range, Function, Dictionary, PythonFunction, PythonGenerator, makeNumber, makeBoolean, makeNull, makeList
 from .tokenclass import TokenTypes
-from .error import RTError, CircularImportError, InvalidIteratorError, ArgumentError, ReturnOutsideFunctionError, ContinueOutsideLoopError, BreakOutsideLoopError, ValueError_
-from .utils import StartEndPosition, Position, File, InterpretFile
-from .builtInfunctions import funcPrint, funcToString, funcToNumber
-from .tokenizer import Tokenizer
-from .parser import Parser
+from .keywords import Keywords
+from .error import RTError, CircularImportError, ArgumentError, ReturnOutsideFunctionError, ContinueOutsideLoopError, BreakOutsideLoopError, ValueError_, RecursionError_
+from .utils import StartEndPosition, File, InterpretFile, Nested, runNested
+from . import builtInfunctions # builds VariableTable.builtins
+from . import statementclass
+from .cache import parseFile
+from .moduleclass import Module, ModuleSearchPath, modules
 import os
 import importlib
+from collections import abc
+
+########################################
+#	CONSTANTS
+########################################
+
+BLOCK_NODES = (IfContainerNode, WhileNode, ForNode)
+
+# Every statement in the bodies of an IF, WHILE or FOR block
+
+def blockStatements(node: IfContainerNode | WhileNode | ForNode) -> abc.Iterator[StatementNode]:
+	if type(node) is not IfContainerNode:
+		yield from node.body
+		return
+
+	for ifNode in (node.ifNode, *node.elseIfNodes):
+		yield from ifNode.body
+
+	if node.elseNode:
+		yield from node.elseNode.body
+
+# Takes the last count values off the stack of values, in the order they were
+# pushed
+
+def popValues(values: list[RuntimeValue], count: int) -> list[RuntimeValue]:
+	if not count:
+		return []
+
+	popped = values[-count:]
+	del values[-count:]
+
+	return popped
 
 ########################################
 #	INTERPRETER
@@ -24,13 +58,22 @@ class Interpreter:
 		self.interpretFile = interpretFile
 		self.isAFunction = isAFunction
 		self.returnValue = None
+
+		# Expressions are flattened the first time they are visited
+		self.flattenedOperations: dict[ExpressionNode, list[ExpressionNode]] = {}
+		self.holdingBlocks: dict[StatementNode, bool] = {}
+		self.nestingBlocks: dict[WhileNode | ForNode, bool] = {}
+
+		# Set by BREAK and CONTINUE, checked and cleared by the closest loop
+		self.breakLoop = False
+		self.continueLoop = False
 	
 	def interpret(self, context: Context) -> tuple[list[RuntimeValue], RTError]:
 		values: list[RuntimeValue] = []
 		for statement in self.statements:
 			value, error = self.visit(statement, context)
 			if error:
-				return None, error
+				return None, self.setErrorContext(error, context)
 
 			values.append(value)
 
@@ -39,30 +82,28 @@ class Interpreter:
 
 		if self.isAFunction:
 			file = File("<DEFAULT_VARIABLE>", "")
-			self.returnValue = Null(StartEndPosition(file, Position(-1, -1, -1, file)), context)
+			self.returnValue = makeNull(StartEndPosition(file, -1), context)
 
 		return values, None
 
-	def addDefaultVariables(self, context: Context) -> None:
-		file = File("<DEFAULT_VARIABLE>", "")
-		position = StartEndPosition(file, Position(-1, -1, -1, file))
+	# Shared values have no context of their own, errors raised by them are given
+	# the context of the file or function they were raised in
 
-		context.variableTable.declareVariable("TRUE", Boolean(True, position, context), True, position, True)
-		context.variableTable.declareVariable("FALSE", Boolean(False, position, context), True, position, True)
-		context.variableTable.declareVariable("NULL", Null(position, context), True, position, True)
-		context.variableTable.declareVariable("PRINT", BuiltInFunction("PRINT", funcPrint, position, context), True, position, True)
-		context.variableTable.declareVariable("STRING", BuiltInFunction("STRING", funcToString, position, context), True, position, True)
-		context.variableTable.declareVariable("NUMBER", BuiltInFunction("NUMBER", funcToNumber, position, context), True, position, True)
+	def setErrorContext(self, error: RTError, context: Context) -> RTError:
+		if error.context is None:
+			error.context = context
+
+		return error
 
 	def convertValue(self, value: any, position: StartEndPosition, context: Context, path: str, variableName: str = "", data: dict = {}) -> tuple[RuntimeValue, RuntimeError]:
 		if isinstance(value, int) or isinstance(value, float):
-			return Number(value, position.copy(), context), None
+			return makeNumber(value, position, context), None
 		elif isinstance(value, bool):
-			return Boolean(value, position.copy(), context), None
+			return makeBoolean(value, position, context), None
 		elif isinstance(value, str):
-			return String(value, position.copy(), context), None
+			return String(value, position, context), None
 		elif value is None:
-			return Null(position.copy(), context), None
+			return makeNull(position, context), None
 		elif isinstance(value, list):
 			convertedList = []
 			for item in value:
@@ -72,7 +113,7 @@ class Interpreter:
 				
 				convertedList.append(convertedItem)
 
-			return List(convertedList, position.copy(), context), None
+			return makeList(convertedList, position, context), None
 		elif isinstance(value, dict):
 			convertedDict = {}
 			for key, value in value.items():
@@ -86,33 +127,49 @@ class Interpreter:
 
 				convertedDict[convertedKey] = convertedValue
 
-			return Dictionary(convertedDict, position.copy(), context), None
+			return Dictionary(convertedDict, position, context), None
+		elif isinstance(value, abc.Iterator):
+			return PythonGenerator(value, lambda item: self.convertValue(item, position, context, path), position, context), None
 		elif callable(value):
 			parameters = [0, 999]
 
 			if not data:
-				return None, RTError("Cannot nest functions inside of dicts in python modules", position.copy(), context)
+				return None, RTError("Cannot nest functions inside of dicts in python modules", position, context)
 
 			if "parameters" in data.keys():
 				parameters = data["parameters"]
 
-			return PythonFunction(variableName, value, position.copy(), context, path, parameters), None
+			return PythonFunction(variableName, value, position, context, path, parameters, lambda item: self.convertValue(item, position, context, path)), None
 		else:
-			return None, RTError(f"Error while trying to import module {path}\nCannot convert {type(value)} to a runtime value", position.copy(), context)
+			return None, RTError(f"Error while trying to import module {path}\nCannot convert {type(value)} to a runtime value", position, context)
 
 	def importPythonModule(self, path: str, context: Context, position: StartEndPosition, importAs: str) -> tuple[Null, RTError]:
+		module = modules.get(path)
+		if not module:
+			module, error = self.loadPythonModule(path, context, position)
+			if error:
+				return None, error
+
+			modules.add(module)
+
+		return self.bindModule(module, context, position, importAs, path.split("/")[-1][:-3])
+
+	def loadPythonModule(self, path: str, context: Context, position: StartEndPosition) -> tuple[Module, RTError]:
+		pyModuleName = ".".join(path.replace("/", ".").split(".")[:-1])
+
 		try:
-			pyModule = importlib.import_module(".".join(path.replace("/", ".").split(".")[:-1]))
+			pyModule = importlib.import_module(pyModuleName)
 		except Exception as error:
 			print(error)
-			return None, RTError(f"Error while trying to import module {path}", position.copy(), context)
+			return None, RTError(f"Error while trying to import module {path}", position, context)
 
 		try:
 			variables: dict[str, dict[str, any]] = pyModule.variables
 		except AttributeError:
-			return None, RTError(f"Module {path} dose not have a global variable variables", position.copy(), context)
+			return None, RTError(f"Module {path} dose not have a global variable variables", position, context)
 
-		variableDictionary = Dictionary({}, position.copy(), context)
+		variableDictionary = Dictionary({}, position, context)
+		exportedVariables = []
 
 		for variableName, variableData in variables.items():
 			variable = variableData["value"]
@@ -121,66 +178,48 @@ class Interpreter:
 			if error:
 				return None, error
 
-			variableDictionary.value[String(variableName, position.copy(), context)] = convertedValue
-
-			if importAs == "*":
-				context.variableTable.declareVariable(variableName, convertedValue, variableData["constant"], position.copy(), False)
+			variableDictionary.value[String(variableName, position, context)] = convertedValue
+			exportedVariables.append((variableName, convertedValue, variableData["constant"]))
 
-		if not importAs:
-			importAs = path.split("/")[-1][:-3]
+		return Module(path, variableDictionary, exportedVariables, pyModuleName), None
 
-		if importAs != "*":
-			context.variableTable.declareVariable(importAs, variableDictionary, True, position.copy(), False)
+	# Binds the variables of a module to the importing context, every variable
+	# with AS * and otherwise the module dictionary under its name
 
-		return Null(position.copy(), context), None
+	def bindModule(self, module: Module, context: Context, position: StartEndPosition, importAs: str, defaultName: str) -> tuple[Null, RTError]:
+		if importAs == "*":
+			for variableName, value, constant in module.variables:
+				context.variableTable.declareVariable(variableName, value, constant, position, False)
+		else:
+			context.variableTable.declareVariable(importAs or defaultName, module.namespace, True, position, False)
 
+		return makeNull(position, context), None
 
 	def importModule(self, moduleName: str, context: Context, position: StartEndPosition, importAs: str) -> tuple[Null, RTError]:
 		circularImport = self.interpretFile.findCircularImport(moduleName)
 		if circularImport:
-			return None, CircularImportError(self.interpretFile.filepath, moduleName, position.copy(), context)
+			return None, CircularImportError(self.interpretFile.filepath, moduleName, position, context)
 
-		path = None
-		if os.path.exists(os.path.join(os.path.dirname(self.interpretFile.filepath), "vlbasic/modules/", moduleName + ".vlb")):
-			path = os.path.join(os.path.dirname(self.interpretFile.filepath), "vlbasic/modules/", moduleName + ".vlb")
-		elif os.path.exists(os.path.join("vlbasic/modules/", moduleName + ".vlb")):
-			path = os.path.join("vlbasic/modules/", moduleName + ".vlb")
-		elif os.path.exists(os.path.join(os.path.dirname(self.interpretFile.filepath), moduleName + ".vlb")):
-			path = os.path.join(os.path.dirname(self.interpretFile.filepath), moduleName + ".vlb")
-		elif os.path.exists(moduleName + ".vlb"):
-			path = os.path.join(moduleName + ".vlb")
-		elif os.path.exists(os.path.join(os.path.dirname(self.interpretFile.filepath), "vlbasic/modules/", moduleName + ".py")):
-			_, error = self.importPythonModule(os.path.join(os.path.dirname(self.interpretFile.filepath), "vlbasic/modules/", moduleName + ".py"), context, position, importAs)
-			if error:
-				return None, error
+		path = ModuleSearchPath.forFile(self.interpretFile.filepath).find(moduleName)
+		if not path:
+			return None, RTError(f"Module {moduleName} was not found ({os.path.join(os.path.dirname(self.interpretFile.filepath), moduleName + '.vlb')})", position, context)
 
-			return Null(position.copy(), context), None
-		elif os.path.exists(os.path.join("vlbasic/modules/", moduleName + ".py")):
-			_, error = self.importPythonModule(os.path.join("vlbasic/modules/", moduleName + ".py"), context, position, importAs)
+		if path.endswith(".py"):
+			return self.importPythonModule(path, context, position, importAs)
+
+		module = modules.get(path)
+		if not module:
+			module, error = self.loadModule(moduleName, path, context, position)
 			if error:
 				return None, error
 
-			return Null(position.copy(), context), None
-
-
-		if not path:
-			return None, RTError(f"Module {moduleName} was not found ({os.path.join(os.path.dirname(self.interpretFile.filepath), moduleName + '.vlb')})", position.copy(), context)
+			modules.add(module)
 
+		return self.bindModule(module, context, position, importAs, moduleName.split("/")[-1])
 
+	def loadModule(self, moduleName: str, path: str, context: Context, position: StartEndPosition) -> tuple[Module, RTError]:
 		print(path)
-		with open(path, "r") as f:
-			inputText = f.read()
-
-		tokenizer = Tokenizer(f"{self.interpretFile.filepath}", inputText)
-		tokens, error = tokenizer.tokenize()
-
-		if error:
-			error.importStack.append(f"Error while trying to import module {moduleName}")
-			return None, error
-
-		parser = Parser(f"{self.interpretFile.filepath}", tokens)
-
-		statements, error = parser.parse()
+		statements, error = parseFile(path, f"{self.interpretFile.filepath}")
 
 		if error:
 			error.importStack.append(f"Error while trying to import module {moduleName}")
@@ -189,8 +228,7 @@ class Interpreter:
 		importFileContext = Context(f"{self.interpretFile.filepath}")
 		importFileContext.setVariableTable(VariableTable())
 		
-		interpreter = Interpreter(statements, InterpretFile(path, self.interpretFile))
-		interpreter.addDefaultVariables(importFileContext)
+		interpreter = self.__class__(statements, InterpretFile(path, self.interpretFile))
 		out, error = interpreter.interpret(importFileContext)
 
 		if error:
@@ -198,7 +236,8 @@ class Interpreter:
 			error.importStack.append(f"Error while trying to import module {moduleName}")
 			return None, error
 
-		variableDictionary = Dictionary({}, position.copy(), context)
+		variableDictionary = Dictionary({}, position, context)
+		exportedVariables = []
 
 		for variableName in importFileContext.variableTable.variables.keys():
 			variable = importFileContext.variableTable.variables[variableName]
@@ -206,43 +245,139 @@ class Interpreter:
 			if variable.builtIn:
 				continue
 
-			variableDictionary.value[String(variableName, variable.value.position.copy(), context)] = variable.value
+			variableDictionary.value[String(variableName, position, context)] = variable.value
+			exportedVariables.append((variableName, variable.value, variable.constant))
 
-			if importAs == "*":
-				context.variableTable.declareVariable(variableName, variable.value, variable.constant, position.copy(), False)
+		return Module(path, variableDictionary, exportedVariables), None
 
-		if not importAs:
-			importAs = moduleName.split("/")[-1]
+	# The visit function for every node class is looked up once per interpreter
+	# class instead of formatting and resolving the method name on every visit
 
-		if importAs != "*":
-			context.variableTable.declareVariable(importAs, variableDictionary, True, position.copy(), False)
+	@classmethod
+	def buildDispatchTable(cls) -> None:
+		cls.dispatchTable = {}
 
-		return Null(position.copy(), context), None
+		for name, nodeClass in vars(statementclass).items():
+			if not isinstance(nodeClass, type):
+				continue
+
+			func = getattr(cls, f"visit_{name}", None)
+			if func:
+				cls.dispatchTable[nodeClass] = func
+
+	def __init_subclass__(cls, **kwargs) -> None:
+		super().__init_subclass__(**kwargs)
+		cls.buildDispatchTable()
 
 	def visit(self, statement: StatementNode, context: Context, insideLoop: bool = False) -> tuple[RuntimeValue | Number, RTError]:
-		functionName = f"visit_{type(statement).__name__}"
-		func = getattr(self, functionName, self.visitFunctionNotFound)
-		return func(statement, context, insideLoop)
+		func = self.dispatchTable.get(type(statement))
+		if func is None:
+			func = getattr(self.__class__, f"visit_{type(statement).__name__}", None)
+			if func is None:
+				return self.visitFunctionNotFound(statement, context, insideLoop)
+
+			self.dispatchTable[type(statement)] = func
+
+		return func(self, statement, context, insideLoop)
 
 	def visitFunctionNotFound(self, statement: StatementNode, context: Context, insideLoop: bool) -> None:
 		raise NotImplementedError(f"visit_{type(statement).__name__} is not implemented")
 
 	def visit_NumberNode(self, node: NumberNode, context: Context, insideLoop: bool) -> tuple[Number, RTError]:
-		return Number(node.token.value, node.position.copy(), context), None
+		return makeNumber(node.token.value, node.position, context), None
 
 	def visit_StringNode(self, node: StringNode, context: Context, insideLoop: bool) -> tuple[String, RTError]:
-		return String(node.token.value, node.position.copy(), context), None
+		return String(node.token.value, node.position, context), None
+
+	# Operators, calls, lists and so on are evaluated from a flattened list with a
+	# stack of values instead of visiting their operands recursively, so a long
+	# chain like a + a + ... + a, deeply nested parentheses or calls inside of
+	# calls can't overflow. The common case of a single operation on two operands
+	# that aren't operations themselves is visited directly
 
 	def visit_BinaryOperationNode(self, node: BinaryOperationNode, context: Context, insideLoop: bool) -> tuple[Number, RTError]:
-		left, error = self.visit(node.left, context)
-		if error:
-			return None, error
+		if type(node.left) not in OPERATION_NODES and type(node.right) not in OPERATION_NODES:
+			left, error = self.visit(node.left, context)
+			if error:
+				return None, error
 
-		right, error = self.visit(node.right, context)
-		if error:
-			return None, error
+			right, error = self.visit(node.right, context)
+			if error:
+				return None, error
+
+			return self.binaryOperation(node, left, right)
 
-		position = left.position.start.createStartEndPosition(right.position.end)
+		return self.visitOperations(node, context)
+
+	def visit_UnaryOperationNode(self, node: UnaryOperationNode, context: Context, insideLoop: bool) -> tuple[Number, RTError]:
+		if type(node.expression) not in OPERATION_NODES:
+			number, error = self.visit(node.expression, context)
+			if error:
+				return None, error
+
+			return self.unaryOperation(node, number, context)
+
+		return self.visitOperations(node, context)
+
+	def visitOperations(self, node: ExpressionNode, context: Context, insideLoop: bool = False) -> tuple[RuntimeValue, RTError]:
+		operations = self.flattenedOperations.get(node)
+		if operations is None:
+			operations = self.flattenedOperations[node] = flattenOperations(node)
+
+		values = []
+		dispatchTable = self.dispatchTable
+
+		for operation in operations:
+			operationType = type(operation)
+
+			# Operands are looked up in the dispatch table right here, going through
+			# visit for each of them is most of the time spent on small expressions
+			if operationType not in OPERATION_NODES:
+				visit = dispatchTable.get(operationType)
+				if visit:
+					value, error = visit(self, operation, context, False)
+				else:
+					value, error = self.visit(operation, context)
+			elif operationType is BinaryOperationNode:
+				right = values.pop()
+				value, error = self.binaryOperation(operation, values.pop(), right)
+			elif operationType is FunctionCallNode:
+				argumentsVisited = popValues(values, len(operation.arguments))
+				value, error = self.callFunction(values.pop(), argumentsVisited, operation.position, context)
+			elif operationType is UnaryOperationNode:
+				value, error = self.unaryOperation(operation, values.pop(), context)
+			elif operationType is ListNode:
+				value, error = makeList(popValues(values, len(operation.expressions)), operation.position, context), None
+			elif operationType is DictionaryNode:
+				items = popValues(values, len(operation.expressions) * 2)
+				value, error = Dictionary(dict(zip(items[::2], items[1::2])), operation.position, context), None
+			elif operationType is GetItemNode:
+				item = values.pop()
+				value, error = values.pop().getItem(item, operation.position)
+			elif operationType is GetAttributeNode:
+				item = values.pop()
+				value, error = values.pop().getAttribute(item, operation.position)
+			elif operationType is SetItemNode:
+				newValue = values.pop()
+				item = values.pop()
+				_, error = values.pop().setItem(item, newValue, operation.position)
+				value = makeNull(operation.position, context)
+			else:
+				stepValue = values.pop()
+				stopValue = values.pop()
+				value, error = self.makeRange(operation, values.pop(), stopValue, stepValue, context)
+
+			if error:
+				return None, error
+
+			values.append(value)
+
+		return values[0], None
+
+	visit_FunctionCallNode = visit_ListNode = visit_DictionaryNode = visit_GetItemNode = visit_GetAttributeNode = visit_SetItemNode = visit_RangeNode = visitOperations
+
+	def binaryOperation(self, node: BinaryOperationNode, left: RuntimeValue, right: RuntimeValue) -> tuple[RuntimeValue, RTError]:
+		position = node.position
 
 		if node.operationToken.type == TokenTypes.PLUS:
 			result, error = left.added(right, position)
@@ -276,31 +411,28 @@ class Interpreter:
 		
 		return result, None
 
-	def visit_UnaryOperationNode(self, node: UnaryOperationNode, context: Context, insideLoop: bool) -> tuple[Number, RTError]:
-		number, error = self.visit(node.expression, context)
-		if error:
-			return None, error
-
-		position = node.operationToken.position.start.createStartEndPosition(node.expression.position.end)
+	def unaryOperation(self, node: UnaryOperationNode, number: RuntimeValue, context: Context) -> tuple[RuntimeValue, RTError]:
+		position = node.operationToken.position.until(node.expression.position)
 
 		if node.operationToken.type == TokenTypes.MINUS:
-			number, error = number.multiplied(Number(-1, number.position.copy(), context), position)
+			number, error = number.multiplied(makeNumber(-1, position, context), position)
 		elif node.operationToken.type == TokenTypes.PLUS:
-			number, error = number.multiplied(Number(1, number.position.copy(), context), position)
-		elif node.operationToken.isKeyword("NOT"):
+			number, error = number.multiplied(makeNumber(1, position, context), position)
+		elif node.operationToken.isKeyword(Keywords.NOT):
 			number, error = number.notted(position)
 		else:
 			raise f"{node.operationToken.type} is not implemented!"
 
+		if error:
+			return None, error
+
 		return number, None
 
 	def visit_VariableAccessNode(self, node: VariableAccessNode, context: Context, insideLoop: bool) -> tuple[Number,  RTError]:
-		value, error = context.variableTable.lookupVariable(node.token.value, node.position.copy())
+		value, error = context.variableTable.lookupVariableAt(node.token.value, node.depth, node.slot, node.position)
 		if error:
 			return None, error
 
-		value.position = node.position.copy()
-
 		return value, None
 
 	def visit_VariableAssignNode(self, node: VariableAssignNode, context: Context, insideLoop: bool) -> tuple[Number,  RTError]:
@@ -310,278 +442,375 @@ class Interpreter:
 			
 		assignTo = result
 		if node.type == "+=":
-			variableValue, error = context.variableTable.lookupVariable(node.token.value, node.token.position.copy())
+			variableValue, error = context.variableTable.lookupVariableAt(node.token.value, node.depth, node.slot, node.token.position)
 			if error:
 				return None, error
 
-			assignTo, error = variableValue.added(assignTo, node.position.copy())
+			assignTo, error = variableValue.added(assignTo, node.position)
 			if error:
 				return None, error
 		elif node.type == "-=":
-			variableValue, error = context.variableTable.lookupVariable(node.token.value, node.token.position.copy())
+			variableValue, error = context.variableTable.lookupVariableAt(node.token.value, node.depth, node.slot, node.token.position)
 			if error:
 				return None, error
 
-			assignTo, error = variableValue.subtracted(assignTo, node.position.copy())
+			assignTo, error = variableValue.subtracted(assignTo, node.position)
 			if error:
 				return None, error
 		elif node.type == "*=":
-			variableValue, error = context.variableTable.lookupVariable(node.token.value, node.token.position.copy())
+			variableValue, error = context.variableTable.lookupVariableAt(node.token.value, node.depth, node.slot, node.token.position)
 			if error:
 				return None, error
 
-			assignTo, error = variableValue.multiplied(assignTo, node.position.copy())
+			assignTo, error = variableValue.multiplied(assignTo, node.position)
 			if error:
 				return None, error
 		elif node.type == "/=":
-			variableValue, error = context.variableTable.lookupVariable(node.token.value, node.token.position.copy())
+			variableValue, error = context.variableTable.lookupVariableAt(node.token.value, node.depth, node.slot, node.token.position)
 			if error:
 				return None, error
 
-			assignTo, error = variableValue.divided(assignTo, node.position.copy())
+			assignTo, error = variableValue.divided(assignTo, node.position)
 			if error:
 				return None, error
 			
-		value, error = context.variableTable.assignVariable(node.token.value, assignTo, node.position.copy())
+		value, error = context.variableTable.assignVariableAt(node.token.value, node.depth, node.slot, assignTo, node.position)
 		if error:
 			return None, error
 
 		return value, None
 
 	def visit_VariableDeclareNode(self, node: VariableDeclareNode, context: Context, insideLoop: bool) -> tuple[Number,  RTError]:
-		isConstant = node.declareToken.isKeyword("CONST")
+		isConstant = node.declareToken.isKeyword(Keywords.CONST)
 
 		result, error = self.visit(node.valueNode, context)
 		if error:
 			return None, error
 
-		value, error = context.variableTable.declareVariable(node.token.value, result, isConstant, node.position.copy())
+		value, error = context.variableTable.declareVariableAt(node.token.value, node.slot, result, isConstant, node.position)
 		if error:
 			return None, error
 
 		return value, None
 	
-	def visit_WhileNode(self, node: WhileNode, context: Context, insideLoop: bool) -> tuple[Number,  RTError]:
+	# IF, WHILE and FOR blocks are visited like any other statement as long as
+	# the blocks in their body hold no blocks of their own. A block nesting blocks
+	# deeper than that runs as a generator on runNested instead and yields the
+	# blocks in it, so blocks nest without recursion and can be nested
+	# arbitrarily deep. A block visited with nested set returns its generator
+	# instead of running it. Calls still recurse through the blocks they are in,
+	# the plain path keeps them from using more stack than they need
+
+	def holdsBlocks(self, node: IfContainerNode | WhileNode | ForNode) -> bool:
+		holds = self.holdingBlocks.get(node)
+		if holds is None:
+			holds = self.holdingBlocks[node] = any(type(statement) in BLOCK_NODES for statement in blockStatements(node))
+
+		return holds
+
+	def nestsBlocks(self, node: WhileNode | ForNode) -> bool:
+		nests = self.nestingBlocks.get(node)
+		if nests is None:
+			nests = self.nestingBlocks[node] = any(type(statement) in BLOCK_NODES and self.holdsBlocks(statement) for statement in node.body)
+
+		return nests
+
+	def visit_WhileNode(self, node: WhileNode, context: Context, insideLoop: bool, nested: bool = False) -> tuple[Null, RTError] | Nested[tuple[Null, RTError]]:
+		if self.nestsBlocks(node):
+			loop = self.whileBlock(node, context)
+			return loop if nested else runNested(loop)
+
+		dispatchTable = self.dispatchTable
+
 		condition, error = self.visit(node.condition, context)
 		if error:
 			return None, error
 
-		conditionBoolean, error = condition.toBoolean(node.condition.position.copy())
+		conditionBoolean, error = condition.toBoolean(node.condition.position)
 		if error:
 			return None, error
 
 		while conditionBoolean.value:
-			breakLoop = False
-			continueLoop = False
-
 			for statement in node.body:
-				if isinstance(statement, ContinueNode):
-					continue
-				elif isinstance(statement, BreakNode):
-					break
+				visit = dispatchTable.get(type(statement))
+				if visit:
+					statementVisited, error = visit(self, statement, context, True)
+				else:
+					statementVisited, error = self.visit(statement, context, True)
 
-				statementVisited, error = self.visit(statement, context, True)
-				if error: 
+				if error:
 					return None, error
 
-				if statementVisited.breakLoop:
-					breakLoop = True
-					break
-				elif statementVisited.continueLoop:
-					continueLoop = True
+				if self.returnValue:
+					return makeNull(node.position, context), None
+
+				if self.breakLoop or self.continueLoop:
 					break
 
-			if breakLoop:
+			self.continueLoop = False
+
+			if self.breakLoop:
+				self.breakLoop = False
 				break
 
 			condition, error = self.visit(node.condition, context)
 			if error:
 				return None, error
 
-			conditionBoolean, error = condition.toBoolean(node.condition.position.copy())
+			conditionBoolean, error = condition.toBoolean(node.condition.position)
 			if error:
 				return None, error
 
-		return Null(node.position.copy(), context), None
+		return makeNull(node.position, context), None
 
-	def visit_ForNode(self, node: ForNode, context: Context, insideLoop: bool) -> tuple[Number,  RTError]:
-		iteratorVisited, error = self.visit(node.iterator, context)
+	# The same loop as visit_WhileNode, with the blocks of the body yielded
+
+	def whileBlock(self, node: WhileNode, context: Context) -> Nested[tuple[Null, RTError]]:
+		dispatchTable = self.dispatchTable
+
+		condition, error = self.visit(node.condition, context)
+		if error:
+			return None, error
+
+		conditionBoolean, error = condition.toBoolean(node.condition.position)
 		if error:
 			return None, error
 
-		if not isinstance(iteratorVisited, List):
-			return None, InvalidIteratorError(node.iterator.position.copy(), context)
+		while conditionBoolean.value:
+			for statement in node.body:
+				statementType = type(statement)
+				visit = dispatchTable.get(statementType)
 
-		if node.item.value in context.variableTable.variables.keys():
-			variableAssigned, error = context.variableTable.assignVariable(node.item.value, Null(node.item.position.copy(), context), node.item.position.copy())
+				if statementType in BLOCK_NODES:
+					statementVisited, error = yield visit(self, statement, context, True, True)
+				elif visit:
+					statementVisited, error = visit(self, statement, context, True)
+				else:
+					statementVisited, error = self.visit(statement, context, True)
+
+				if error:
+					return None, error
+
+				if self.returnValue:
+					return makeNull(node.position, context), None
+
+				if self.breakLoop or self.continueLoop:
+					break
+
+			self.continueLoop = False
+
+			if self.breakLoop:
+				self.breakLoop = False
+				break
+
+			condition, error = self.visit(node.condition, context)
 			if error:
 				return None, error
-		else:
-			variableDeclared, error = context.variableTable.declareVariable(node.item.value, Null(node.item.position.copy(), context), False, node.item.position.copy())
+
+			conditionBoolean, error = condition.toBoolean(node.condition.position)
 			if error:
 				return None, error
 
-		for item in iteratorVisited.value:
-			variableAssigned, error = context.variableTable.assignVariable(node.item.value, item, node.item.position.copy())
+		return makeNull(node.position, context), None
+
+	def visit_ForNode(self, node: ForNode, context: Context, insideLoop: bool, nested: bool = False) -> tuple[Null, RTError] | Nested[tuple[Null, RTError]]:
+		if self.nestsBlocks(node):
+			loop = self.forBlock(node, context)
+			return loop if nested else runNested(loop)
+
+		dispatchTable = self.dispatchTable
+
+		items, error = self.loopItems(node, context)
+		if error:
+			return None, error
 
-			breakLoop = False
-			continueLoop = False
+		for item in items:
+			if isinstance(item, RTError):
+				return None, item
+
+			variableAssigned, error = context.variableTable.assignVariableAt(node.item.value, 0, node.slot, item, node.item.position)
 
 			for statement in node.body:
-				if isinstance(statement, ContinueNode):
-					continue
-				elif isinstance(statement, BreakNode):
-					break
+				visit = dispatchTable.get(type(statement))
+				if visit:
+					statementVisited, error = visit(self, statement, context, True)
+				else:
+					statementVisited, error = self.visit(statement, context, True)
 
-				statementVisited, error = self.visit(statement, context, True)
-				if error: 
+				if error:
 					return None, error
 
-				if statementVisited.breakLoop:
-					breakLoop = True
+				if self.returnValue:
+					return makeNull(node.position, context), None
+
+				if self.breakLoop or self.continueLoop:
 					break
-				elif statementVisited.continueLoop:
-					continueLoop = True
+
+			self.continueLoop = False
+
+			if self.breakLoop:
+				self.breakLoop = False
+				break
+
+		return makeNull(node.position, context), None
+
+	# The same loop as visit_ForNode, with the blocks of the body yielded
+
+	def forBlock(self, node: ForNode, context: Context) -> Nested[tuple[Null, RTError]]:
+		dispatchTable = self.dispatchTable
+
+		items, error = self.loopItems(node, context)
+		if error:
+			return None, error
+
+		for item in items:
+			if isinstance(item, RTError):
+				return None, item
+
+			variableAssigned, error = context.variableTable.assignVariableAt(node.item.value, 0, node.slot, item, node.item.position)
+
+			for statement in node.body:
+				statementType = type(statement)
+				visit = dispatchTable.get(statementType)
+
+				if statementType in BLOCK_NODES:
+					statementVisited, error = yield visit(self, statement, context, True, True)
+				elif visit:
+					statementVisited, error = visit(self, statement, context, True)
+				else:
+					statementVisited, error = self.visit(statement, context, True)
+
+				if error:
+					return None, error
+
+				if self.returnValue:
+					return makeNull(node.position, context), None
+
+				if self.breakLoop or self.continueLoop:
 					break
 
-			if breakLoop:
+			self.continueLoop = False
+
+			if self.breakLoop:
+				self.breakLoop = False
 				break
 
-		return Null(node.position.copy(), context), None
+		return makeNull(node.position, context), None
 
+	# Visits the iterator of a FOR loop and declares its variable
+
+	def loopItems(self, node: ForNode, context: Context) -> tuple[abc.Iterator, RTError]:
+		iteratorVisited, error = self.visit(node.iterator, context)
+		if error:
+			return None, error
 
-	def visit_FunctionCallNode(self, node: FunctionCallNode, context: Context, insideLoop: bool) -> tuple[Number,  RTError]:
-		func, error = self.visit(node.func, context)
+		items, error = iteratorVisited.iterate(node.iterator.position, context)
 		if error:
 			return None, error
 
-		argumentsVisited = []
-		for argument in node.arguments:
-			argumentVisited, error = self.visit(argument, context)
+		if context.variableTable.isDeclared(node.item.value):
+			variableAssigned, error = context.variableTable.assignVariable(node.item.value, makeNull(node.item.position, context), node.item.position)
+			if error:
+				return None, error
+		else:
+			variableDeclared, error = context.variableTable.declareVariable(node.item.value, makeNull(node.item.position, context), False, node.item.position)
 			if error:
 				return None, error
 
-			argumentsVisited.append(argumentVisited)
+		return items, None
 
+	def callFunction(self, func: RuntimeValue, argumentsVisited: list[RuntimeValue], position: StartEndPosition, context: Context) -> tuple[RuntimeValue, RTError]:
 		returnValue = None
 		
 		if isinstance(func, Function):
-			if len(func.arguments) != len(node.arguments):
-				return None, ArgumentError(len(func.arguments), len(node.arguments), func.name, node.position.copy(), context)
+			if len(func.arguments) != len(argumentsVisited):
+				return None, ArgumentError(len(func.arguments), len(argumentsVisited), func.name, position, context)
 
 			executeContext = Context(f"<FUNCTION {func.name}>", func.context)
-			executeContext.setVariableTable(VariableTable())
-
-			interpreter = Interpreter(func.body, True)
-			interpreter.addDefaultVariables(executeContext)
+			executeContext.setVariableTable(VariableTable(func.layout))
 
 			for argumentName, argument in zip(func.arguments, argumentsVisited):
-				executeContext.variableTable.declareVariable(argumentName, argument, False, argument.position)
+				executeContext.variableTable.declareVariable(argumentName, argument, False, position)
+
+			# Every engine calls functions recursively, the innermost call reports
+			# running out of stack as an error of the program
+			try:
+				returnValue, error = self.runFunction(func, executeContext)
+			except RecursionError:
+				return None, RecursionError_(position, context)
 
-			_, error = interpreter.interpret(executeContext)
 			if error:
 				return None, error
 
-			returnValue = interpreter.returnValue
-
 			if not returnValue:
-				returnValue = Null(node.position.copy(), context)
-
-			returnValue.position = node.position.copy()
+				returnValue = makeNull(position, context)
 
 			return returnValue, None
 
 		elif isinstance(func, BuiltInFunction):
-			returnValue, error = func.execute(argumentsVisited, node.position.copy())
+			returnValue, error = func.execute(argumentsVisited, position, context)
 			if error:
 				return None, error
 
 		elif isinstance(func, PythonFunction):
-			returnValue, error = func.execute(argumentsVisited, node.position.copy())
+			returnValue, error = func.execute(argumentsVisited, position)
 			if error:
 				return None, error
 			
-			returnValueConverted, error = self.convertValue(returnValue, func.position.copy(), context, func.path)
+			returnValueConverted, error = self.convertValue(returnValue, func.position, context, func.path)
 			if error:
 				return None, error
 
 			return returnValueConverted, None
 
 		else:
-			returnValue, error = func.execute(argumentsVisited, node.position.copy())
+			returnValue, error = func.execute(argumentsVisited, position)
 			if error:
 				return None, error
 			return returnValue, None
 
 		return returnValue, None
 
-	def visit_ListNode(self, node: ListNode, context: Context, insideLoop: bool) -> tuple[Number,  RTError]:
-		expressions = []
+	# Function bodies run on the calling interpreter, only the return state has
+	# to be swapped out while the body runs. It is put back even when the body
+	# runs out of stack, callFunction reports that as an error of the program and
+	# the interpreter keeps running
 
-		for expression in node.expressions:
-			expressionVisited, error = self.visit(expression, context)
-			if error:
-				return None, error
-
-			expressions.append(expressionVisited)
-
-		return List(expressions, node.position.copy(), context), None
-		
-	def visit_GetItemNode(self, node: GetItemNode, context: Context, insideLoop: bool) -> tuple[RuntimeValue,  RTError]:
-		variable, error = self.visit(node.variable, context)
-		if error:
-			return None, error
-
-		item, error = self.visit(node.item, context)
+	def runFunction(self, func: Function, executeContext: Context) -> tuple[RuntimeValue, RTError]:
+		returnValue = self.returnValue
+		isAFunction = self.isAFunction
 
-		value, error = variable.getItem(item, node.position.copy())
-		if error:
-			return None, error
-
-		return value, None
-
-	def visit_GetAttributeNode(self, node: GetAttributeNode, context: Context, insideLoop: bool) -> tuple[RuntimeValue,  RTError]:
-		variable, error = self.visit(node.variable, context)
-		if error:
-			return None, error
-
-		item, error = self.visit(node.item, context)
-
-		value, error = variable.getAttribute(item, node.position.copy())
-		if error:
-			return None, error
-
-		return value, None
-
-	def visit_SetItemNode(self, node: SetItemNode, context: Context, insideLoop: bool) -> tuple[None,  RTError]:
-		variable, error = self.visit(node.variable, context)
-		if error:
-			return None, error
-
-		item, error = self.visit(node.item, context)
+		self.returnValue = None
+		self.isAFunction = True
 
-		value, error = self.visit(node.value, context)
+		try:
+			for statement in func.body:
+				_, error = self.visit(statement, executeContext)
+				if error:
+					return None, self.setErrorContext(error, executeContext)
 
-		_, error = variable.setItem(item, value, node.position.copy())
-		if error:
-			return None, error
+				if self.returnValue:
+					break
 
-		return Null(node.position.copy(), context), None
+			return self.returnValue, None
+		finally:
+			self.returnValue = returnValue
+			self.isAFunction = isAFunction
 
 	def visit_FunctionDefineNode(self, node: FunctionDefineNode, context: Context, insideLoop: bool) -> tuple[Function,  RTError]:
-		func = Function(node.variable, node.arguments, node.body, node.position, node.anonymous, context)
+		func = Function(node.variable, node.arguments, node.body, node.position, node.anonymous, context, node.layout, self)
 
 		if not node.anonymous:
-			value, error = context.variableTable.declareVariable(node.variable, func, True, node.position.copy())
+			value, error = context.variableTable.declareVariable(node.variable, func, True, node.position)
 			if error:
 				return None, error
-			return Null(node.position.copy(), context), None
+			return makeNull(node.position, context), None
 
 		return func, None
 
 	def visit_ReturnNode(self, node: ReturnNode, context: Context, insideLoop: bool) -> tuple[RuntimeValue,  RTError]:
 		if not self.isAFunction:
-			return None, ReturnOutsideFunctionError(node.position.copy(), context)
+			return None, ReturnOutsideFunctionError(node.position, context)
 
 		if node.value:
 			value, error = self.visit(node.value, context)
@@ -591,68 +820,80 @@ class Interpreter:
 			self.returnValue = value
 			return value, None
 
-		self.returnValue = Null(node.position.copy(), context)
+		self.returnValue = makeNull(node.position, context)
 		return self.returnValue, None
 
-	def visit_IfContainerNode(self, node: IfContainerNode, context: Context, insideLoop: bool) -> tuple[Null,  RTError]:
-		ifCondition, error = self.visit(node.ifNode.condition, context)
-		if error:
-			return None, error
+	# Most IF bodies hold no blocks and are visited right away. From the first
+	# block holding blocks on the rest of the body runs as a generator, which is
+	# returned as it is when the IF is nested in another block
 
-		ifConditionAsBoolean, error = ifCondition.toBoolean(node.ifNode.condition.position.copy())
-		if error:
-			return None, error
+	def visit_IfContainerNode(self, node: IfContainerNode, context: Context, insideLoop: bool, nested: bool = False) -> tuple[Null, RTError] | Nested[tuple[Null, RTError]]:
+		for ifNode in (node.ifNode, *node.elseIfNodes):
+			condition, error = self.visit(ifNode.condition, context)
+			if error:
+				return None, error
 
-		if ifConditionAsBoolean.value:
-			for statement in node.ifNode.body:
-				statementVisited, error = self.visit(statement, context, insideLoop)
-				if error:
-					return None, error
+			conditionAsBoolean, error = condition.toBoolean(ifNode.condition.position)
+			if error:
+				return None, error
+
+			if conditionAsBoolean.value:
+				body = ifNode.body
+				break
+		else:
+			if not node.elseNode:
+				return makeNull(node.position, context), None
 
-				if statementVisited.breakLoop:
-					return Null(node.ifNode.position.copy(), context).setBreak(), None
-				elif statementVisited.continueLoop:
-					return Null(node.ifNode.position.copy(), context).setContinue(), None
+			body = node.elseNode.body
 
-			return Null(node.ifNode.position.copy(), context), None
+		dispatchTable = self.dispatchTable
 
-		for elseIfNode in node.elseIfNodes:
-			elseIfCondition, error = self.visit(elseIfNode.condition, context)
-			if error:
-				return None, error
+		for index, statement in enumerate(body):
+			statementType = type(statement)
+			if statementType in BLOCK_NODES and self.holdsBlocks(statement):
+				rest = self.bodyBlock(node, body, index, context, insideLoop)
+				return rest if nested else runNested(rest)
+
+			visit = dispatchTable.get(statementType)
+			if visit:
+				statementVisited, error = visit(self, statement, context, insideLoop)
+			else:
+				statementVisited, error = self.visit(statement, context, insideLoop)
 
-			elseIfConditionAsBoolean, error = elseIfCondition.toBoolean(elseIfNode.condition.position.copy())
 			if error:
 				return None, error
 
-			if not elseIfConditionAsBoolean.value:
-				continue
-			
-			for statement in elseIfNode.body:
-				statementVisited, error = self.visit(statement, context, insideLoop)
-				if error:
-					return None, error 
+			if self.returnValue or self.breakLoop or self.continueLoop:
+				break
+
+		return makeNull(node.position, context), None
+
+	# Runs the statements of an IF body from start on, RETURN, BREAK and CONTINUE
+	# stop it and are handled by the function or loop around it
 
-				if statementVisited.breakLoop:
-					return Null(node.ifNode.position.copy(), context).setBreak(), None
-				elif statementVisited.continueLoop:
-					return Null(node.ifNode.position.copy(), context).setContinue(), None
+	def bodyBlock(self, node: IfContainerNode, statements: list[StatementNode], start: int, context: Context, insideLoop: bool) -> Nested[tuple[Null, RTError]]:
+		dispatchTable = self.dispatchTable
 
-			return Null(elseIfNode.position.copy(), context), None
+		for index in range(start, len(statements)):
+			statement = statements[index]
 
-		if node.elseNode:
-			for statement in node.elseNode.body:
+			statementType = type(statement)
+			visit = dispatchTable.get(statementType)
+
+			if statementType in BLOCK_NODES:
+				statementVisited, error = yield visit(self, statement, context, insideLoop, True)
+			elif visit:
+				statementVisited, error = visit(self, statement, context, insideLoop)
+			else:
 				statementVisited, error = self.visit(statement, context, insideLoop)
-				if error:
-					return None, error
-				
-				if statementVisited.breakLoop:
-					return Null(node.ifNode.position.copy(), context).setBreak(), None
-				elif statementVisited.continueLoop:
-					return Null(node.ifNode.position.copy(), context).setContinue(), None
 
-			return Null(node.elseNode.position.copy(), context), None
-		return Null(node.position.copy(), context), None
+			if error:
+				return None, error
+
+			if self.returnValue or self.breakLoop or self.continueLoop:
+				break
+
+		return makeNull(node.position, context), None
 
 	def visit_ImportNode(self, node: ImportNode, context: Context, insideLoop: bool) -> tuple[Null,  RTError]:
 		moduleName, error = self.visit(node.moduleName, context)
@@ -660,69 +901,45 @@ class Interpreter:
 			return None, error
 
 		if not isinstance(moduleName, String):
-			return None, ValueError_(["string"], moduleName.__class__.__name__, moduleName.position.copy(), context)
+			return None, ValueError_(["string"], moduleName.__class__.__name__, node.moduleName.position, context)
 
-		imported, error = self.importModule(moduleName.value, context, node.position.copy(), node.asName)
+		imported, error = self.importModule(moduleName.value, context, node.position, node.asName)
 		if error:
 			return None, error
 
-		return Null(node.position.copy(), context), None
+		return makeNull(node.position, context), None
 		
-	def visit_DictionaryNode(self, node: DictionaryNode, context: Context, insideLoop: bool) -> tuple[Null,  RTError]:
-		valuesVisited = {}
-
-		for key, value in node.expressions.items():
-			keyVisited, error = self.visit(key, context)
-			if error:
-				return None, error
-
-			valueVisited, error = self.visit(value, context)
-			if error:
-				return None, error
-
-			valuesVisited[keyVisited] = valueVisited
-
-		return Dictionary(valuesVisited, node.position.copy(), context), None
-
 	def visit_BreakNode(self, node: DictionaryNode, context: Context, insideLoop: bool) -> tuple[Null,  RTError]:
 		if not insideLoop:
-			return None, BreakOutsideLoopError(node.position.copy(), context)
+			return None, BreakOutsideLoopError(node.position, context)
 
-		newNode = Null(node.position.copy(), context)
-		newNode.breakLoop = True
-		return newNode, None
+		self.breakLoop = True
+		return makeNull(node.position, context), None
 
 	def visit_ContinueNode(self, node: DictionaryNode, context: Context, insideLoop: bool) -> tuple[Null,  RTError]:
 		if not insideLoop:
-			return None, ContinueOutsideLoopError(node.position.copy(), context)
+			return None, ContinueOutsideLoopError(node.position, context)
 
-		newNode = Null(node.position.copy(), context)
-		newNode.continueLoop = True
-		return newNode, None
+		self.continueLoop = True
+		return makeNull(node.position, context), None
 			
-	def visit_RangeNode(self, node: RangeNode, context: Context, insideLoop: bool) -> tuple[List,  RTError]:
-		startValue, error = self.visit(node.start, context)
-		if error:
-			return None, error
-
-		stopValue, error = self.visit(node.end, context)
-		if error:
-			return None, error
-
-		stepValue, error = self.visit(node.step, context)
-		if error:
-			return None, error
-		
+	def makeRange(self, node: RangeNode, startValue: RuntimeValue, stopValue: RuntimeValue, stepValue: RuntimeValue, context: Context) -> tuple[List,  RTError]:
 		if not isinstance(startValue, Number) or "." in str(startValue.value):
-			return None, ValueError_(["number(integer)"], startValue.__class__.__name__, startValue.position.copy(), context)
+			return None, ValueError_(["number(integer)"], startValue.__class__.__name__, node.start.position, context)
 		elif not isinstance(stopValue, Number) or "." in str(stopValue.value):
-			return None, ValueError_(["number(integer)"], stopValue.__class__.__name__, stopValue.position.copy(), context)
+			return None, ValueError_(["number(integer)"], stopValue.__class__.__name__, node.end.position, context)
 		elif not isinstance(stepValue, Number) or "." in str(stepValue.value):
-			return None, ValueError_(["number(integer)"], stepValue.__class__.__name__, stepValue.position.copy(), context)
+			return None, ValueError_(["number(integer)"], stepValue.__class__.__name__, node.step.position, context)
+		elif stepValue.value == 0:
+			return None, RTError("Unable to make a range with a step of 0", node.step.position, context, "ValueError")
 
-		rangeAsRange = range(startValue.value, stopValue.value, stepValue.value)
-		
-		def toNumber(n: int):
-			return Number(n, node.position.copy(), context)
+		return Range(range(startValue.value, stopValue.value, stepValue.value), node.position, context), None
+
+########################################
+#	DISPATCH TABLE
+########################################
+
+# Subclasses build their table when they are defined, the interpreter itself
+# once all of its visit functions exist
 
-		return List(list(map(toNumber, rangeAsRange)), node.position.copy(), context), None
\ No newline at end of file
+Interpreter.buildDispatchTable()
@@ -1,19 +1,33 @@
-KEYWORDS = [
-	"NOT",
-	"LET",
-	"CONST",
-	"WHILE",
-	"THEN",
-	"END",
-	"FUNCTION",
-	"RETURN",
-	"IF",
-	"ELSEIF",
-	"ELSE",
-	"IMPORT",
-	"CONTINUE",
-	"BREAK",
-	"AS",
-	"FOR",
-	"IN"
-]
\ No newline at end of file
+########################################
+#	IMPORTS
+########################################
+
+from enum import Enum, auto
+
+########################################
+#	KEYWORDS
+########################################
+
+# Keyword tokens carry one of these, the parser compares them by identity
+# instead of comparing strings
+
+class Keywords(Enum):
+	NOT =		auto()
+	LET =		auto()
+	CONST =		auto()
+	WHILE =		auto()
+	THEN =		auto()
+	END =		auto()
+	FUNCTION =	auto()
+	RETURN =	auto()
+	IF =		auto()
+	ELSEIF =	auto()
+	ELSE =		auto()
+	IMPORT =	auto()
+	CONTINUE =	auto()
+	BREAK =		auto()
+	AS =		auto()
+	FOR =		auto()
+	IN =		auto()
+
+KEYWORDS: dict[str, Keywords] = {keyword.name: keyword for keyword in Keywords}
@@ -0,0 +1,189 @@
+########################################
+#	IMPORTS
+########################################
+
+from __future__ import annotations
+import os
+import sys
+from .runtimevaluesclass import RuntimeValue, Dictionary
+
+########################################
+#	MODULE
+########################################
+
+# What running a module exports, the variables IMPORT name AS * declares and
+# the dictionary IMPORT name binds. Python modules remember their name in
+# sys.modules so invalidating them imports the file again as well
+
+class Module:
+	def __init__(self, path: str, namespace: Dictionary, variables: list[tuple[str, RuntimeValue, bool]], pythonModuleName: str | None = None) -> None:
+		self.path = path
+		self.namespace = namespace
+		self.variables = variables
+		self.pythonModuleName = pythonModuleName
+		self.modifiedTime = modifiedTime(path)
+
+	def __repr__(self) -> str:
+		return f"MODULE({self.path})"
+
+def modifiedTime(path: str) -> float | None:
+	try:
+		return os.stat(path).st_mtime
+	except OSError:
+		return None
+
+########################################
+#	MODULE REGISTRY
+########################################
+
+# Every module runs once per process, later imports of the same file bind the
+# stored namespace. Modules are keyed by their absolute path so different
+# relative paths to one file share an entry. Invalidating a module makes the
+# next import run it again, invalidateChanged does that for every module whose
+# file changed since it was imported
+
+class ModuleRegistry:
+	def __init__(self) -> None:
+		self.modules: dict[str, Module] = {}
+
+	def key(self, path: str) -> str:
+		return os.path.abspath(path)
+
+	def get(self, path: str) -> Module | None:
+		return self.modules.get(self.key(path))
+
+	def add(self, module: Module) -> None:
+		self.modules[self.key(module.path)] = module
+
+	def invalidate(self, path: str) -> bool:
+		module = self.modules.pop(self.key(path), None)
+		if not module:
+			return False
+
+		if module.pythonModuleName:
+			sys.modules.pop(module.pythonModuleName, None)
+
+		return True
+
+	def invalidateChanged(self) -> list[str]:
+		changed = [module.path for module in self.modules.values() if modifiedTime(module.path) != module.modifiedTime]
+
+		for path in changed:
+			self.invalidate(path)
+
+		return changed
+
+	def clear(self) -> None:
+		for module in list(self.modules.values()):
+			self.invalidate(module.path)
+
+modules = ModuleRegistry()
+
+########################################
+#	DIRECTORY INDEX
+########################################
+
+# Every directory is listed once per process and found files are looked up in
+# memory after that instead of asking the file system again. A name missing
+# from the listing is still checked on the file system, it can be a file added
+# after the directory was listed or differ only in case on a case insensitive
+# file system. A file found that way lists its directory again. clear forgets
+# every listing
+
+class DirectoryIndex:
+	def __init__(self) -> None:
+		self.directories: dict[str, frozenset[str]] = {}
+
+	def files(self, directory: str) -> frozenset[str]:
+		directory = os.path.normpath(directory or ".")
+
+		files = self.directories.get(directory)
+		if files is None:
+			try:
+				files = frozenset(os.listdir(directory))
+			except OSError:
+				files = frozenset()
+
+			self.directories[directory] = files
+
+		return files
+
+	def contains(self, path: str) -> bool:
+		directory, filename = os.path.split(path)
+		if filename in self.files(directory):
+			return True
+
+		if not os.path.exists(path):
+			return False
+
+		self.directories.pop(os.path.normpath(directory or "."), None)
+		return True
+
+	def clear(self) -> None:
+		self.directories = {}
+
+directoryIndex = DirectoryIndex()
+
+########################################
+#	SEARCH PATH
+########################################
+
+# Module names are looked up in a list of roots, every .vlb root is searched
+# before any .py root. Python modules are imported by their path relative to
+# the working directory so only the modules folders allow them. Extra .vlb
+# roots can be added with the VLBASIC_PATH environment variable
+
+MODULES_DIRECTORY = "vlbasic/modules/"
+EXTENSIONS = (".vlb", ".py")
+
+class ModuleSearchPath:
+	def __init__(self, roots: list[tuple[str, tuple[str, ...]]]) -> None:
+		self.roots = roots
+
+	# The modules folder next to the importing file and in the working
+	# directory, then the folder of the importing file and the working directory
+	@classmethod
+	def forFile(cls, filepath: str) -> ModuleSearchPath:
+		directory = os.path.dirname(filepath)
+
+		return cls([
+			(os.path.join(directory, MODULES_DIRECTORY), EXTENSIONS),
+			(MODULES_DIRECTORY, EXTENSIONS),
+			(directory, (".vlb",)),
+			("", (".vlb",))
+		] + extraRoots())
+
+	# The modules installed in the working directory, what vlb.py modules list shows
+	@classmethod
+	def installed(cls) -> ModuleSearchPath:
+		return cls([(MODULES_DIRECTORY, EXTENSIONS)] + extraRoots())
+
+	def find(self, moduleName: str) -> str | None:
+		for extension in EXTENSIONS:
+			for root, extensions in self.roots:
+				if extension not in extensions:
+					continue
+
+				path = os.path.join(root, moduleName + extension)
+				if directoryIndex.contains(path):
+					return path
+
+		return None
+
+	def listModules(self) -> list[tuple[str, str]]:
+		found = []
+
+		for extension in EXTENSIONS:
+			for root, extensions in self.roots:
+				if extension not in extensions:
+					continue
+
+				for filename in sorted(directoryIndex.files(root)):
+					name, fileExtension = os.path.splitext(filename)
+					if fileExtension == extension and (name, extension) not in found:
+						found.append((name, extension))
+
+		return found
+
+def extraRoots() -> list[tuple[str, tuple[str, ...]]]:
+	return [(root, (".vlb",)) for root in os.environ.get("VLBASIC_PATH", "").split(os.pathsep) if root]
@@ -2,54 +2,141 @@
 #	IMPORTS
 ########################################
 
+from typing import Iterable
 from .tokenclass import Token, TokenTypes
 from .error import Error, InvalidSyntaxError
 from .statementclass import StatementNode, ExpressionNode, BinaryOperationNode, UnaryOperationNode, NumberNode, VariableAccessNode, VariableDeclareNode, VariableAssignNode, WhileNode, FunctionCallNode, StringNode, ListNode, GetItemNode, FunctionDefineNode, ReturnNode, IfNode, IfContainerNode, SetItemNode, ImportNode, DictionaryNode, ContinueNode, BreakNode, ForNode, RangeNode, GetAttributeNode
+from .keywords import Keywords
+from .resolver import Resolver
+from .utils import Nested, runNested
+
+########################################
+#	BINDING POWERS
+########################################
+
+# How tight every binary operator binds, + and - bind looser than the
+# comparisons. NOT takes a comparison as its operand and unary + and - only
+# take a single factor
+
+ARITHMETIC_POWER = 10
+COMPARISON_POWER = 20
+TERM_POWER = 30
+EXPONENT_POWER = 40
+UNARY_POWER = 50
+
+BINDING_POWERS: dict[TokenTypes, int] = {
+	TokenTypes.PLUS: ARITHMETIC_POWER,
+	TokenTypes.MINUS: ARITHMETIC_POWER,
+	TokenTypes.DOUBLE_EQUALS: COMPARISON_POWER,
+	TokenTypes.NOT_EQUALS: COMPARISON_POWER,
+	TokenTypes.GRATER_THAN: COMPARISON_POWER,
+	TokenTypes.LESS_THAN: COMPARISON_POWER,
+	TokenTypes.GREATER_EQUALS: COMPARISON_POWER,
+	TokenTypes.LESS_EQUALS: COMPARISON_POWER,
+	TokenTypes.MULTIPLY: TERM_POWER,
+	TokenTypes.DIVIDE: TERM_POWER,
+	TokenTypes.MODULUS: TERM_POWER,
+	TokenTypes.POWER: EXPONENT_POWER
+}
+
+# Markers for the pending operations of Parser.operation that wait for the
+# operand of a prefix operator or for the inside of parentheses
+
+UNARY = object()
+GROUP = object()
+
+# Numbers, strings and names are made directly by Parser.operation, only atoms
+# that contain other code are parsed by the atom generator
+
+LEAF_NODES = {
+	TokenTypes.INTEGER: NumberNode,
+	TokenTypes.FLOAT: NumberNode,
+	TokenTypes.STRING: StringNode,
+	TokenTypes.IDENTIFIER: VariableAccessNode
+}
+
+POSTFIX_TOKENS = (TokenTypes.LEFT_PARENTHESES, TokenTypes.LEFT_SQUARE, TokenTypes.DOT)
+ASSIGN_TOKENS = (TokenTypes.EQUALS, TokenTypes.PLUS_EQUALS, TokenTypes.MINUS_EQUALS, TokenTypes.MULTIPLY_EQUALS, TokenTypes.DIVIDE_EQUALS)
+STATEMENT_KEYWORDS = (Keywords.LET, Keywords.CONST, Keywords.RETURN, Keywords.CONTINUE, Keywords.BREAK, Keywords.IMPORT)
 
 ########################################
 #	PARSER
 ########################################
 
 class Parser:
-	def __init__(self, filename: str, tokens: list[Token]) -> None:
-		self.tokens = tokens
-		self.index = -1
+	# tokens can be a list or a stream from Tokenizer.generateTokens, only the
+	# current and the next token are kept so a streamed file never has to be
+	# fully tokenized in memory
+
+	def __init__(self, filename: str, tokens: Iterable[Token | Error]) -> None:
+		self.tokens = iter(tokens)
 		self.currentToken = None
+		self.nextToken = None
+		self.tokenizeError: Error | None = None
 		self.filename = filename
 
+		self.nextToken = self.readToken()
 		self.advance()
 
+	# An error from the tokenizer ends the stream, the parser sees it as EOF and
+	# parse reports the tokenizer error instead of its own result
+
+	def readToken(self) -> Token | None:
+		token = next(self.tokens, None)
+
+		if isinstance(token, Error):
+			self.tokenizeError = token
+			return Token(TokenTypes.EOF, token.position)
+
+		return token
+
 	def advance(self) -> None:
-		self.index += 1
-		if self.index >= len(self.tokens):
-			self.currentToken = None
-			return
-		
-		self.currentToken = self.tokens[self.index]
+		self.currentToken = self.nextToken
+		self.nextToken = self.readToken() if self.currentToken else None
 
 	def getNextToken(self) -> Token:
-		if self.index + 1 >= len(self.tokens):
-			return None
-		return self.tokens[self.index + 1]
+		return self.nextToken
+
+	# Every production that contains other statements or expressions, like
+	# blocks, calls, lists and parentheses, is a generator run by runNested, so
+	# code can be nested arbitrarily deep without hitting the recursion limit
 
 	def parse(self) -> tuple[list[ExpressionNode], Error]:
+		return runNested(self.parseModule())
+
+	def parseModule(self) -> Nested[tuple[list[ExpressionNode], Error]]:
 		statements: list[StatementNode] = []
 
 		while self.currentToken.type != TokenTypes.EOF:
-			statement, error = self.statement()
+			statement, error = yield self.expression()
 			if error:
-				return None, error
+				return None, self.findTokenizeError() or error
 
 			if statement:
 				statements.append(statement)
 
+		if self.tokenizeError:
+			return None, self.tokenizeError
+
+		Resolver().resolveModule(statements)
+
 		return statements, None
 
-	def parseEnd(self) -> tuple[list[ExpressionNode], Error]:
+	# A tokenized list is checked for errors before parsing starts, a stream can
+	# still hold one after a syntax error. The rest of the stream is scanned so the
+	# same error is reported either way
+
+	def findTokenizeError(self) -> Error | None:
+		while not self.tokenizeError and self.readToken():
+			pass
+
+		return self.tokenizeError
+
+	def parseEnd(self) -> Nested[tuple[list[ExpressionNode], Error]]:
 		statements: list[StatementNode] = []
 
-		while self.currentToken.type != TokenTypes.EOF and not self.currentToken.isKeyword("END"):
-			statement, error = self.statement()
+		while self.currentToken.type != TokenTypes.EOF and not self.currentToken.isKeyword(Keywords.END):
+			statement, error = yield self.expression()
 			if error:
 				return None, error
 
@@ -57,15 +144,15 @@ class Parser:
 				statements.append(statement)
 
 		if self.currentToken.type == TokenTypes.EOF:
-			return None, InvalidSyntaxError(f"Expected keyword END, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+			return None, InvalidSyntaxError(f"Expected keyword END, not {str(self.currentToken.type)}", self.currentToken.position)
 		
 		return statements, None
 
-	def parseIf(self) -> tuple[list[ExpressionNode], Error]:
+	def parseIf(self) -> Nested[tuple[list[ExpressionNode], Error]]:
 		statements: list[StatementNode] = []
 
-		while self.currentToken.type != TokenTypes.EOF and not self.currentToken.isOneOfKeywords(["END", "ELSE", "ELSEIF"]):
-			statement, error = self.statement()
+		while self.currentToken.type != TokenTypes.EOF and not self.currentToken.isOneOfKeywords((Keywords.END, Keywords.ELSE, Keywords.ELSEIF)):
+			statement, error = yield self.expression()
 			if error:
 				return None, error
 
@@ -73,45 +160,42 @@ class Parser:
 				statements.append(statement)
 
 		if self.currentToken.type == TokenTypes.EOF:
-			return None, InvalidSyntaxError(f"Expected keyword END, ELSE or ELSEIF, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+			return None, InvalidSyntaxError(f"Expected keyword END, ELSE or ELSEIF, not {str(self.currentToken.type)}", self.currentToken.position)
 		
 		return statements, None
 
-	def statement(self) -> tuple[ExpressionNode, Error]:
-		expression, error = self.expression()
+	# Parses the statement at the current token on its own
 
-		if error:
-			return None, error
-
-		return expression, None
+	def statement(self) -> tuple[ExpressionNode, Error]:
+		return runNested(self.expression())
 
-	def expression(self) -> tuple[ExpressionNode, Error]:
-		if self.currentToken.isOneOfKeywords(["LET", "CONST"]):
+	def expression(self) -> Nested[tuple[ExpressionNode, Error]]:
+		if self.currentToken.isOneOfKeywords((Keywords.LET, Keywords.CONST)):
 			declareToken = self.currentToken
 
 			self.advance()
 
 			if self.currentToken.type != TokenTypes.IDENTIFIER:
-				return None, InvalidSyntaxError(f"Expected identifier, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+				return None, InvalidSyntaxError(f"Expected identifier, not {str(self.currentToken.type)}", self.currentToken.position)
 
 			varName = self.currentToken
 			self.advance()
 
 			if self.currentToken.type != TokenTypes.EQUALS:
-				return None, InvalidSyntaxError(f"Expected =, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+				return None, InvalidSyntaxError(f"Expected =, not {str(self.currentToken.type)}", self.currentToken.position)
 
 			self.advance()
 
 			if self.currentToken.type in [TokenTypes.EOF, TokenTypes.NEW_LINE]:
-				return None, InvalidSyntaxError(f"Expected expression, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+				return None, InvalidSyntaxError(f"Expected expression, not {str(self.currentToken.type)}", self.currentToken.position)
 
-			expression, error = self.expression()
+			expression, error = yield self.expression()
 			if error:
 				return None, error
 
 			return VariableDeclareNode(varName, expression, declareToken), None
 		
-		elif self.currentToken.type == TokenTypes.IDENTIFIER and self.getNextToken().type in [TokenTypes.EQUALS, TokenTypes.PLUS_EQUALS, TokenTypes.MINUS_EQUALS, TokenTypes.MULTIPLY_EQUALS, TokenTypes.DIVIDE_EQUALS]:
+		elif self.currentToken.type == TokenTypes.IDENTIFIER and self.getNextToken().type in ASSIGN_TOKENS:
 			varName = self.currentToken
 
 			self.advance()
@@ -128,57 +212,57 @@ class Parser:
 
 			self.advance()
 
-			expression, error = self.expression()
+			expression, error = yield self.expression()
 			if error:
 				return None, error
 
 			return VariableAssignNode(varName, expression, assignType), None
 
-		elif self.currentToken.isKeyword("RETURN"):
+		elif self.currentToken.isKeyword(Keywords.RETURN):
 			returnToken = self.currentToken
 
 			self.advance()
 
 			if self.currentToken.type in [TokenTypes.EOF, TokenTypes.NEW_LINE]:
-				return ReturnNode(returnToken.position.copy(), None), None
+				return ReturnNode(returnToken.position, None), None
 
-			value, error = self.binaryOperation(self.compExpression, (TokenTypes.PLUS, TokenTypes.MINUS))
+			value, error = yield self.operation(ARITHMETIC_POWER)
 			if error:
 				return None, error
 
-			return ReturnNode(returnToken.position.start.createStartEndPosition(value.position.end), value), None
+			return ReturnNode(returnToken.position.until(value.position), value), None
 
 
-		elif self.currentToken.isKeyword("CONTINUE"):
+		elif self.currentToken.isKeyword(Keywords.CONTINUE):
 			token = self.currentToken
 
 			self.advance()
 
-			return ContinueNode(token.position.copy()), None
+			return ContinueNode(token.position), None
 
-		elif self.currentToken.isKeyword("BREAK"):
+		elif self.currentToken.isKeyword(Keywords.BREAK):
 			token = self.currentToken
 
 			self.advance()
 
-			return BreakNode(token.position.copy()), None
+			return BreakNode(token.position), None
 
-		elif self.currentToken.isKeyword("IMPORT"):
-			startPosition = self.currentToken.position.start.copy()
+		elif self.currentToken.isKeyword(Keywords.IMPORT):
+			startPosition = self.currentToken.position
 
 			self.advance()
 
-			importName, error = self.compExpression()
+			importName, error = yield self.compExpression()
 			if error:
 				return None, error
 
-			if not self.currentToken.isKeyword("AS"):
-				return ImportNode(startPosition.createStartEndPosition(importName.position.end), importName, None), None
+			if not self.currentToken.isKeyword(Keywords.AS):
+				return ImportNode(startPosition.until(importName.position), importName, None), None
 
 			self.advance()
 
 			if self.currentToken.type not in [TokenTypes.IDENTIFIER, TokenTypes.MULTIPLY]:
-				return None, InvalidSyntaxError(f"Expected IDENTIFIER, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+				return None, InvalidSyntaxError(f"Expected IDENTIFIER, not {str(self.currentToken.type)}", self.currentToken.position)
 
 			asName = self.currentToken
 
@@ -187,107 +271,119 @@ class Parser:
 
 			self.advance()
 
-			return ImportNode(startPosition.createStartEndPosition(asName.position.end), importName, asName.value), None
-
-		compExpression, error = self.binaryOperation(self.compExpression, (TokenTypes.PLUS, TokenTypes.MINUS))
-		if error:
-			return None, error
+			return ImportNode(startPosition.until(asName.position), importName, asName.value), None
 
-		return compExpression, None
+		return (yield self.operation(ARITHMETIC_POWER))
 
-	def compExpression(self) -> tuple[BinaryOperationNode, Error]:
-		startToken = self.currentToken
+	def compExpression(self) -> Nested[tuple[BinaryOperationNode, Error]]:
+		return self.operation(COMPARISON_POWER)
 
-		if startToken.isKeyword("NOT"):
-			self.advance()
-			factor, error = self.compExpression()
-			if error:
-				return None, error
+	# Pratt parser for the operators, parses a prefix operand and keeps folding in
+	# binary operators that bind at least as tight as bindingPower. All of them
+	# are left associative so the right side is parsed one power higher. Instead
+	# of recursing for an operand, the operation waiting for it is pushed on the
+	# pending stack together with the binding power to go back to, so long
+	# chains, prefix operators and parentheses can be nested arbitrarily deep
 
-			return UnaryOperationNode(startToken, factor), None
+	def operation(self, bindingPower: int) -> Nested[tuple[BinaryOperationNode | UnaryOperationNode, Error]]:
+		pending: list[tuple[int, Token, ExpressionNode]] = []
 
-		node, error = self.binaryOperation(self.term, (
-			TokenTypes.DOUBLE_EQUALS,
-			TokenTypes.NOT_EQUALS,
-			TokenTypes.GRATER_THAN,
-			TokenTypes.LESS_THAN,
-			TokenTypes.GREATER_EQUALS,
-			TokenTypes.LESS_EQUALS
-		))
-		
-		if error:
-			return None, error
+		while True:
+			startToken = self.currentToken
 
-		return node, None
+			if startToken.type in (TokenTypes.PLUS, TokenTypes.MINUS):
+				self.advance()
+				pending.append((bindingPower, startToken, UNARY))
+				bindingPower = UNARY_POWER
+				continue
 
-	def term(self) -> tuple[BinaryOperationNode, Error]:
-		factor, error = self.binaryOperation(self.power, (TokenTypes.MULTIPLY, TokenTypes.DIVIDE, TokenTypes.MODULUS))
-		if error:
-			return None, error
+			if startToken.keyword is Keywords.NOT and bindingPower <= COMPARISON_POWER:
+				self.advance()
+				pending.append((bindingPower, startToken, UNARY))
+				bindingPower = COMPARISON_POWER
+				continue
 
-		return factor, None
+			if startToken.type == TokenTypes.LEFT_PARENTHESES:
+				self.advance()
 
-	def power(self) -> tuple[BinaryOperationNode, Error]:
-		factor, error = self.binaryOperation(self.factor, [TokenTypes.POWER])
-		if error:
-			return None, error
+				if not self.startsStatement():
+					pending.append((bindingPower, startToken, GROUP))
+					bindingPower = ARITHMETIC_POWER
+					continue
 
-		return factor, None
+				left, error = yield self.expression()
+				if error:
+					return None, error
 
-	def factor(self) -> tuple[UnaryOperationNode, Error]:
-		startToken = self.currentToken
+				left, error = self.closeGroup(left)
+			elif startToken.type in LEAF_NODES:
+				self.advance()
+				left, error = LEAF_NODES[startToken.type](startToken), None
+			else:
+				left, error = yield self.atom()
 
-		if startToken.type in (TokenTypes.PLUS, TokenTypes.MINUS):
-			self.advance()
-			factor, error = self.factor()
-			if error: 
+			if error:
 				return None, error
 
-			return UnaryOperationNode(startToken, factor), None
+			if self.currentToken.type in POSTFIX_TOKENS:
+				left, error = yield self.makeSubGetItemCalls(left)
+				if error:
+					return None, error
 
-		callGetItem, error = self.callGetItem()
-		if error:
-			return None, error
-		
-		return callGetItem, None
+			while True:
+				operatorPower = BINDING_POWERS.get(self.currentToken.type)
+				if operatorPower and operatorPower >= bindingPower:
+					pending.append((bindingPower, self.currentToken, left))
+					self.advance()
+					bindingPower = operatorPower + 1
+					break
 
-	def callGetItem(self) -> tuple[FunctionCallNode, Error]:
-		atom, error = self.atom()
-		if error:
-			return None, error
+				if not pending:
+					return left, None
 
-		while self.currentToken.type in [TokenTypes.LEFT_PARENTHESES, TokenTypes.LEFT_SQUARE, TokenTypes.DOT]:
-			atom, error = self.makeSubGetItemCall(atom)
-			if error:
-				return None, error
-			
-		return atom, None
+				bindingPower, operationToken, operand = pending.pop()
 
-	def atom(self) -> tuple[NumberNode | VariableAccessNode | VariableDeclareNode | VariableAssignNode, Error]:
-		startToken = self.currentToken
+				if operand is UNARY:
+					left = UnaryOperationNode(operationToken, left)
+				elif operand is GROUP:
+					left, error = self.closeGroup(left)
+					if error:
+						return None, error
 
-		if startToken.type in (TokenTypes.INTEGER, TokenTypes.FLOAT):
-			self.advance()
-			return NumberNode(startToken), None
+					if self.currentToken.type in POSTFIX_TOKENS:
+						left, error = yield self.makeSubGetItemCalls(left)
+						if error:
+							return None, error
+				else:
+					left = BinaryOperationNode(operand, operationToken, left)
 
-		elif startToken.type == TokenTypes.STRING:
-			self.advance()
-			return StringNode(startToken), None
-		
-		elif startToken.type == TokenTypes.LEFT_PARENTHESES:
-			self.advance()
-			expression, error = self.expression()
+	# Parentheses starting with LET, RETURN, an assignment and so on hold a
+	# statement, those are parsed by expression instead of as an operand
+
+	def startsStatement(self) -> bool:
+		return self.currentToken.keyword in STATEMENT_KEYWORDS or (self.currentToken.type == TokenTypes.IDENTIFIER and self.getNextToken().type in ASSIGN_TOKENS)
+
+	def closeGroup(self, expression: ExpressionNode) -> tuple[ExpressionNode, Error]:
+		if self.currentToken.type != TokenTypes.RIGHT_PARENTHESES:
+			return None, InvalidSyntaxError(f"Expected ')', not {str(self.currentToken.type)}", self.currentToken.position)
+
+		self.advance()
+
+		return expression, None
+
+	def makeSubGetItemCalls(self, base: ExpressionNode) -> Nested[tuple[ExpressionNode, Error]]:
+		while self.currentToken.type in POSTFIX_TOKENS:
+			base, error = yield self.makeSubGetItemCall(base)
 			if error:
 				return None, error
 
-			if self.currentToken.type != TokenTypes.RIGHT_PARENTHESES:
-				return None, InvalidSyntaxError(f"Expected ')', not {str(self.currentToken.type)}", self.currentToken.position.copy())
+		return base, None
 
-			self.advance()
-			return expression, None
+	def atom(self) -> Nested[tuple[ExpressionNode, Error]]:
+		startToken = self.currentToken
 
-		elif startToken.type == TokenTypes.LEFT_SQUARE:
-			expression, error = self.listExpression()
+		if startToken.type == TokenTypes.LEFT_SQUARE:
+			expression, error = yield self.listExpression()
 			if error:
 				return None, error
 
@@ -296,7 +392,7 @@ class Parser:
 			return expression, None
 
 		elif startToken.type == TokenTypes.LEFT_CURLY:
-			expression, error = self.dictionaryExpression()
+			expression, error = yield self.dictionaryExpression()
 			if error:
 				return None, error
 
@@ -304,106 +400,101 @@ class Parser:
 
 			return expression, None
 
-		elif startToken.type == TokenTypes.IDENTIFIER:
-			self.advance()
-			
-			return VariableAccessNode(startToken), None
-
 		elif startToken.type == TokenTypes.NEW_LINE:
 			self.advance()
 
 			return None, None
 
-		elif startToken.isKeyword("WHILE"):
-			expression, error = self.whileExpression()
+		elif startToken.isKeyword(Keywords.WHILE):
+			expression, error = yield self.whileExpression()
 			if error:
 				return None, error
 			return expression, None
 
-		elif startToken.isKeyword("FOR"):
-			expression, error = self.forExpression()
+		elif startToken.isKeyword(Keywords.FOR):
+			expression, error = yield self.forExpression()
 			if error:
 				return None, error
 			return expression, None
 
-		elif startToken.isKeyword("FUNCTION"):
-			expression, error = self.functionDefinition()
+		elif startToken.isKeyword(Keywords.FUNCTION):
+			expression, error = yield self.functionDefinition()
 			if error:
 				return None, error
 			return expression, None
 
-		elif startToken.isKeyword("IF"):
-			expression, error = self.ifExpression()
+		elif startToken.isKeyword(Keywords.IF):
+			expression, error = yield self.ifExpression()
 			if error:
 				return None, error
 			return expression, None
 
-		return None, InvalidSyntaxError(f"Expected number or identifier, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+		return None, InvalidSyntaxError(f"Expected number or identifier, not {str(self.currentToken.type)}", self.currentToken.position)
 
 	######################################
 
-	def ifExpression(self) -> tuple[ListNode, Error]:
-		startPosition = self.currentToken.position.start.copy()
+	def ifExpression(self) -> Nested[tuple[IfContainerNode, Error]]:
+		startPosition = self.currentToken.position
 
 		self.advance()
 
-		condition, error = self.compExpression()
+		condition, error = yield self.compExpression()
 		if error:
 			return None, error
 
-		if not self.currentToken.isKeyword("THEN"):
-			return None, InvalidSyntaxError(f"Expected THEN, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+		if not self.currentToken.isKeyword(Keywords.THEN):
+			return None, InvalidSyntaxError(f"Expected THEN, not {str(self.currentToken.type)}", self.currentToken.position)
 
 		self.advance()
 
-		body, error = self.parseIf()
+		body, error = yield self.parseIf()
 		if error:
 			return None, error
 
-		mainIf = IfNode(startPosition.createStartEndPosition(self.currentToken.position.end), condition, body)
+		mainIf = IfNode(startPosition.until(self.currentToken.position), condition, body)
 
 		elseifNodes = []
 
-		while self.currentToken.isKeyword("ELSEIF"):
-			elifStart = self.currentToken.position.start.copy()
+		while self.currentToken.isKeyword(Keywords.ELSEIF):
+			elifStart = self.currentToken.position
 
 			self.advance()
 
-			condition, error = self.compExpression()
+			condition, error = yield self.compExpression()
 			if error:
 				return None, error
 
-			if not self.currentToken.isKeyword("THEN"):
-				return None, InvalidSyntaxError(f"Expected THEN, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+			if not self.currentToken.isKeyword(Keywords.THEN):
+				return None, InvalidSyntaxError(f"Expected THEN, not {str(self.currentToken.type)}", self.currentToken.position)
 
 			self.advance()
 
-			body, error = self.parseIf()
+			body, error = yield self.parseIf()
 			if error:
 				return None, error
 
-			elseifNodes.append(IfNode(elifStart.createStartEndPosition(self.currentToken.position.end), condition, body))
+			elseifNodes.append(IfNode(elifStart.until(self.currentToken.position), condition, body))
 
 		elseNode = None
-		if self.currentToken.isKeyword("ELSE"):
-			elseStartPosition = self.currentToken.position.start.copy()
+		if self.currentToken.isKeyword(Keywords.ELSE):
+			elseStartPosition = self.currentToken.position
 
 			self.advance()
 
-			body, error = self.parseEnd()
+			body, error = yield self.parseEnd()
 			if error:
 				return None, error
 
-			elseNode = IfNode(elseStartPosition.createStartEndPosition(self.currentToken.position.end), None, body)
+			elseNode = IfNode(elseStartPosition.until(self.currentToken.position), None, body)
 
-		endPosition = startPosition.createStartEndPosition(self.currentToken.position.end)
+		endPosition = startPosition.until(self.currentToken.position)
 
 		self.advance()
 		
 		return IfContainerNode(endPosition, mainIf, elseifNodes, elseNode), None
 
-	def functionDefinition(self) -> tuple[ListNode, Error]:
-		startPosition = self.currentToken.position.start.copy()
+	def functionDefinition(self) -> Nested[tuple[FunctionDefineNode, Error]]:
+		startPosition = self.currentToken.position
 
 		self.advance()
 
@@ -417,7 +508,7 @@ class Parser:
 			self.advance()
 
 		if self.currentToken.type != TokenTypes.LEFT_PARENTHESES:
-			return None, InvalidSyntaxError(f"Expected (, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+			return None, InvalidSyntaxError(f"Expected (, not {str(self.currentToken.type)}", self.currentToken.position)
 
 		self.advance()
 
@@ -425,7 +516,7 @@ class Parser:
 
 		if self.currentToken.type != TokenTypes.RIGHT_PARENTHESES:
 			if self.currentToken.type != TokenTypes.IDENTIFIER:
-				return None, InvalidSyntaxError(f"Expected IDENTIFIER, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+				return None, InvalidSyntaxError(f"Expected IDENTIFIER, not {str(self.currentToken.type)}", self.currentToken.position)
 
 			firstArgument = self.currentToken.value
 
@@ -437,7 +528,7 @@ class Parser:
 				self.advance()
 				
 				if self.currentToken.type != TokenTypes.IDENTIFIER:
-					return None, InvalidSyntaxError(f"Expected IDENTIFIER, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+					return None, InvalidSyntaxError(f"Expected IDENTIFIER, not {str(self.currentToken.type)}", self.currentToken.position)
 
 				argument = self.currentToken.value
 
@@ -446,25 +537,25 @@ class Parser:
 				self.advance()
 
 		if self.currentToken.type != TokenTypes.RIGHT_PARENTHESES:
-			return None, InvalidSyntaxError(f"Expected ), not {str(self.currentToken.type)}", self.currentToken.position.copy())
+			return None, InvalidSyntaxError(f"Expected ), not {str(self.currentToken.type)}", self.currentToken.position)
 
 		self.advance()
 
 		if self.currentToken.type != TokenTypes.NEW_LINE:
-			return None, InvalidSyntaxError(f"Expected , or new line, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+			return None, InvalidSyntaxError(f"Expected , or new line, not {str(self.currentToken.type)}", self.currentToken.position)
 
-		body, error = self.parseEnd()
+		body, error = yield self.parseEnd()
 		if error:
 			return None, error
 		
-		endPosition = self.currentToken.position.end.copy()
+		endPosition = self.currentToken.position
 
 		self.advance()
 
-		return FunctionDefineNode(startPosition.createStartEndPosition(endPosition), functionName, arguments, body, anonymous), None
+		return FunctionDefineNode(startPosition.until(endPosition), functionName, arguments, body, anonymous), None
 
-	def makeSubGetItemCall(self, base: GetItemNode | FunctionCallNode) -> tuple[GetItemNode | FunctionCallNode, Error]:
-		startPosition = self.currentToken.position.start.copy()
+	def makeSubGetItemCall(self, base: GetItemNode | FunctionCallNode) -> Nested[tuple[GetItemNode | FunctionCallNode, Error]]:
+		startPosition = self.currentToken.position
 
 		if self.currentToken.type == TokenTypes.LEFT_PARENTHESES:
 			self.advance()
@@ -472,7 +563,7 @@ class Parser:
 			arguments = []
 
 			if self.currentToken.type != TokenTypes.RIGHT_PARENTHESES:
-				firstArgument, error = self.expression()
+				firstArgument, error = yield self.expression()
 				if error:
 					return None, error
 
@@ -481,73 +572,71 @@ class Parser:
 				while self.currentToken.type == TokenTypes.COMMA:
 					self.advance()
 
-					argument, error = self.expression()
+					argument, error = yield self.expression()
 					if error:
 						return None, error
 
 					arguments.append(argument)
 
 			if self.currentToken.type != TokenTypes.RIGHT_PARENTHESES:
-				return None, InvalidSyntaxError(f"Expected , or ), not {str(self.currentToken.type)}", self.currentToken.position.copy())
+				return None, InvalidSyntaxError(f"Expected , or ), not {str(self.currentToken.type)}", self.currentToken.position)
 
-			endPosition = self.currentToken.position.end.copy()
-			endPosition.column += 1
+			endPosition = self.currentToken.position.extended(1)
 
 			self.advance()
 
-			return FunctionCallNode(base.position.start.createStartEndPosition(endPosition), base, arguments), None
+			return FunctionCallNode(base.position.until(endPosition), base, arguments), None
 		elif self.currentToken.type == TokenTypes.LEFT_SQUARE:
 			self.advance()
 
 			if self.currentToken.type == TokenTypes.RIGHT_SQUARE:
-				return None, InvalidSyntaxError(f"Expected expression, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+				return None, InvalidSyntaxError(f"Expected expression, not {str(self.currentToken.type)}", self.currentToken.position)
 			
-			indexNode, error = self.expression()
+			indexNode, error = yield self.expression()
 			if error:
 				return None, error
 
 			if self.currentToken.type != TokenTypes.RIGHT_SQUARE:
-				return None, InvalidSyntaxError(f"Expected ], not {str(self.currentToken.type)}", self.currentToken.position.copy())
+				return None, InvalidSyntaxError(f"Expected ], not {str(self.currentToken.type)}", self.currentToken.position)
 			
-			endPosition = self.currentToken.position.end.copy()
-			endPosition.column += 1
+			endPosition = self.currentToken.position.extended(1)
 
 			self.advance()
 
 			if self.currentToken.type != TokenTypes.EQUALS:
-				return GetItemNode(startPosition.createStartEndPosition(endPosition), base, indexNode), None
+				return GetItemNode(startPosition.until(endPosition), base, indexNode), None
 
 			self.advance()
 
-			value, error = self.compExpression()
+			value, error = yield self.compExpression()
 			if error:
 				return None, error
 
-			return SetItemNode(startPosition.createStartEndPosition(value.position.end), base, indexNode, value), None
+			return SetItemNode(startPosition.until(value.position), base, indexNode, value), None
 
 		elif self.currentToken.type == TokenTypes.DOT:
 			self.advance()
 
 			if self.currentToken.type != TokenTypes.IDENTIFIER:
-				return None, InvalidSyntaxError(f"Expected IDENTIFIER, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+				return None, InvalidSyntaxError(f"Expected IDENTIFIER, not {str(self.currentToken.type)}", self.currentToken.position)
 
 			index = StringNode(self.currentToken)
 
 			self.advance()
 
-			return GetAttributeNode(startPosition.createStartEndPosition(index.position.end), base, index), None
+			return GetAttributeNode(startPosition.until(index.position), base, index), None
 
-	def listExpression(self) -> tuple[ListNode, Error]:
-		startPosition = self.currentToken.position.start.copy()
+	def listExpression(self) -> Nested[tuple[ListNode | RangeNode, Error]]:
+		startPosition = self.currentToken.position
 
 		self.advance()
 
 		expressions = []
 
 		if self.currentToken.type == TokenTypes.RIGHT_SQUARE:
-			return ListNode(startPosition.createStartEndPosition(self.currentToken.position.end.copy()), expressions), None
+			return ListNode(startPosition.until(self.currentToken.position), expressions), None
 
-		firstExpression, error = self.compExpression()
+		firstExpression, error = yield self.compExpression()
 		if error:
 			return None, error
 
@@ -556,50 +645,50 @@ class Parser:
 		if self.currentToken.type == TokenTypes.RIGHT_ARROW:
 			self.advance()
 
-			endExpression, error = self.compExpression()
+			endExpression, error = yield self.compExpression()
 			if error:
 				return None, error
 
 			if self.currentToken.type != TokenTypes.RIGHT_ARROW:
 				if self.currentToken.type != TokenTypes.RIGHT_SQUARE:
-					return None, InvalidSyntaxError(f"Expected ], not {str(self.currentToken.type)}", self.currentToken.position.copy())
+					return None, InvalidSyntaxError(f"Expected ], not {str(self.currentToken.type)}", self.currentToken.position)
 
-				return RangeNode(startPosition.createStartEndPosition(self.currentToken.position.end), firstExpression, endExpression, NumberNode(Token(TokenTypes.INTEGER, self.currentToken.position.copy(), 1))), None
+				return RangeNode(startPosition.until(self.currentToken.position), firstExpression, endExpression, NumberNode(Token(TokenTypes.INTEGER, self.currentToken.position, 1))), None
 
 			self.advance()
 
-			stepExpression, error = self.compExpression()
+			stepExpression, error = yield self.compExpression()
 			if error:
 				return None, error
 			
 			if self.currentToken.type != TokenTypes.RIGHT_SQUARE:
-				return None, InvalidSyntaxError(f"Expected ], not {str(self.currentToken.type)}", self.currentToken.position.copy())
+				return None, InvalidSyntaxError(f"Expected ], not {str(self.currentToken.type)}", self.currentToken.position)
 
-			return RangeNode(startPosition.createStartEndPosition(self.currentToken.position.end), firstExpression, endExpression, stepExpression), None
+			return RangeNode(startPosition.until(self.currentToken.position), firstExpression, endExpression, stepExpression), None
 		
 		while self.currentToken.type == TokenTypes.COMMA:
 			self.advance()
 
-			expression, error = self.compExpression()
+			expression, error = yield self.compExpression()
 			if error:
 				return None, error
 
 			expressions.append(expression)
 
 		if self.currentToken.type != TokenTypes.RIGHT_SQUARE:
-			return None, InvalidSyntaxError(f"Expected , or ], not {str(self.currentToken.type)}", self.currentToken.position.copy())
+			return None, InvalidSyntaxError(f"Expected , or ], not {str(self.currentToken.type)}", self.currentToken.position)
 
-		return ListNode(startPosition.createStartEndPosition(self.currentToken.position.end.copy()), expressions), None
+		return ListNode(startPosition.until(self.currentToken.position), expressions), None
 
-	def dictionaryExpression(self) -> tuple[WhileNode, Error]:
-		startPosition = self.currentToken.position.start.copy()
+	def dictionaryExpression(self) -> Nested[tuple[DictionaryNode, Error]]:
+		startPosition = self.currentToken.position
 
 		self.advance()
 
 		expressions = {}
 
 		if self.currentToken.type == TokenTypes.RIGHT_CURLY:
-			return DictionaryNode(startPosition.createStartEndPosition(self.currentToken.position.end), expressions), None
+			return DictionaryNode(startPosition.until(self.currentToken.position), expressions), None
 
 		first = True
 		while self.currentToken.type == TokenTypes.COMMA or first:
@@ -608,120 +697,101 @@ class Parser:
 
 			first = False
 
-			key, error = self.compExpression()
+			key, error = yield self.compExpression()
 			if error:
 				return None, error
 
 			if self.currentToken.type != TokenTypes.COLON:
-				return None, InvalidSyntaxError(f"Expected :, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+				return None, InvalidSyntaxError(f"Expected :, not {str(self.currentToken.type)}", self.currentToken.position)
 
 			self.advance()
 
-			value, error = self.compExpression()
+			value, error = yield self.compExpression()
 			if error:
 				return None, error
 
 			expressions[key] = value
 
 		if self.currentToken.type != TokenTypes.RIGHT_CURLY:
-			return None, InvalidSyntaxError(f"Expected }}, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+			return None, InvalidSyntaxError(f"Expected }}, not {str(self.currentToken.type)}", self.currentToken.position)
 		
-		endPosition = self.currentToken.position.end.copy()
+		endPosition = self.currentToken.position
 
 		self.advance()
 
-		return DictionaryNode(startPosition.createStartEndPosition(endPosition), expressions), None
+		return DictionaryNode(startPosition.until(endPosition), expressions), None
 
-	def forExpression(self) -> tuple[ForNode, Error]:
-		startPosition = self.currentToken.position.start.copy()
+	def forExpression(self) -> Nested[tuple[ForNode, Error]]:
+		startPosition = self.currentToken.position
 
 		self.advance()
 
 		if self.currentToken.type != TokenTypes.IDENTIFIER:
-			return None, InvalidSyntaxError(f"Expected identifier, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+			return None, InvalidSyntaxError(f"Expected identifier, not {str(self.currentToken.type)}", self.currentToken.position)
 
 		item = self.currentToken
 
 		self.advance()
 
-		if not self.currentToken.isKeyword("IN"):
-			return None, InvalidSyntaxError(f"Expected keyword IN, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+		if not self.currentToken.isKeyword(Keywords.IN):
+			return None, InvalidSyntaxError(f"Expected keyword IN, not {str(self.currentToken.type)}", self.currentToken.position)
 
 		self.advance()
 
-		iterator, error = self.compExpression()
+		iterator, error = yield self.compExpression()
 		if error:
 			return None, error
 
-		if not self.currentToken.isKeyword("THEN"):
-			return None, InvalidSyntaxError(f"Expected keyword THEN, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+		if not self.currentToken.isKeyword(Keywords.THEN):
+			return None, InvalidSyntaxError(f"Expected keyword THEN, not {str(self.currentToken.type)}", self.currentToken.position)
 
 		self.advance()
 
 		if not self.currentToken.type == TokenTypes.NEW_LINE:
-			return None, InvalidSyntaxError(f"Expected new line, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+			return None, InvalidSyntaxError(f"Expected new line, not {str(self.currentToken.type)}", self.currentToken.position)
 
 		self.advance()
 
-		body, error = self.parseEnd()
+		body, error = yield self.parseEnd()
 		if error:
 			return None, error
 
-		endPosition = self.currentToken.position.end.copy()
+		endPosition = self.currentToken.position
 
 		self.advance()
 
-		return ForNode(startPosition.createStartEndPosition(endPosition), item, iterator, body), None
+		return ForNode(startPosition.until(endPosition), item, iterator, body), None
 
-	def whileExpression(self) -> tuple[WhileNode, Error]:
-		startPosition = self.currentToken.position.start.copy()
+	def whileExpression(self) -> Nested[tuple[WhileNode, Error]]:
+		startPosition = self.currentToken.position
 
 		self.advance()
 
-		condition, error = self.compExpression()
+		condition, error = yield self.compExpression()
 		if error:
 			return None, error
 
-		previousPosition = self.currentToken.position.copy()
+		previousPosition = self.currentToken.position
 
 		if not self.currentToken:
 			return None, InvalidSyntaxError(f"Expected keyword THEN, not EOF", previousPosition)
 
-		if not self.currentToken.isKeyword("THEN"):
-			return None, InvalidSyntaxError(f"Expected keyword THEN, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+		if not self.currentToken.isKeyword(Keywords.THEN):
+			return None, InvalidSyntaxError(f"Expected keyword THEN, not {str(self.currentToken.type)}", self.currentToken.position)
 
 		self.advance()
 
 		if not self.currentToken.type == TokenTypes.NEW_LINE:
-			return None, InvalidSyntaxError(f"Expected new line, not {str(self.currentToken.type)}", self.currentToken.position.copy())
+			return None, InvalidSyntaxError(f"Expected new line, not {str(self.currentToken.type)}", self.currentToken.position)
 
 		self.advance()
 
-		body, error = self.parseEnd()
+		body, error = yield self.parseEnd()
 		if error:
 			return None, error
 
-		endPosition = self.currentToken.position.end.copy()
+		endPosition = self.currentToken.position
 
 		self.advance()
 
-		return WhileNode(startPosition.createStartEndPosition(endPosition), condition, body), None
-
-	######################################
-
-	def binaryOperation(self, function, operators) -> tuple[BinaryOperationNode, Error]:
-		left, error = function()
-		if error:
-			return None, error
-		
-		while self.currentToken.type in operators:
-			operationToken = self.currentToken
-			self.advance()
-
-			right, error = function()
-			if error:
-				return None, error
-
-			left = BinaryOperationNode(left, operationToken, right)
-
-		return left, None
\ No newline at end of file
+		return WhileNode(startPosition.until(endPosition), condition, body), None
@@ -0,0 +1,152 @@
+########################################
+#	IMPORTS
+########################################
+
+from __future__ import annotations
+from .statementclass import StatementNode, BinaryOperationNode, UnaryOperationNode, VariableAccessNode, VariableAssignNode, VariableDeclareNode, WhileNode, FunctionCallNode, ListNode, GetItemNode, FunctionDefineNode, ReturnNode, IfNode, IfContainerNode, SetItemNode, ImportNode, DictionaryNode, ForNode, RangeNode, GetAttributeNode
+from .builtInfunctions import builtinsTable
+
+########################################
+#	CONSTANTS
+########################################
+
+CHILDREN = {
+	BinaryOperationNode: lambda node: [node.left, node.right],
+	UnaryOperationNode: lambda node: [node.expression],
+	VariableAssignNode: lambda node: [node.valueNode],
+	VariableDeclareNode: lambda node: [node.valueNode],
+	WhileNode: lambda node: [node.condition] + node.body,
+	ForNode: lambda node: [node.iterator] + node.body,
+	FunctionCallNode: lambda node: [node.func] + node.arguments,
+	ListNode: lambda node: node.expressions,
+	DictionaryNode: lambda node: [expression for item in node.expressions.items() for expression in item],
+	GetItemNode: lambda node: [node.variable, node.item],
+	GetAttributeNode: lambda node: [node.variable, node.item],
+	SetItemNode: lambda node: [node.variable, node.item, node.value],
+	ReturnNode: lambda node: [node.value] if node.value else [],
+	IfNode: lambda node: ([node.condition] if node.condition else []) + node.body,
+	IfContainerNode: lambda node: [node.ifNode] + node.elseIfNodes + ([node.elseNode] if node.elseNode else []),
+	ImportNode: lambda node: [node.moduleName],
+	RangeNode: lambda node: [node.start, node.end, node.step]
+}
+
+########################################
+#	SCOPE
+########################################
+
+# Every function body gets a fixed layout of name -> slot. The module scope and
+# functions containing an IMPORT can get new names while running, names that
+# aren't found before reaching one of them are left to the name based lookup
+
+class Scope:
+	def __init__(self, parent: Scope | None, isAFunction: bool) -> None:
+		self.parent = parent
+		self.isAFunction = isAFunction
+		self.dynamic = not isAFunction
+		self.layout: dict[str, int] = {}
+
+	def declare(self, name: str) -> None:
+		if not self.isAFunction or name in self.layout or name in builtinsTable.variables:
+			return
+
+		self.layout[name] = len(self.layout)
+
+	def find(self, name: str) -> tuple[int, int | None]:
+		scope = self
+		depth = 0
+
+		while scope:
+			if name in scope.layout:
+				return depth, scope.layout[name]
+
+			if scope.dynamic:
+				break
+
+			scope = scope.parent
+			depth += 1
+
+		return 0, None
+
+########################################
+#	RESOLVER
+########################################
+
+class Resolver:
+	def __init__(self) -> None:
+		self.scope: Scope = None
+
+	def resolveModule(self, statements: list[StatementNode]) -> None:
+		self.scope = Scope(None, False)
+		self.resolveBody(statements)
+
+	# The tree is walked with an explicit stack so deeply nested code can't hit
+	# the recursion limit. Entering a function pushes its scope on the stack as
+	# well, popping the scope again leaves it
+
+	def resolveBody(self, statements: list[StatementNode]) -> None:
+		stack: list[StatementNode | Scope] = list(reversed(statements))
+
+		while stack:
+			node = stack.pop()
+
+			if isinstance(node, Scope):
+				self.scope = node.parent
+				continue
+
+			if isinstance(node, VariableAccessNode):
+				node.depth, node.slot = self.scope.find(node.token.value)
+			elif isinstance(node, VariableAssignNode):
+				node.depth, node.slot = self.scope.find(node.token.value)
+			elif isinstance(node, VariableDeclareNode):
+				node.depth, node.slot = 0, self.scope.layout.get(node.token.value)
+			elif isinstance(node, ForNode):
+				node.slot = self.scope.layout.get(node.item.value)
+			elif isinstance(node, FunctionDefineNode):
+				stack.append(self.enterFunction(node))
+				stack.extend(reversed(node.body))
+				continue
+
+			stack.extend(reversed(self.children(node)))
+
+	# All names declared in a function body are collected before any of them are
+	# resolved, a name used before its declaration still refers to the local slot
+	# and falls back to the outer scopes while the slot is empty
+
+	def enterFunction(self, node: FunctionDefineNode) -> Scope:
+		self.scope = Scope(self.scope, True)
+
+		for argument in node.arguments:
+			self.scope.declare(argument)
+
+		self.declareNames(node.body)
+
+		node.layout = self.scope.layout
+
+		return self.scope
+
+	def declareNames(self, statements: list[StatementNode]) -> None:
+		stack = list(reversed(statements))
+
+		while stack:
+			node = stack.pop()
+
+			if isinstance(node, VariableDeclareNode):
+				self.scope.declare(node.token.value)
+			elif isinstance(node, ForNode):
+				self.scope.declare(node.item.value)
+			elif isinstance(node, ImportNode):
+				self.scope.dynamic = True
+			elif isinstance(node, FunctionDefineNode):
+				if not node.anonymous:
+					self.scope.declare(node.variable)
+
+				continue
+
+			stack.extend(reversed(self.children(node)))
+
+	def children(self, node: StatementNode) -> list[StatementNode]:
+		getChildren = CHILDREN.get(type(node))
+		if not getChildren:
+			return []
+
+		return getChildren(node)
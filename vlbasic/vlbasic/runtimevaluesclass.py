@@ -3,137 +3,149 @@
 ########################################
 
 from __future__ import annotations
-from .utils import StartEndPosition, NUMBERS
+from .utils import StartEndPosition, File, NUMBERS
 from .contextclass import Context, VariableTable
-from .error import RTError, DivisionByZeroError, RangeError, KeyError_, ArgumentError, ValueError_
-from typing import Callable
+from .error import RTError, DivisionByZeroError, RangeError, KeyError_, ArgumentError, ValueError_, InvalidIteratorError
+from typing import Callable, Iterator, Sequence
+from array import array
+import operator
 from .statementclass import ExpressionNode
+from . import vector
 
 ########################################
 #	INTERPRETER
 ########################################
 
+# Values are created for every intermediate result, __slots__ keeps them small.
+# Numbers, strings, booleans and null hash and compare by their type and value
+# so dictionaries can look them up as keys, every other value is only equal to
+# itself
+
 class RuntimeValue:
+	__slots__ = ("value", "position", "context")
+
 	def __init__(self, value: int | float, position: StartEndPosition, context: Context) -> None:
 		self.value = value
 		self.position = position
 		self.context = context
-		self.continueLoop = False
-		self.breakLoop = False
 
 	def __repr__(self) -> str:
 		return f"RUNTIME_VALUE({self.value})"
 	
-	def setContinue(self, value: bool = True) -> RuntimeValue:
-		self.continueLoop = value
-		return self
-
-	def setBreak(self, value: bool = True) -> RuntimeValue:
-		self.breakLoop = value
-		return self
-
 	def added(self, to: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to add {type(self).__name__} to {type(to).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to add {type(self).__name__} to {type(to).__name__}", position, self.context, "ValueError")
 
 	def subtracted(self, by: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to subtract {type(self).__name__} by {type(by).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to subtract {type(self).__name__} by {type(by).__name__}", position, self.context, "ValueError")
 
 	def multiplied(self, by: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to multiply {type(self).__name__} by {type(by).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to multiply {type(self).__name__} by {type(by).__name__}", position, self.context, "ValueError")
 
 	def divided(self, by: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to divide {type(self).__name__} by {type(by).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to divide {type(self).__name__} by {type(by).__name__}", position, self.context, "ValueError")
 
 	def power(self, by: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to power {type(self).__name__} by {type(by).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to power {type(self).__name__} by {type(by).__name__}", position, self.context, "ValueError")
 
 	def modulus(self, by: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to modulus {type(self).__name__} by {type(by).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to modulus {type(self).__name__} by {type(by).__name__}", position, self.context, "ValueError")
 
 	def equals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return Boolean(False, position.copy(), self.context), None
+		return makeBoolean(False, position, self.context), None
 
 	def notEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return Boolean(True, position.copy(), self.context), None
+		return makeBoolean(True, position, self.context), None
 
 	def graterThan(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to compare size between {type(self).__name__} and {type(other).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to compare size between {type(self).__name__} and {type(other).__name__}", position, self.context, "ValueError")
 
 	def lessThan(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to compare size between {type(self).__name__} and {type(other).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to compare size between {type(self).__name__} and {type(other).__name__}", position, self.context, "ValueError")
 
 	def graterThanEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to compare size between {type(self).__name__} and {type(other).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to compare size between {type(self).__name__} and {type(other).__name__}", position, self.context, "ValueError")
 
 	def lessThanEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to compare size between {type(self).__name__} and {type(other).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to compare size between {type(self).__name__} and {type(other).__name__}", position, self.context, "ValueError")
 
 	def notted(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to invert {type(self).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to invert {type(self).__name__}", position, self.context, "ValueError")
 
 	def toBoolean(self, position: StartEndPosition) -> tuple[Boolean, RTError]:
-		return None, RTError(f"Unable to convert a {type(self).__name__} by a Boolean", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to convert a {type(self).__name__} by a Boolean", position, self.context, "ValueError")
 
 	def toString(self, position: StartEndPosition) -> tuple[String, RTError]:
-		return None, RTError(f"Unable to convert a {type(self).__name__} by a String", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to convert a {type(self).__name__} by a String", position, self.context, "ValueError")
 
 	def toNumber(self, position: StartEndPosition) -> tuple[Number, RTError]:
-		return None, RTError(f"Unable to convert a {type(self).__name__} by a Number", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to convert a {type(self).__name__} by a Number", position, self.context, "ValueError")
 
 	def execute(self, arguments: list[RuntimeValue], position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to call a {type(self).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to call a {type(self).__name__}", position, self.context, "ValueError")
 
 	def getItem(self, item: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to get item {str(item)} of {type(self).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to get item {str(item)} of {type(self).__name__}", position, self.context, "ValueError")
 
 	def getAttribute(self, item: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		def notFound(position):
-			return None, RTError(f"Unable to get attribute {str(item)} of {type(self).__name__}", position.copy(), self.context, "ValueError")
+			return None, RTError(f"Unable to get attribute {str(item)} of {type(self).__name__}", position, self.context, "ValueError")
 
 		functionName = f"attribute_{item.value}"
 		func = getattr(self, functionName, notFound)
 		return func(position)
 
 	def setItem(self, item: RuntimeValue, value: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return None, RTError(f"Unable to set item {str(item)} of {type(self).__name__} to {str(value)}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to set item {str(item)} of {type(self).__name__} to {str(value)}", position, self.context, "ValueError")
 
 	def getLength(self, position: StartEndPosition) -> tuple[Number, RTError]:
-		return None, RTError(f"Unable to get length of a {type(self).__name__}", position.copy(), self.context, "ValueError")
+		return None, RTError(f"Unable to get length of a {type(self).__name__}", position, self.context, "ValueError")
+
+	# The items a FOR loop goes through, made one at a time while it loops.
+	# context is the context of the loop, errors are raised there
+
+	def iterate(self, position: StartEndPosition, context: Context) -> tuple[Iterator[RuntimeValue], RTError]:
+		return None, InvalidIteratorError(position, context)
 
 class Number(RuntimeValue):
+	__slots__ = ()
+
 	def __init__(self, value: int | float, position: StartEndPosition, context: Context) -> None:
 		self.value = value
 		self.position = position
 		self.context = context
-		self.continueLoop = False
-		self.breakLoop = False
 
 	def __repr__(self) -> str:
 		return f"NUMBER({self.value})"
 
+	def __hash__(self) -> int:
+		return hash(self.value)
+
+	def __eq__(self, other: object) -> bool:
+		return type(other) is Number and self.value == other.value
+
 	def added(self, to: Number | RuntimeValue, position: StartEndPosition) -> tuple[Number, RTError]:
 		if isinstance(to, Number):
-			return Number(self.value + to.value, position.copy(), self.context), None
+			return makeNumber(self.value + to.value, position, self.context), None
 		elif isinstance(to, Boolean):
-			return Number(self.value + (1 if to.value else 0), position.copy(), self.context), None
+			return makeNumber(self.value + (1 if to.value else 0), position, self.context), None
 
-		return super().added(to, position.copy())
+		return super().added(to, position)
 
 	def subtracted(self, by: Number | RuntimeValue, position: StartEndPosition) -> tuple[Number, RTError]:
 		if isinstance(by, Number):
-			return Number(self.value - by.value, position.copy(), self.context), None
+			return makeNumber(self.value - by.value, position, self.context), None
 		elif isinstance(by, Boolean):
-			return Number(self.value - (1 if by.value else 0), position.copy(), self.context), None
+			return makeNumber(self.value - (1 if by.value else 0), position, self.context), None
 
-		return super().subtracted(by, position.copy())
+		return super().subtracted(by, position)
 
 	def multiplied(self, by: Number | RuntimeValue, position: StartEndPosition) -> tuple[Number, RTError]:
 		if isinstance(by, Number):
-			return Number(self.value * by.value, position.copy(), self.context), None
+			return makeNumber(self.value * by.value, position, self.context), None
 		elif isinstance(by, Boolean):
-			return Number(self.value * (1 if by.value else 0), position.copy(), self.context), None
+			return makeNumber(self.value * (1 if by.value else 0), position, self.context), None
 		elif isinstance(by, String):
-			return String(by.value * self.value, position.copy(), self.context), None
+			return String(by.value * self.value, position, self.context), None
 		
 		return super().multiplied(by, position)
 
@@ -142,71 +154,71 @@ class Number(RuntimeValue):
 			if by.value == 0:
 				return None, DivisionByZeroError(position, self.context)
 
-			return Number(self.value / by.value, position.copy(), self.context), None
+			return makeNumber(self.value / by.value, position, self.context), None
 		elif isinstance(bool, Boolean):
 			if not by.value:
-				return None, DivisionByZeroError(position.copy(), self.context)
-			return Number(self.value - (1 if by.value else 0), position.copy(), self.context), None
+				return None, DivisionByZeroError(position, self.context)
+			return makeNumber(self.value - (1 if by.value else 0), position, self.context), None
 		
 		return super().divided(by, position)
 
 	def power(self, by: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(by, Number):
-			return Number(self.value ** by.value, position.copy(), self.context), None
+			return makeNumber(self.value ** by.value, position, self.context), None
 		
 		return super().divided(by, position)
 
 	def modulus(self, by: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(by, Number):
-			return Number(self.value % by.value, position.copy(), self.context), None
+			return makeNumber(self.value % by.value, position, self.context), None
 		
 		return super().divided(by, position)
 
 	def equals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Number):
-			return Boolean(self.value == other.value, position, self.context), None
+			return makeBoolean(self.value == other.value, position, self.context), None
 		elif isinstance(other, Boolean):
-			node, error = self.toBoolean(position.copy())
+			node, error = self.toBoolean(position)
 			if error:
 				return None, error
 
-			return Boolean(node.value == other.value, position.copy(), self.context), None
+			return makeBoolean(node.value == other.value, position, self.context), None
 		
-		return Boolean(False, position.copy(), self.context), None
+		return makeBoolean(False, position, self.context), None
 
 	def notEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Number):
-			return Boolean(self.value != other.value, position, self.context), None
+			return makeBoolean(self.value != other.value, position, self.context), None
 		elif isinstance(other, Boolean):
-			node, error = self.toBoolean(position.copy())
+			node, error = self.toBoolean(position)
 			if error:
 				return None, error
 
-			return Boolean(node.value != other.value, position.copy(), self.context), None
+			return makeBoolean(node.value != other.value, position, self.context), None
 		
-		return Boolean(True, position.copy(), self.context), None
+		return makeBoolean(True, position, self.context), None
 
 	def graterThan(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Number):
-			return Boolean(self.value > other.value, position, self.context), None
+			return makeBoolean(self.value > other.value, position, self.context), None
 		
 		return super().graterThan(other, position)
 
 	def lessThan(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Number):
-			return Boolean(self.value < other.value, position, self.context), None
+			return makeBoolean(self.value < other.value, position, self.context), None
 		
 		return super().lessThan(other, position)
 
 	def graterThanEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Number):
-			return Boolean(self.value >= other.value, position, self.context), None
+			return makeBoolean(self.value >= other.value, position, self.context), None
 		
 		return super().graterThanEquals(other, position)
 	
 	def lessThanEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Number):
-			return Boolean(self.value <= other.value, position, self.context), None
+			return makeBoolean(self.value <= other.value, position, self.context), None
 		
 		return super().lessThanEquals(other, position)
 
@@ -222,48 +234,57 @@ class Number(RuntimeValue):
 		return asNotBoolean, None
 
 	def toBoolean(self, position: StartEndPosition) -> tuple[Boolean, RTError]:
-		return Boolean(False if self.value == 0 else True, position.copy(), self.context), None
+		return makeBoolean(False if self.value == 0 else True, position, self.context), None
 
 	def toString(self, position: StartEndPosition) -> tuple[String, RTError]:
-		return String(str(self.value), position.copy(), self.context), None
+		return String(str(self.value), position, self.context), None
 
 	def toNumber(self, position: StartEndPosition) -> tuple[Number, RTError]:
-		return Number(self.value, position.copy(), self.context), None
+		return makeNumber(self.value, position, self.context), None
 
 class String(RuntimeValue):
+	__slots__ = ()
+
 	def __init__(self, value: str, position: StartEndPosition, context: Context) -> None:
 		self.value = value
 		self.position = position
 		self.context = context
-		self.continueLoop = False
-		self.breakLoop = False
 
 	def __repr__(self) -> str:
 		return f"STRING({self.value})" 
 
+	def __hash__(self) -> int:
+		return hash(self.value)
+
+	def __eq__(self, other: object) -> bool:
+		return isinstance(other, String) and self.value == other.value
+
 	def added(self, to: Number | RuntimeValue, position: StartEndPosition) -> tuple[Number, RTError]:
 		if isinstance(to, String):
-			return String(self.value + to.value, position.copy(), self.context), None
+			if len(self.value) + len(to.value) >= STRING_BUILDER_MIN_LENGTH:
+				return StringBuilder([self.value, to.value], 2, position, self.context), None
 
-		return super().added(to, position.copy())
+			return String(self.value + to.value, position, self.context), None
+
+		return super().added(to, position)
 
 	def multiplied(self, by: Number | RuntimeValue, position: StartEndPosition) -> tuple[Number, RTError]:
 		if isinstance(by, Number):
-			return String(self.value * by.value, position.copy(), self.context), None
+			return String(self.value * by.value, position, self.context), None
 		
 		return super().multiplied(by, position)
 
 	def equals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, String):
-			return Boolean(self.value == other.value, position, self.context), None
+			return makeBoolean(self.value == other.value, position, self.context), None
 		
-		return Boolean(False, position.copy(), self.context), None
+		return makeBoolean(False, position, self.context), None
 
 	def notEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Number):
-			return Boolean(self.value != other.value, position, self.context), None
+			return makeBoolean(self.value != other.value, position, self.context), None
 		
-		return Boolean(True, position.copy(), self.context), None
+		return makeBoolean(True, position, self.context), None
 
 	def notted(self, position: StartEndPosition) -> tuple[Boolean, RTError]:
 		asBoolean, error = self.toBoolean(position)
@@ -277,10 +298,10 @@ class String(RuntimeValue):
 		return asNotBoolean, None
 
 	def toBoolean(self, position: StartEndPosition) -> tuple[Boolean, RTError]:
-		return Boolean(False if len(self.value) == 0 else True, position.copy(), self.context), None
+		return makeBoolean(False if len(self.value) == 0 else True, position, self.context), None
 
 	def toString(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return String(str(self.value), position.copy(), self.context), None
+		return String(str(self.value), position, self.context), None
 
 	def getItem(self, item: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(item, Number):
@@ -289,14 +310,20 @@ class String(RuntimeValue):
 				return None, error
 
 			if item.value + 1 > length.value:
-				return None, RangeError("string", position.copy(), self.context)
+				return None, RangeError("string", position, self.context)
 
-			return String(self.value[item.value], position.copy(), self.context), None
+			return String(self.value[item.value], position, self.context), None
 
 		return super().getItem(item, position)
 
 	def getLength(self, position: StartEndPosition) -> tuple[Number, RTError]:
-		return Number(len(self.value), position.copy(), self.context), None
+		return makeNumber(len(self.value), position, self.context), None
+
+	def iterate(self, position: StartEndPosition, context: Context) -> tuple[Iterator[RuntimeValue], RTError]:
+		stringPosition = self.position
+		stringContext = self.context
+
+		return (String(character, stringPosition, stringContext) for character in self.value), None
 
 	def toNumber(self, position: StartEndPosition) -> tuple[Number, RTError]:
 		dots = 0
@@ -308,355 +335,922 @@ class String(RuntimeValue):
 				dots += 1
 				continue
 
-			return None, RTError("Unable to convert this String, to a number", position.copy(), self.context, "ValueError")
+			return None, RTError("Unable to convert this String, to a number", position, self.context, "ValueError")
 
 		if not dots:
-			return Number(int(self.value), position.copy(), self.context), None
-		return Number(float(self.value), position.copy(), self.context), None
+			return makeNumber(int(self.value), position, self.context), None
+		return makeNumber(float(self.value), position, self.context), None
 
 	def attribute_GET(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
 		def func(arguments: list[RuntimeValue], executeContext: Context):
 			if len(arguments) != 1:
-				return None, ArgumentError(1, len(arguments), "GET", position.copy(), executeContext)
+				return None, ArgumentError(1, len(arguments), "GET", position, executeContext)
 			elif not isinstance(arguments[0], Number) or "." in str(arguments[0].value):
-				return None, ValueError_(["number(integer)"], arguments[0].__class__.__name__, position.copy(), executeContext)
+				return None, ValueError_(["number(integer)"], arguments[0].__class__.__name__, position, executeContext)
 
 			if 0 <= arguments[0].value <= len(self.value) - 1:
-				return String(self.value[arguments[0].value], position.copy(), executeContext), None
+				return String(self.value[arguments[0].value], position, executeContext), None
 			else:
-				return None, RangeError(arguments[0].__class__.__name__, position.copy(), executeContext)
+				return None, RangeError(arguments[0].__class__.__name__, position, executeContext)
 
-		return BuiltInFunction("GET", func, position.copy(), self.context), None
+		return BuiltInFunction("GET", func, position, self.context), None
 
 	def attribute_GET_FROM_LAST(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
 		def func(arguments: list[RuntimeValue], executeContext: Context):
 			if len(arguments) != 1:
-				return None, ArgumentError(1, len(arguments), "GET_FROM_LAST", position.copy(), executeContext)
+				return None, ArgumentError(1, len(arguments), "GET_FROM_LAST", position, executeContext)
 			elif not isinstance(arguments[0], Number) or "." in str(arguments[0].value):
-				return None, ValueError_(["number(integer)"], arguments[0].__class__.__name__, position.copy(), executeContext)
+				return None, ValueError_(["number(integer)"], arguments[0].__class__.__name__, position, executeContext)
 
 			if 0 <= arguments[0].value <= len(self.value) - 1:
-				return String(self.value[(arguments[0].value + 1) * -1], position.copy(), executeContext), None
+				return String(self.value[(arguments[0].value + 1) * -1], position, executeContext), None
 			else:
-				return None, RangeError(arguments[0].__class__.__name__, position.copy(), executeContext)
+				return None, RangeError(arguments[0].__class__.__name__, position, executeContext)
+
+		return BuiltInFunction("GET_FROM_LAST", func, position, self.context), None
 
-		return BuiltInFunction("GET_FROM_LAST", func, position.copy(), self.context), None
+# A string made by adding strings, stored as the added parts and joined the
+# first time the text is read. The builders made by adding to each other share
+# one list of parts, a builder can add to the end of it when it uses every part
+# in the list, so s = s + x in a loop does not copy s every time. Any other
+# builder starts a new list from its text
+
+STRING_BUILDER_MIN_LENGTH = 256
+
+class StringBuilder(String):
+	__slots__ = ("parts", "count")
+
+	def __init__(self, parts: list[str], count: int, position: StartEndPosition, context: Context) -> None:
+		self.parts = parts
+		self.count = count
+		self.position = position
+		self.context = context
+
+	@property
+	def value(self) -> str:
+		if self.count > 1:
+			self.parts = ["".join(self.parts[:self.count])]
+			self.count = 1
+
+		return self.parts[0]
+
+	def added(self, to: Number | RuntimeValue, position: StartEndPosition) -> tuple[Number, RTError]:
+		if isinstance(to, String):
+			if self.count == len(self.parts):
+				self.parts.append(to.value)
+				return StringBuilder(self.parts, self.count + 1, position, self.context), None
+
+			return StringBuilder([self.value, to.value], 2, position, self.context), None
+
+		return super().added(to, position)
 
 class Boolean(RuntimeValue):
+	__slots__ = ()
+
 	def __init__(self, value: bool, position: StartEndPosition, context: Context) -> None:
 		self.value = value
 		self.position = position
 		self.context = context
-		self.continueLoop = False
-		self.breakLoop = False
 
 	def __repr__(self) -> str:
 		return f"BOOLEAN({self.value})"
 
+	def __hash__(self) -> int:
+		return hash(self.value)
+
+	def __eq__(self, other: object) -> bool:
+		return type(other) is Boolean and self.value == other.value
+
 	def added(self, to: Boolean | RuntimeValue, position: StartEndPosition) -> tuple[Number, RTError]:
 		if isinstance(to, Number):
-			return Number((1 if self.value else 0) + to.value, position.copy(), self.context), None
+			return makeNumber((1 if self.value else 0) + to.value, position, self.context), None
 		
 		return super().added(to, position)
 
 	def subtracted(self, by: Number | RuntimeValue, position: StartEndPosition) -> tuple[Number, RTError]:
 		if isinstance(by, Number):
-			return Number((1 if self.value else 0) - by.value, position.copy(), self.context), None
+			return makeNumber((1 if self.value else 0) - by.value, position, self.context), None
 		
 		return super().subtracted(by, position)
 
 	def multiplied(self, by: Number | RuntimeValue, position: StartEndPosition) -> tuple[Number, RTError]:
 		if isinstance(by, Number):
-			return Number((1 if self.value else 0) * by.value, position.copy(), self.context), None
+			return makeNumber((1 if self.value else 0) * by.value, position, self.context), None
 		
 		return super().multiplied(by, position)
 
 	def divided(self, by: Number | RuntimeValue, position: StartEndPosition) -> tuple[Number, RTError]:
 		if isinstance(by, Number):
 			if by.value == 0:
-				return None, DivisionByZeroError(position.copy(), self.context)
+				return None, DivisionByZeroError(position, self.context)
 
-			return Number((1 if self.value else 0) / by.value, position.copy(), self.context), None
+			return makeNumber((1 if self.value else 0) / by.value, position, self.context), None
 		
 		return super().divided(by, position)
 
 	def equals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Boolean):
-			return Boolean(self.value == other.value, position.copy(), self.context), None
+			return makeBoolean(self.value == other.value, position, self.context), None
 
 		return super().equals(other, position)
 
 	def notEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Boolean):
-			return Boolean(self.value != other.value, position.copy(), self.context), None
+			return makeBoolean(self.value != other.value, position, self.context), None
 
 		return super().notEquals(other, position)
 
 	def notted(self, position: StartEndPosition) -> tuple[Boolean, RTError]:
-		return Boolean(not self.value, position.copy(), self.context), None
+		return makeBoolean(not self.value, position, self.context), None
 
 	def toBoolean(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return Boolean(self.value, self.position.copy(), self.context), None
+		return self, None
 
 	def toString(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return String("TRUE" if self.value else "FALSE", position.copy(), self.context), None
+		return String("TRUE" if self.value else "FALSE", position, self.context), None
 
 	def toNumber(self, position: StartEndPosition) -> tuple[Number, RTError]:
-		return Number(1 if self.value else 0, position.copy(), self.context), None
+		return makeNumber(1 if self.value else 0, position, self.context), None
 
 class Null(RuntimeValue):
+	__slots__ = ()
+
 	def __init__(self, position: StartEndPosition, context: Context) -> None:
 		self.position = position
 		self.context = context
 		self.value = "NULL"
-		self.continueLoop = False
-		self.breakLoop = False
 
 	def __repr__(self) -> str:
 		return f"NULL()"
 
+	def __hash__(self) -> int:
+		return hash(None)
+
+	def __eq__(self, other: object) -> bool:
+		return type(other) is Null
+
 	def equals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Null):
-			return Boolean(True, position.copy(), self.context), None
+			return makeBoolean(True, position, self.context), None
 
 		return super().equals(other, position)
 
 	def notEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Null):
-			return Boolean(False, position.copy(), self.context), None
+			return makeBoolean(False, position, self.context), None
 
 		return super().notEquals(other, position)
 
 	def toString(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return String("NULL" if self.value else "FALSE", position.copy(), self.context), None
+		return String("NULL" if self.value else "FALSE", position, self.context), None
 
 	def toBoolean(self, position: StartEndPosition) -> tuple[Boolean, RTError]:
-		return Boolean(False, position.copy(), self.context), None
+		return makeBoolean(False, position, self.context), None
 
 class List(RuntimeValue):
+	__slots__ = ()
+
 	def __init__(self, expressions: list[RuntimeValue], position: StartEndPosition, context: Context) -> None:
 		self.position = position
 		self.context = context
 		self.value = expressions
-		self.continueLoop = False
-		self.breakLoop = False
 
 	def __repr__(self) -> str:
 		return f"LIST({self.value})"
 
+	# Every list method reads and writes items through these, so lists that
+	# store their items differently only have to replace them
+
+	def length(self) -> int:
+		return len(self.value)
+
+	def itemAt(self, index: int) -> RuntimeValue:
+		return self.value[index]
+
+	def setItemAt(self, index: int, value: RuntimeValue) -> None:
+		self.value[index] = value
+
+	def items(self) -> Iterator[RuntimeValue]:
+		return iter(self.value)
+
+	def appendItem(self, value: RuntimeValue) -> None:
+		self.value.append(value)
+
+	def popItem(self, index: int) -> RuntimeValue:
+		return self.value.pop(index)
+
+	def sliceItems(self, start: int, end: int) -> List:
+		return makeList(self.value[start:end], self.position, self.context)
+
+	def sortItems(self, keys: list[int | float | str]) -> None:
+		self.value = [self.value[index] for index in sorted(range(len(keys)), key=keys.__getitem__)]
+
 	def toString(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		listAsString = "["
+		itemsAsStrings = []
 
-		for expression in self.value:
-			expressionAsString, error = expression.toString(position.copy())
+		for expression in self.items():
+			expressionAsString, error = expression.toString(position)
 			if error:
 				return None, error
 
-			listAsString += expressionAsString.value + ", "
-
-		if len(self.value):
-			listAsString = listAsString[:-2] + "]"
-		else:
-			listAsString = "[]"
+			itemsAsStrings.append(expressionAsString.value)
 
-		return String(listAsString, position.copy(), self.context), None
+		return String(f"[{', '.join(itemsAsStrings)}]", position, self.context), None
 
 	def equals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, List):
-			if len(self.value) != len(other.value):
-				return Boolean(False, position.copy(), self.context), None
+			if self.length() != other.length():
+				return makeBoolean(False, position, self.context), None
+
+			for item1, item2 in zip(self.items(), other.items()):
+				equals, error = item1.equals(item2, position)
+				if error:
+					return None, error
 
-			for item1, item2 in zip(self.value, other.value):
-				if not item1.equals(item2, position.copy()):
-					return Boolean(False, position.copy(), self.context), None
+				if not equals.value:
+					return makeBoolean(False, position, self.context), None
 
-			return Boolean(True, position.copy(), self.context), None
+			return makeBoolean(True, position, self.context), None
 
 		return super().equals(other, position)
 
 	def notEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, List):
-			if len(self.value) != len(other.value):
-				return Boolean(True, position.copy(), self.context), None
-
-			for item1, item2 in zip(self.value, other.value):
-				if not item1.equals(item2, position.copy()):
-					return Boolean(True, position.copy(), self.context), None
+			equals, error = self.equals(other, position)
+			if error:
+				return None, error
 
-			return Boolean(False, position.copy(), self.context), None
+			return makeBoolean(not equals.value, position, self.context), None
 
 		return super().notEquals(other, position)
 
 	def getItem(self, item: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(item, Number):
-			length, error = self.getLength(position)
-			if error:
-				return None, error
+			if item.value + 1 > self.length() or item.value < 0:
+				return None, RangeError("list", position, self.context)
 
-			if item.value + 1 > length.value or item.value < 0:
-				return None, RangeError("list", position.copy(), self.context)
-
-			return self.value[item.value], None
+			return self.itemAt(item.value), None
 
 		return super().getItem(item, position)
 
 	def setItem(self, item: RuntimeValue, value: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(item, Number):
-			length, error = self.getLength(position)
-			if error:
-				return None, error
-
-			if item.value + 1 > length.value or item.value < 0:
-				return None, RangeError("list", position.copy(), self.context)
+			if item.value + 1 > self.length() or item.value < 0:
+				return None, RangeError("list", position, self.context)
 
-			self.value[item.value] = value
+			self.setItemAt(item.value, value)
 
-			return Null(position.copy(), self.context), None
+			return makeNull(position, self.context), None
 
 		return super().getItem(item, position)
 
 	def getLength(self, position: StartEndPosition) -> tuple[Number, RTError]:
-		return Number(len(self.value), position.copy(), self.context), None
+		return makeNumber(self.length(), position, self.context), None
 
 	def toBoolean(self, position: StartEndPosition) -> tuple[Boolean, RTError]:
-		return Boolean(False if len(self.value) == 0 else True, position.copy(), self.context), None
+		return makeBoolean(self.length() != 0, position, self.context), None
+
+	def iterate(self, position: StartEndPosition, context: Context) -> tuple[Iterator[RuntimeValue], RTError]:
+		return self.items(), None
 
 	def attribute_GET(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
 		def func(arguments: list[RuntimeValue], executeContext: Context):
 			if len(arguments) != 1:
-				return None, ArgumentError(1, len(arguments), "GET", position.copy(), executeContext)
+				return None, ArgumentError(1, len(arguments), "GET", position, executeContext)
 			elif not isinstance(arguments[0], Number) or "." in str(arguments[0].value):
-				return None, ValueError_(["number(integer)"], arguments[0].__class__.__name__, position.copy(), executeContext)
+				return None, ValueError_(["number(integer)"], arguments[0].__class__.__name__, position, executeContext)
 
-			if 0 <= arguments[0].value <= len(self.value) - 1:
-				return self.value[arguments[0].value], None
+			if 0 <= arguments[0].value <= self.length() - 1:
+				return self.itemAt(arguments[0].value), None
 			else:
-				return None, RangeError(arguments[0].__class__.__name__, position.copy(), executeContext)
+				return None, RangeError(arguments[0].__class__.__name__, position, executeContext)
 
-		return BuiltInFunction("GET", func, position.copy(), self.context), None
+		return BuiltInFunction("GET", func, position, self.context), None
 
 	def attribute_GET_FROM_LAST(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
 		def func(arguments: list[RuntimeValue], executeContext: Context):
 			if len(arguments) != 1:
-				return None, ArgumentError(1, len(arguments), "GET_FROM_LAST", position.copy(), executeContext)
+				return None, ArgumentError(1, len(arguments), "GET_FROM_LAST", position, executeContext)
 			elif not isinstance(arguments[0], Number) or "." in str(arguments[0].value):
-				return None, ValueError_(["number(integer)"], arguments[0].__class__.__name__, position.copy(), executeContext)
+				return None, ValueError_(["number(integer)"], arguments[0].__class__.__name__, position, executeContext)
 
-			if 0 <= arguments[0].value <= len(self.value) - 1:
-				return self.value[(arguments[0].value + 1) * -1], None
+			if 0 <= arguments[0].value <= self.length() - 1:
+				return self.itemAt((arguments[0].value + 1) * -1), None
 			else:
-				return None, RangeError(arguments[0].__class__.__name__, position.copy(), executeContext)
+				return None, RangeError(arguments[0].__class__.__name__, position, executeContext)
+
+		return BuiltInFunction("GET_FROM_LAST", func, position, self.context), None
+
+	# The Python numbers of a list that only holds Numbers, None otherwise
+	def numberValues(self) -> Sequence[int | float] | None:
+		numbers = [item.value for item in self.items() if type(item) is Number]
+
+		return numbers if len(numbers) == self.length() else None
+
+	def numbersOrError(self, position: StartEndPosition, context: Context) -> tuple[Sequence[int | float], RTError]:
+		numbers = self.numberValues()
+		if numbers is None:
+			other = next(item for item in self.items() if type(item) is not Number)
+			return None, ValueError_(["number"], other.__class__.__name__, position, context)
+
+		return numbers, None
+
+	# Whole list arithmetic and reductions, vector uses NumPy for them when it
+	# is installed. Elementwise operations take a number or a list of the same
+	# length and return a new list
+
+	def reduction(self, name: str, function: Callable[[Sequence[int | float]], int | float], position: StartEndPosition, allowEmpty: bool) -> tuple[BuiltInFunction, RTError]:
+		def func(arguments: list[RuntimeValue], executeContext: Context):
+			if len(arguments) != 0:
+				return None, ArgumentError(0, len(arguments), name, position, executeContext)
+
+			numbers, error = self.numbersOrError(position, executeContext)
+			if error:
+				return None, error
+
+			if not allowEmpty and not len(numbers):
+				return None, RTError(f"Unable to get {name} of an empty list", position, executeContext, "ValueError")
+
+			return makeNumber(function(numbers), position, self.context), None
+
+		return BuiltInFunction(name, func, position, self.context), None
+
+	def elementwise(self, name: str, operation: str, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		def func(arguments: list[RuntimeValue], executeContext: Context):
+			if len(arguments) != 1:
+				return None, ArgumentError(1, len(arguments), name, position, executeContext)
+
+			numbers, error = self.numbersOrError(position, executeContext)
+			if error:
+				return None, error
+
+			other = arguments[0]
+
+			if isinstance(other, Number):
+				otherNumbers = other.value
+				divisionByZero = other.value == 0
+			elif isinstance(other, List):
+				otherNumbers, error = other.numbersOrError(position, executeContext)
+				if error:
+					return None, error
+
+				if len(otherNumbers) != len(numbers):
+					return None, RTError(f"Unable to {name} lists of length {len(numbers)} and {len(otherNumbers)}", position, executeContext, "ValueError")
+
+				divisionByZero = 0 in otherNumbers
+			else:
+				return None, ValueError_(["number", "list"], other.__class__.__name__, position, executeContext)
+
+			if operation == "/" and divisionByZero:
+				return None, DivisionByZeroError(position, executeContext)
+
+			return makeNumberList(vector.elementwise(operation, numbers, otherNumbers), position, self.context), None
+
+		return BuiltInFunction(name, func, position, self.context), None
+
+	def attribute_SUM(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		return self.reduction("SUM", vector.sumOf, position, True)
+
+	def attribute_MIN(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		return self.reduction("MIN", vector.minOf, position, False)
+
+	def attribute_MAX(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		return self.reduction("MAX", vector.maxOf, position, False)
+
+	def attribute_MEAN(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		return self.reduction("MEAN", vector.meanOf, position, False)
+
+	def attribute_DOT(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		def func(arguments: list[RuntimeValue], executeContext: Context):
+			if len(arguments) != 1:
+				return None, ArgumentError(1, len(arguments), "DOT", position, executeContext)
+			elif not isinstance(arguments[0], List):
+				return None, ValueError_(["list"], arguments[0].__class__.__name__, position, executeContext)
+
+			numbers, error = self.numbersOrError(position, executeContext)
+			if error:
+				return None, error
+
+			otherNumbers, error = arguments[0].numbersOrError(position, executeContext)
+			if error:
+				return None, error
+
+			if len(otherNumbers) != len(numbers):
+				return None, RTError(f"Unable to DOT lists of length {len(numbers)} and {len(otherNumbers)}", position, executeContext, "ValueError")
+
+			return makeNumber(vector.dot(numbers, otherNumbers), position, self.context), None
+
+		return BuiltInFunction("DOT", func, position, self.context), None
+
+	def attribute_ADD(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		return self.elementwise("ADD", "+", position)
+
+	def attribute_SUBTRACT(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		return self.elementwise("SUBTRACT", "-", position)
+
+	def attribute_MULTIPLY(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		return self.elementwise("MULTIPLY", "*", position)
+
+	def attribute_DIVIDE(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		return self.elementwise("DIVIDE", "/", position)
+
+	# Methods that change the list in place or call a function for every item.
+	# Functions are called on the interpreter they were defined in
+
+	def attribute_APPEND(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		def func(arguments: list[RuntimeValue], executeContext: Context):
+			if len(arguments) != 1:
+				return None, ArgumentError(1, len(arguments), "APPEND", position, executeContext)
+
+			self.appendItem(arguments[0])
+
+			return makeNull(position, self.context), None
+
+		return BuiltInFunction("APPEND", func, position, self.context), None
+
+	def attribute_EXTEND(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		def func(arguments: list[RuntimeValue], executeContext: Context):
+			if len(arguments) != 1:
+				return None, ArgumentError(1, len(arguments), "EXTEND", position, executeContext)
+
+			items, error = arguments[0].iterate(position, executeContext)
+			if error:
+				return None, error
+
+			# Read every item first, a list can be extended with itself
+			items = list(items)
+
+			for item in items:
+				if isinstance(item, RTError):
+					return None, item
+
+				self.appendItem(item)
+
+			return makeNull(position, self.context), None
+
+		return BuiltInFunction("EXTEND", func, position, self.context), None
+
+	def attribute_POP(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		def func(arguments: list[RuntimeValue], executeContext: Context):
+			if len(arguments) > 1:
+				return None, ArgumentError(1, len(arguments), "POP", position, executeContext)
+			elif arguments and (not isinstance(arguments[0], Number) or "." in str(arguments[0].value)):
+				return None, ValueError_(["number(integer)"], arguments[0].__class__.__name__, position, executeContext)
+
+			index = arguments[0].value if arguments else self.length() - 1
+
+			if not 0 <= index <= self.length() - 1:
+				return None, RangeError("list", position, executeContext)
+
+			return self.popItem(index), None
+
+		return BuiltInFunction("POP", func, position, self.context), None
+
+	def attribute_SLICE(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		def func(arguments: list[RuntimeValue], executeContext: Context):
+			if not 1 <= len(arguments) <= 2:
+				return None, ArgumentError(2, len(arguments), "SLICE", position, executeContext)
+
+			for argument in arguments:
+				if not isinstance(argument, Number) or "." in str(argument.value):
+					return None, ValueError_(["number(integer)"], argument.__class__.__name__, position, executeContext)
+
+			start = arguments[0].value
+			end = arguments[1].value if len(arguments) == 2 else self.length()
+
+			if not 0 <= start <= end <= self.length():
+				return None, RangeError("list", position, executeContext)
+
+			return self.sliceItems(start, end), None
+
+		return BuiltInFunction("SLICE", func, position, self.context), None
+
+	def attribute_SORT(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		def func(arguments: list[RuntimeValue], executeContext: Context):
+			if len(arguments) > 1:
+				return None, ArgumentError(1, len(arguments), "SORT", position, executeContext)
+
+			keyFunction = arguments[0] if arguments else None
+			if keyFunction and not isinstance(keyFunction, CALLABLE):
+				return None, ValueError_(["function"], keyFunction.__class__.__name__, position, executeContext)
+
+			keys = []
+			for item in tuple(self.items()):
+				if keyFunction:
+					item, error = callBack(keyFunction, [item], position, executeContext)
+					if error:
+						return None, error
+
+				if not isinstance(item, (Number, String)):
+					return None, ValueError_(["number", "string"], item.__class__.__name__, position, executeContext)
 
-		return BuiltInFunction("GET_FROM_LAST", func, position.copy(), self.context), None
+				keys.append(item.value)
+
+			if len(keys) != self.length():
+				return None, RTError("Unable to SORT a list its key function changed", position, executeContext, "ValueError")
+
+			try:
+				self.sortItems(keys)
+			except TypeError:
+				return None, RTError("Unable to compare size between Number and String", position, executeContext, "ValueError")
+
+			return makeNull(position, self.context), None
+
+		return BuiltInFunction("SORT", func, position, self.context), None
+
+	def attribute_MAP(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		def func(arguments: list[RuntimeValue], executeContext: Context):
+			if len(arguments) != 1:
+				return None, ArgumentError(1, len(arguments), "MAP", position, executeContext)
+			elif not isinstance(arguments[0], CALLABLE):
+				return None, ValueError_(["function"], arguments[0].__class__.__name__, position, executeContext)
+
+			results = []
+			for item in tuple(self.items()):
+				result, error = callBack(arguments[0], [item], position, executeContext)
+				if error:
+					return None, error
+
+				results.append(result)
+
+			return makeList(results, position, self.context), None
+
+		return BuiltInFunction("MAP", func, position, self.context), None
+
+	def attribute_FILTER(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		def func(arguments: list[RuntimeValue], executeContext: Context):
+			if len(arguments) != 1:
+				return None, ArgumentError(1, len(arguments), "FILTER", position, executeContext)
+			elif not isinstance(arguments[0], CALLABLE):
+				return None, ValueError_(["function"], arguments[0].__class__.__name__, position, executeContext)
+
+			results = []
+			for item in tuple(self.items()):
+				keep, error = callBack(arguments[0], [item], position, executeContext)
+				if error:
+					return None, error
+
+				keep, error = keep.toBoolean(position)
+				if error:
+					return None, error
+
+				if keep.value:
+					results.append(item)
+
+			return makeList(results, position, self.context), None
+
+		return BuiltInFunction("FILTER", func, position, self.context), None
+
+	def attribute_REDUCE(self, position: StartEndPosition) -> tuple[BuiltInFunction, RTError]:
+		def func(arguments: list[RuntimeValue], executeContext: Context):
+			if not 1 <= len(arguments) <= 2:
+				return None, ArgumentError(2, len(arguments), "REDUCE", position, executeContext)
+			elif not isinstance(arguments[0], CALLABLE):
+				return None, ValueError_(["function"], arguments[0].__class__.__name__, position, executeContext)
+
+			items = iter(tuple(self.items()))
+
+			if len(arguments) == 2:
+				result = arguments[1]
+			elif self.length():
+				result = next(items)
+			else:
+				return None, RTError("Unable to REDUCE an empty list without a start value", position, executeContext, "ValueError")
+
+			for item in items:
+				result, error = callBack(arguments[0], [result, item], position, executeContext)
+				if error:
+					return None, error
+
+			return result, None
+
+		return BuiltInFunction("REDUCE", func, position, self.context), None
+
+# A list of only integers or only floats, stored as the numbers themselves in
+# an array('q') or array('d') instead of a Number for every item. Numbers are
+# made when an item is read. Storing anything but a number of the same kind
+# turns it into a list of runtime values, like any other list, for good
+
+INTEGER_MIN = -2 ** 63
+INTEGER_MAX = 2 ** 63 - 1
+
+class NumberList(List):
+	__slots__ = ("numbers", "expressions")
+
+	def __init__(self, numbers: array | range, position: StartEndPosition, context: Context) -> None:
+		self.numbers = numbers
+		self.expressions = None
+		self.position = position
+		self.context = context
+
+	@property
+	def value(self) -> list[RuntimeValue]:
+		if self.expressions is None:
+			self.expressions = list(self.items())
+			self.numbers = None
+
+		return self.expressions
+
+	@value.setter
+	def value(self, expressions: list[RuntimeValue]) -> None:
+		self.expressions = expressions
+		self.numbers = None
+
+	def __repr__(self) -> str:
+		if self.expressions is None:
+			return f"LIST([{', '.join(f'NUMBER({number})' for number in self.numbers)}])"
+
+		return super().__repr__()
+
+	def length(self) -> int:
+		if self.expressions is None:
+			return len(self.numbers)
+
+		return len(self.expressions)
+
+	def itemAt(self, index: int) -> RuntimeValue:
+		if self.expressions is None:
+			return makeNumber(self.numbers[index], self.position, self.context)
+
+		return self.expressions[index]
+
+	# Whether value can be stored in the array, a range is made an array first
+	def fits(self, value: RuntimeValue) -> bool:
+		if self.expressions is not None or type(value) is not Number:
+			return False
+
+		if type(self.numbers) is range:
+			self.numbers = array("q", self.numbers)
+
+		if self.numbers.typecode == "d":
+			return type(value.value) is float
+
+		return type(value.value) is int and INTEGER_MIN <= value.value <= INTEGER_MAX
+
+	def setItemAt(self, index: int, value: RuntimeValue) -> None:
+		if self.fits(value):
+			self.numbers[index] = value.value
+		else:
+			self.value[index] = value
+
+	def appendItem(self, value: RuntimeValue) -> None:
+		if self.fits(value):
+			self.numbers.append(value.value)
+		else:
+			self.value.append(value)
+
+	def popItem(self, index: int) -> RuntimeValue:
+		if self.expressions is not None:
+			return self.expressions.pop(index)
+
+		if type(self.numbers) is range:
+			self.numbers = array("q", self.numbers)
+
+		return makeNumber(self.numbers.pop(index), self.position, self.context)
+
+	def sliceItems(self, start: int, end: int) -> List:
+		if self.expressions is not None:
+			return super().sliceItems(start, end)
+
+		return NumberList(self.numbers[start:end], self.position, self.context)
+
+	def sortItems(self, keys: list[int | float | str]) -> None:
+		if self.expressions is not None:
+			return super().sortItems(keys)
+
+		typecode = "q" if type(self.numbers) is range else self.numbers.typecode
+		self.numbers = array(typecode, [self.numbers[index] for index in sorted(range(len(keys)), key=keys.__getitem__)])
+
+	def items(self) -> Iterator[RuntimeValue]:
+		if self.expressions is not None:
+			return iter(self.expressions)
+
+		position = self.position
+		context = self.context
+
+		return (makeNumber(number, position, context) for number in self.numbers)
+
+	def numberValues(self) -> Sequence[int | float] | None:
+		if self.expressions is None:
+			return self.numbers
+
+		return super().numberValues()
+
+	def toString(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
+		if self.expressions is None:
+			return String(f"[{', '.join(map(str, self.numbers))}]", position, self.context), None
+
+		return super().toString(position)
+
+	def equals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
+		if isinstance(other, NumberList) and self.expressions is None and other.expressions is None:
+			equal = len(self.numbers) == len(other.numbers) and all(map(operator.eq, self.numbers, other.numbers))
+			return makeBoolean(equal, position, self.context), None
+
+		return super().equals(other, position)
+
+# [start->end->step] without making a Number for every item, the numbers stay a
+# Python range until one of them is changed
+
+class Range(NumberList):
+	__slots__ = ()
+
+	def __repr__(self) -> str:
+		if type(self.numbers) is range:
+			return f"RANGE({self.numbers.start}, {self.numbers.stop}, {self.numbers.step})"
+
+		return super().__repr__()
+
+# Lists of at least this many numbers of one kind are stored as a NumberList,
+# shorter ones are read too often for boxing every item to pay off
+
+NUMBER_LIST_MIN_LENGTH = 16
+
+def makeList(expressions: list[RuntimeValue], position: StartEndPosition, context: Context) -> List:
+	if len(expressions) < NUMBER_LIST_MIN_LENGTH:
+		return List(expressions, position, context)
+
+	numbers = [expression.value for expression in expressions if type(expression) is Number]
+
+	if len(numbers) == len(expressions):
+		packed = packNumbers(numbers)
+		if packed is not None:
+			return NumberList(packed, position, context)
+
+	return List(expressions, position, context)
+
+# The list for the Python numbers of a result
+def makeNumberList(numbers: Sequence[int | float], position: StartEndPosition, context: Context) -> List:
+	if not isinstance(numbers, array) and len(numbers) >= NUMBER_LIST_MIN_LENGTH:
+		packed = packNumbers(numbers)
+		if packed is not None:
+			numbers = packed
+
+	if isinstance(numbers, array):
+		return NumberList(numbers, position, context)
+
+	return List([makeNumber(number, position, context) for number in numbers], position, context)
+
+def packNumbers(numbers: Sequence[int | float]) -> array | None:
+	kind = type(numbers[0])
+	if not all(type(number) is kind for number in numbers):
+		return None
+
+	try:
+		return array("q" if kind is int else "d", numbers)
+	except OverflowError:
+		return None
 
 class Dictionary(RuntimeValue):
+	__slots__ = ()
+
 	def __init__(self, expressions: dict[RuntimeValue, RuntimeValue], position: StartEndPosition, context: Context) -> None:
 		self.position = position
 		self.context = context
 		self.value = expressions
-		self.continueLoop = False
-		self.breakLoop = False
 
 	def __repr__(self) -> str:
 		return f"DICTIONARY({self.value})"
 
 	def toString(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		dictionaryAsString = "{"
+		itemsAsStrings = []
 
 		for key, value in self.value.items():
-			keyAsString, error = key.toString(position.copy())
+			keyAsString, error = key.toString(position)
 			if error:
 				return None, error
 
-			valueAsString, error = value.toString(position.copy())
+			valueAsString, error = value.toString(position)
 			if error:
 				return None, error
 
-			dictionaryAsString += f"{keyAsString.value}: {valueAsString.value}, "
+			itemsAsStrings.append(f"{keyAsString.value}: {valueAsString.value}")
 
-		if len(self.value):
-			dictionaryAsString = dictionaryAsString[:-2] + "}"
-		else:
-			dictionaryAsString = "{}"
+		return String(f"{{{', '.join(itemsAsStrings)}}}", position, self.context), None
 
-		return String(dictionaryAsString, position.copy(), self.context), None
+	# Keys are looked up in the other dictionary, the order they were added in
+	# does not matter
 
 	def equals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Dictionary):
 			if len(self.value) != len(other.value):
-				return Boolean(False, position.copy(), self.context), None
+				return makeBoolean(False, position, self.context), None
+
+			for key, value in self.value.items():
+				otherKey, error = other.findKey(key, position)
+				if error:
+					return None, error
+
+				if otherKey is None:
+					return makeBoolean(False, position, self.context), None
+
+				otherValue = other.value[otherKey]
 
-			for item1, item2 in zip(self.value.keys(), other.value.keys()):
-				if not item1.equals(item2, position.copy()):
-					return Boolean(False, position.copy(), self.context), None
+				equals, error = value.equals(otherValue, position)
+				if error:
+					return None, error
 
-				if not self.value[item1].equals(other.value[item2], position.copy()):
-					return Boolean(False, position.copy(), self.context), None
+				if not equals.value:
+					return makeBoolean(False, position, self.context), None
 
-			return Boolean(True, position.copy(), self.context), None
+			return makeBoolean(True, position, self.context), None
 
 		return super().equals(other, position)
 
 	def notEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Dictionary):
-			if len(self.value) != len(other.value):
-				return Boolean(True, position.copy(), self.context), None
+			equals, error = self.equals(other, position)
+			if error:
+				return None, error
+
+			return makeBoolean(not equals.value, position, self.context), None
 
-			for item1, item2 in zip(self.value.keys(), other.value.keys()):
-				if not item1.equals(item2, position.copy(), position.copy()):
-					return Boolean(True, position.copy(), self.context), None
+		return super().notEquals(other, position)
 
-				if not self.value[item1].equals(other.value[item2], position.copy()):
-					return Boolean(True, position.copy(), self.context), None
+	# Numbers, strings, booleans and null are found by their hash, other keys
+	# only equal themselves by identity so they are compared one by one. A
+	# number without a key of its own finds a boolean key the way Number.equals
+	# compares them, 0 finds FALSE and any other number TRUE
 
-			return Boolean(False, position.copy(), self.context), None
+	def findKey(self, item: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue | None, RTError]:
+		if isinstance(item, HASHABLE_KEYS):
+			if item in self.value:
+				return item, None
 
-		return super().equals(other, position)
+			if type(item) is Number:
+				key = makeBoolean(item.value != 0, position, self.context)
+				if key in self.value:
+					return key, None
 
-	def getItem(self, item: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		for key in self.value.keys():
-			equals, error = item.equals(key, position.copy())
+			return None, None
+
+		for key in self.value:
+			equals, error = item.equals(key, position)
 			if error:
 				return None, error
 
 			if equals.value:
-				return self.value[key], None
+				return key, None
+
+		return None, None
+
+	def getItem(self, item: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
+		key, error = self.findKey(item, position)
+		if error:
+			return None, error
+
+		if key is None:
+			return None, KeyError_(item.value,  position, self.context)
 
-		return None, KeyError_(item.value,  position.copy(), self.context)
+		return self.value[key], None
 
 	def setItem(self, item: RuntimeValue, value: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		self.value[item] = value
+		key, error = self.findKey(item, position)
+		if error:
+			return None, error
+
+		self.value[item if key is None else key] = value
 
-		return Null(position.copy(), self.context), None
+		return makeNull(position, self.context), None
 
 	def getLength(self, position: StartEndPosition) -> tuple[Number, RTError]:
-		return Number(len(self.value), position.copy(), self.context), None
+		return makeNumber(len(self.value), position, self.context), None
 
 	def toBoolean(self, position: StartEndPosition) -> tuple[Boolean, RTError]:
-		return Boolean(False if len(self.value) == 0 else True, position.copy(), self.context), None
+		return makeBoolean(False if len(self.value) == 0 else True, position, self.context), None
+
+	# Loops over the keys the dictionary had when the loop started, so the loop
+	# body can add and remove keys
+	def iterate(self, position: StartEndPosition, context: Context) -> tuple[Iterator[RuntimeValue], RTError]:
+		return iter(tuple(self.value)), None
+
+HASHABLE_KEYS = (Number, String, Boolean, Null)
 
 class BuiltInFunction(RuntimeValue):
+	__slots__ = ("name", "executeFunction")
+
 	def __init__(self, name: str, executeFunction: Callable[[list[RuntimeValue], Context], tuple[RuntimeValue, RTError]], position: StartEndPosition, context: Context) -> None:
 		self.name = name
 		self.position = position
 		self.context = context
 		self.executeFunction = executeFunction
 		self.value = "BUILT_IN_FUNCTION"
-		self.continueLoop = False
-		self.breakLoop = False
 
-	def execute(self, arguments: list[RuntimeValue], position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		executeContext = Context(self.name, self.context)
+	def execute(self, arguments: list[RuntimeValue], position: StartEndPosition, context: Context = None) -> tuple[RuntimeValue, RTError]:
+		if not context:
+			context = self.context
+
+		executeContext = Context(self.name, context)
 
 		returnValue, error = self.executeFunction(arguments, executeContext)
 		if error:
-			error.position = position.copy()
-			error.context = self.context
+			error.position = position
+			error.context = context
 			return None, error
 
-		returnValue.context = self.context
-		returnValue.position = position.copy()
-		
+		if returnValue.context is executeContext:
+			returnValue.context = context
+
 		return returnValue, None
 
 	def __repr__(self) -> str:
@@ -664,40 +1258,41 @@ class BuiltInFunction(RuntimeValue):
 
 	def equals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, BuiltInFunction):
-			return Boolean(self == other, position.copy())
+			return makeBoolean(self == other, position, self.context), None
 
 		return super().equals(other, position)
 
 	def notEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, BuiltInFunction):
-			return Boolean(self != other, position.copy())
+			return makeBoolean(self != other, position, self.context), None
 
 		return super().notEquals(other, position)
 
 	def toString(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return String(f"{self.name}()", position.copy(), self.context), None
+		return String(f"{self.name}()", position, self.context), None
 
 class PythonFunction(RuntimeValue):
-	def __init__(self, name: str, executeFunction: Callable[[list[RuntimeValue], Context, RTError], tuple[RuntimeValue, RTError]], position: StartEndPosition, context: Context, path: str, parameters: list[int, int]) -> None:
+	__slots__ = ("name", "executeFunction", "path", "parameters", "convert")
+
+	def __init__(self, name: str, executeFunction: Callable[[list[RuntimeValue], Context, RTError], tuple[RuntimeValue, RTError]], position: StartEndPosition, context: Context, path: str, parameters: list[int, int], convert: Callable[[any], tuple[RuntimeValue, RTError]]) -> None:
 		self.name = name
 		self.position = position
 		self.context = context
 		self.executeFunction = executeFunction
 		self.value = "BUILT_IN_FUNCTION"
-		self.continueLoop = False
-		self.breakLoop = False
 		self.path = path
 		self.parameters = parameters
+		self.convert = convert
 
 	def execute(self, arguments: list[RuntimeValue], position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		executeContext = Context(self.name, self.context)
 
 		if len(arguments) < self.parameters[0] or len(arguments) > self.parameters[1]:
-			return None, RTError(f"Function {self.name} expected {str(self.parameters[0])} to {str(self.parameters[1])} arguments, not {str(len(arguments))}", position.copy(), self.context, "ArgumentError")
+			return None, RTError(f"Function {self.name} expected {str(self.parameters[0])} to {str(self.parameters[1])} arguments, not {str(len(arguments))}", position, self.context, "ArgumentError")
 
 		returnValue, error = self.executeFunction(arguments, executeContext, RTError)
 		if error:
-			error.position = position.copy()
+			error.position = position
 			error.context = self.context
 			return None, error
 		
@@ -708,45 +1303,137 @@ class PythonFunction(RuntimeValue):
 
 	def equals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, PythonFunction):
-			return Boolean(self == other, position.copy())
+			return makeBoolean(self == other, position, self.context), None
 
 		return super().equals(other, position)
 
 	def notEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, PythonFunction):
-			return Boolean(self != other, position.copy())
+			return makeBoolean(self != other, position, self.context), None
 
 		return super().notEquals(other, position)
 
 	def toString(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return String(f"{self.name}()", position.copy(), self.context), None
+		return String(f"{self.name}()", position, self.context), None
+
+# A generator, or any other iterator, from a python module. FOR loops convert
+# the items while the generator makes them, so it can only be looped over once.
+# An item that can not be converted is yielded as its error, which ends the loop
+
+class PythonGenerator(RuntimeValue):
+	__slots__ = ("convert",)
+
+	def __init__(self, items: Iterator[any], convert: Callable[[any], tuple[RuntimeValue, RTError]], position: StartEndPosition, context: Context) -> None:
+		self.value = items
+		self.convert = convert
+		self.position = position
+		self.context = context
+
+	def __repr__(self) -> str:
+		return "PYTHON_GENERATOR()"
+
+	def iterate(self, position: StartEndPosition, context: Context) -> tuple[Iterator[RuntimeValue | RTError], RTError]:
+		return self.items(), None
+
+	def items(self) -> Iterator[RuntimeValue | RTError]:
+		convert = self.convert
+
+		for item in self.value:
+			convertedItem, error = convert(item)
+			if error:
+				yield error
+				return
+
+			yield convertedItem
+
+	def toString(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
+		return String("<generator>", position, self.context), None
+
+	def toBoolean(self, position: StartEndPosition) -> tuple[Boolean, RTError]:
+		return makeBoolean(True, position, self.context), None
 
 class Function(RuntimeValue):
-	def __init__(self, name: str, arguments: list[str], body: list[ExpressionNode], position: StartEndPosition, anonymous: bool, context: Context) -> None:
+	__slots__ = ("name", "arguments", "body", "layout", "anonymous", "code", "compiledBody", "interpreter")
+
+	def __init__(self, name: str, arguments: list[str], body: list[ExpressionNode], position: StartEndPosition, anonymous: bool, context: Context, layout: dict[str, int] = None, interpreter: Interpreter = None) -> None:
 		self.name = name
 		self.arguments = arguments
 		self.body = body
+		self.layout = layout
 		self.position = position
 		self.context = context
 		self.value = "FUNCTION"
 		self.anonymous = anonymous
-		self.continueLoop = False
-		self.breakLoop = False
+		self.code = None
+		self.compiledBody = None
+		self.interpreter = interpreter
 
 	def __repr__(self) -> str:
 		return f"FUNCTION({self.name})"
 
+	# Calls from built in functions, like the function given to MAP, run on the
+	# interpreter the function was defined in
+	def execute(self, arguments: list[RuntimeValue], position: StartEndPosition, context: Context = None) -> tuple[RuntimeValue, RTError]:
+		return self.interpreter.callFunction(self, arguments, position, context or self.context)
+
 	def equals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Function):
-			return Boolean(self == other, position.copy())
+			return makeBoolean(self == other, position, self.context), None
 
 		return super().equals(other, position)
 
 	def notEquals(self, other: RuntimeValue, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
 		if isinstance(other, Function):
-			return Boolean(self != other, position.copy())
+			return makeBoolean(self != other, position, self.context), None
 
 		return super().notEquals(other, position)
 
 	def toString(self, position: StartEndPosition) -> tuple[RuntimeValue, RTError]:
-		return String(f"{self.name}()", position.copy(), self.context), None
\ No newline at end of file
+		return String(f"{self.name}()", position, self.context), None
+
+########################################
+#	SHARED VALUES
+########################################
+
+# TRUE, FALSE, NULL and small integers are shared instances instead of being
+# allocated for every result. They have no context, errors they raise are given
+# the context of the file or function they were raised in by the interpreter
+
+SMALL_INT_MIN = -128
+SMALL_INT_MAX = 1024
+
+sharedFile = File("<SHARED_VALUE>", "")
+sharedPosition = StartEndPosition(sharedFile, -1)
+
+TRUE = Boolean(True, sharedPosition, None)
+FALSE = Boolean(False, sharedPosition, None)
+NULL = Null(sharedPosition, None)
+SMALL_INTS = [Number(value, sharedPosition, None) for value in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
+
+def makeNumber(value: int | float, position: StartEndPosition, context: Context) -> Number:
+	if value.__class__ is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+		return SMALL_INTS[value - SMALL_INT_MIN]
+
+	return Number(value, position, context)
+
+def makeBoolean(value: bool, position: StartEndPosition, context: Context) -> Boolean:
+	return TRUE if value else FALSE
+
+def makeNull(position: StartEndPosition, context: Context) -> Null:
+	return NULL
+
+# Values built in functions can call back into, like the function given to MAP
+CALLABLE = (Function, BuiltInFunction, PythonFunction)
+
+# Calls one of CALLABLE for a built in function. Python functions return python
+# values, they are converted like the result of calling them from the program
+
+def callBack(func: Function | BuiltInFunction | PythonFunction, arguments: list[RuntimeValue], position: StartEndPosition, context: Context) -> tuple[RuntimeValue, RTError]:
+	if type(func) is not PythonFunction:
+		return func.execute(arguments, position, context)
+
+	value, error = func.execute(arguments, position)
+	if error:
+		return None, error
+
+	return func.convert(value)
@@ -9,86 +9,115 @@ from .utils import StartEndPosition
 #	PARSER
 ########################################
 
+# Large scripts create a lot of nodes, every node uses __slots__ instead of a
+# per instance __dict__
+
 class StatementNode:
+	__slots__ = ()
+
 	def __init__(self) -> None:
 		pass
 
 class ExpressionNode(StatementNode):
+	__slots__ = ("position", "token")
+
 	def __init__(self) -> None:
 		self.position: StartEndPosition = None
 		self.token: Token = None
 
 class BinaryOperationNode:
+	__slots__ = ("left", "operationToken", "right", "position")
+
 	def __init__(self, left: ExpressionNode, operationToken: Token, right: ExpressionNode) -> None:
 		self.left = left
 		self.operationToken = operationToken
 		self.right = right
 
-		self.position = StartEndPosition(self.left.position.file.copy(), self.left.position.start.copy(), self.right.position.end.copy())
+		self.position = self.left.position.until(self.right.position)
 
 	def __repr__(self) -> str:
 		return f"({str(self.left)} {str(self.operationToken.type.name)} {str(self.right)})"
 	
 class UnaryOperationNode:
+	__slots__ = ("operationToken", "expression", "position")
+
 	def __init__(self, operationToken: Token, expression: ExpressionNode) -> None:
 		self.operationToken = operationToken
 		self.expression = expression
 
-		self.position = StartEndPosition(self.operationToken.position.file, self.operationToken.position.start.copy(), self.expression.position.end.copy())
+		self.position = self.operationToken.position.until(self.expression.position)
 
 	def __repr__(self) -> str:
 		return f"({str(self.operationToken.type.name)} {str(self.expression)})"
 	
 class NumberNode:
+	__slots__ = ("token", "position")
+
 	def __init__(self, token: Token) -> None:
 		self.token = token
 
-		self.position = token.position.copy()
+		self.position = token.position
 
 	def __repr__(self) -> str:
 		return f"{str(self.token.value)}"
 
 class StringNode:
+	__slots__ = ("token", "position")
+
 	def __init__(self, token: Token) -> None:
 		self.token = token
 
-		self.position = token.position.copy()
+		self.position = token.position
 
 	def __repr__(self) -> str:
 		return f"{str(self.token.value)}"
 
 class VariableAccessNode:
+	__slots__ = ("token", "depth", "slot", "position")
+
 	def __init__(self, token: Token) -> None:
 		self.token = token
+		self.depth = 0
+		self.slot: int | None = None
 
-		self.position = token.position.copy()
+		self.position = token.position
 
 	def __repr__(self) -> str:
 		return f"VARIABLE_ACCESS_NODE({str(self.token.value)})"
 		
 class VariableAssignNode:
+	__slots__ = ("token", "valueNode", "type", "depth", "slot", "position")
+
 	def __init__(self, token: Token, valueNode: ExpressionNode, type_: str) -> None:
 		self.token = token
 		self.valueNode = valueNode
 		self.type = type_
+		self.depth = 0
+		self.slot: int | None = None
 
-		self.position = self.token.position.start.createStartEndPosition(valueNode.position.end)
+		self.position = self.token.position.until(valueNode.position)
 
 	def __repr__(self) -> str:
 		return f"VARIABLE_ASSIGN_NODE({str(self.token.value)}, {self.type})"
 
 class VariableDeclareNode:
+	__slots__ = ("token", "valueNode", "declareToken", "depth", "slot", "position")
+
 	def __init__(self, token: Token, valueNode: ExpressionNode, declareToken: Token) -> None:
 		self.token = token
 		self.valueNode = valueNode
 		self.declareToken = declareToken
+		self.depth = 0
+		self.slot: int | None = None
 
-		self.position = self.declareToken.position.start.createStartEndPosition(valueNode.position.end)
+		self.position = self.declareToken.position.until(valueNode.position)
 
 	def __repr__(self) -> str:
 		return f"VARIABLE_DECLARE_NODE({str(self.token.value)})"
 
 class WhileNode:
+	__slots__ = ("position", "condition", "body")
+
 	def __init__(self, position: StartEndPosition, condition: ExpressionNode, body: list[ExpressionNode]) -> None:
 		self.position = position
 		self.condition = condition
@@ -98,16 +127,21 @@ class WhileNode:
 		return "WHILE_NODE()"
 
 class ForNode:
+	__slots__ = ("position", "body", "item", "iterator", "slot")
+
 	def __init__(self, position: StartEndPosition, item: Token, iterator: ExpressionNode, body: list[ExpressionNode]) -> None:
 		self.position = position
 		self.body = body
 		self.item = item
 		self.iterator = iterator
+		self.slot: int | None = None
 
 	def __repr__(self) -> str:
 		return f"FOR_NODE({self.item}, {self.iterator})"
 
 class FunctionCallNode:
+	__slots__ = ("position", "func", "arguments")
+
 	def __init__(self, position: StartEndPosition, func: VariableAccessNode, arguments: list[ExpressionNode]) -> None:
 		self.position = position
 		self.func = func
@@ -117,6 +151,8 @@ class FunctionCallNode:
 		return f"FUNCTION_CALL_NODE({str(self.func)}, {str(self.arguments)})"
 
 class ListNode:
+	__slots__ = ("position", "expressions")
+
 	def __init__(self, position: StartEndPosition, expressions: list[ExpressionNode]) -> None:
 		self.position = position
 		self.expressions = expressions
@@ -125,6 +161,8 @@ class ListNode:
 		return f"LIST_NODE({str(self.expressions)})"
 
 class DictionaryNode:
+	__slots__ = ("position", "expressions")
+
 	def __init__(self, position: StartEndPosition, expressions: dict[ExpressionNode, ExpressionNode]) -> None:
 		self.position = position
 		self.expressions = expressions
@@ -133,6 +171,8 @@ class DictionaryNode:
 		return f"DICTIONARY_NODE({str(self.expressions)})"
 
 class GetItemNode:
+	__slots__ = ("position", "variable", "item")
+
 	def __init__(self, position: StartEndPosition, variable: ExpressionNode, item: VariableAccessNode) -> None:
 		self.position = position
 		self.variable = variable
@@ -142,6 +182,8 @@ class GetItemNode:
 		return f"GET_ITEM_NODE({str(self.variable)}, {str(self.item)})"
 
 class GetAttributeNode:
+	__slots__ = ("position", "variable", "item")
+
 	def __init__(self, position: StartEndPosition, variable: ExpressionNode, item: VariableAccessNode) -> None:
 		self.position = position
 		self.variable = variable
@@ -151,6 +193,8 @@ class GetAttributeNode:
 		return f"GET_ATTRIBUTE_NODE({str(self.variable)}, {str(self.item)})"
 
 class SetItemNode:
+	__slots__ = ("position", "variable", "item", "value")
+
 	def __init__(self, position: StartEndPosition, variable: ExpressionNode, item: VariableAccessNode, value: ExpressionNode) -> None:
 		self.position = position
 		self.variable = variable
@@ -161,17 +205,22 @@ class SetItemNode:
 		return f"SET_ITEM_NODE({str(self.variable)}, {str(self.item)}, {str(self.value)})"
 
 class FunctionDefineNode:
+	__slots__ = ("position", "variable", "arguments", "body", "anonymous", "layout")
+
 	def __init__(self, position: StartEndPosition, variable: str, arguments: list[ExpressionNode], body: list[ExpressionNode], anonymous: bool) -> None:
 		self.position = position
 		self.variable = variable
 		self.arguments = arguments
 		self.body = body
 		self.anonymous = anonymous
+		self.layout: dict[str, int] | None = None
 
 	def __repr__(self) -> str:
 		return f"FUNCTION_DEFINE_NODE({str(self.variable)}, {str(self.arguments)})"
 		
 class ReturnNode:
+	__slots__ = ("position", "value")
+
 	def __init__(self, position: StartEndPosition, value: ExpressionNode) -> None:
 		self.position = position
 		self.value = value
@@ -180,6 +229,8 @@ class ReturnNode:
 		return f"RETURN_NODE({str(self.value)})"
 
 class ContinueNode:
+	__slots__ = ("position",)
+
 	def __init__(self, position: StartEndPosition) -> None:
 		self.position = position
 
@@ -187,6 +238,8 @@ class ContinueNode:
 		return "CONTINUE_NODE()"
 
 class BreakNode:
+	__slots__ = ("position",)
+
 	def __init__(self, position: StartEndPosition) -> None:
 		self.position = position
 
@@ -194,6 +247,8 @@ class BreakNode:
 		return "BREAK_NODE()"
 
 class IfNode:
+	__slots__ = ("condition", "body", "position")
+
 	def __init__(self, position: StartEndPosition, condition: ExpressionNode, body: list[ExpressionNode]) -> None:
 		self.condition = condition
 		self.body = body
@@ -203,6 +258,8 @@ class IfNode:
 		return f"IF_NODE({str(self.condition)})"
 
 class IfContainerNode:
+	__slots__ = ("position", "ifNode", "elseIfNodes", "elseNode")
+
 	def __init__(self, position: StartEndPosition, ifNode: IfNode, elseIfNodes: list[IfNode], elseNode: IfNode) -> None:
 		self.position = position
 		self.ifNode = ifNode
@@ -213,6 +270,8 @@ class IfContainerNode:
 		return f"IF_CONTAINER_NODE({str(self.ifNode)}, {str(self.elseIfNodes)}, {str(self.elseNode)})"
 
 class ImportNode:
+	__slots__ = ("position", "moduleName", "asName")
+
 	def __init__(self, position: StartEndPosition, moduleName: ExpressionNode, asName: str) -> None:
 		self.position = position
 		self.moduleName = moduleName
@@ -222,6 +281,8 @@ class ImportNode:
 		return f"IMPORT_NODE({self.moduleName}, {self.asName})"
 
 class RangeNode:
+	__slots__ = ("position", "start", "end", "step")
+
 	def __init__(self, position: StartEndPosition, start: ExpressionNode, end: ExpressionNode, step: ExpressionNode) -> None:
 		self.position = position
 		self.start = start
@@ -229,4 +290,43 @@ class RangeNode:
 		self.step = step
 
 	def __repr__(self) -> str:
-		return f"RANGE_NODE({self.start}->{self.end}->{self.step})"
\ No newline at end of file
+		return f"RANGE_NODE({self.start}->{self.end}->{self.step})"
+########################################
+#	OPERATIONS
+########################################
+
+# Operators, calls, lists, dictionaries, ranges and item access evaluate all of
+# their operands first and then combine them. flattenOperations lists such an
+# expression in evaluation order, the operands of every one of them come right
+# before it. The tree is walked with an explicit stack so long chains and deep
+# nesting never hit the recursion limit
+
+OPERANDS = {
+	BinaryOperationNode: lambda node: (node.left, node.right),
+	UnaryOperationNode: lambda node: (node.expression,),
+	FunctionCallNode: lambda node: (node.func, *node.arguments),
+	ListNode: lambda node: node.expressions,
+	DictionaryNode: lambda node: [expression for item in node.expressions.items() for expression in item],
+	GetItemNode: lambda node: (node.variable, node.item),
+	GetAttributeNode: lambda node: (node.variable, node.item),
+	SetItemNode: lambda node: (node.variable, node.item, node.value),
+	RangeNode: lambda node: (node.start, node.end, node.step)
+}
+
+OPERATION_NODES = frozenset(OPERANDS)
+
+def flattenOperations(node: ExpressionNode) -> list[ExpressionNode]:
+	operations = []
+	stack = [node]
+
+	while stack:
+		node = stack.pop()
+		operations.append(node)
+
+		operands = OPERANDS.get(type(node))
+		if operands is not None:
+			stack.extend(operands(node))
+
+	operations.reverse()
+
+	return operations
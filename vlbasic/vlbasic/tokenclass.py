@@ -2,7 +2,9 @@
 #	IMPORTS
 ########################################
 
+from __future__ import annotations
 from .utils import StartEndPosition
+from .keywords import Keywords
 from enum import Enum, auto
 
 ########################################
@@ -60,16 +62,19 @@ class TokenTypes(Enum):
 ########################################
 
 class Token:
-	def __init__(self, type_: TokenTypes, position: StartEndPosition, value = None) -> None:
+	__slots__ = ("type", "value", "position", "keyword")
+
+	def __init__(self, type_: TokenTypes, position: StartEndPosition, value = None, keyword: Keywords | None = None) -> None:
 		self.type = type_
 		self.value = value
 		self.position = position
+		self.keyword = keyword
 		
 	def __repr__(self) -> str:
 		return f"{self.type.name}({str(self.value or '')})"
 
-	def isKeyword(self, keywordName: str) -> bool:
-		return self.type == TokenTypes.KEYWORD and self.value == keywordName
+	def isKeyword(self, keyword: Keywords) -> bool:
+		return self.keyword is keyword
 
-	def isOneOfKeywords(self, keywordNames: list[str]) -> bool:
-		return self.type == TokenTypes.KEYWORD and self.value in keywordNames
\ No newline at end of file
+	def isOneOfKeywords(self, keywords: tuple[Keywords, ...]) -> bool:
+		return self.keyword in keywords
\ No newline at end of file
@@ -2,50 +2,40 @@
 #	IMPORTS
 ########################################
 
-from typing import Optional
-from .utils import File, Position, NUMBERS, LETTERS, StartEndPosition
+import mmap
+import re
+from sys import intern
+from typing import Optional, Iterator
+from .utils import File, NUMBERS, LETTERS, StartEndPosition
 from .tokenclass import Token, TokenTypes
 from .error import Error, IllegalCharacterError, ExpectedCharacterError
 from .keywords import KEYWORDS
 
 ########################################
-#	TOKENIZER
+#	CHARACTER TOKENIZER
 ########################################
 
-class Tokenizer:
+# Scans the file one character at a time, Tokenizer below is the faster scanner
+# used by default and falls back to this one for the uncommon cases. Only works
+# on str sources
+
+class CharacterTokenizer:
 	def __init__(self, filename: str, fileText: str) -> None:
-		self.file = File(filename, fileText.replace("\t", "    "))
-		self.position = Position(-1, 1, -1, self.file)
+		self.file = File(filename, fileText)
+		self.index = -1
 		self.currentCharacter = None
 
-		if not fileText:
-			self.file.text = " "
-
 		self.advance()
 
-	def getCharacterAtIndex(self, index: Optional[str] = None) -> str:
-		if self.file.length - 1 < self.position.index:
-			return None
-		
-		if index is not None:
-			return self.file.text[index]
-		return self.file.text[self.position.index]
-
-	def updateCurrentCharacter(self) -> None:
-		if self.file.length > self.position.index:
-			self.currentCharacter = self.getCharacterAtIndex()
-		else:
-			self.currentCharacter = None
-
 	def advance(self) -> None:
-		nextCharacter = self.currentCharacter
-
-		if not nextCharacter:
-			nextCharacter = self.getCharacterAtIndex(self.position.index)
+		self.index += 1
+		self.currentCharacter = self.file.text[self.index] if self.index < self.file.length else None
 
-		self.position.advance(nextCharacter == "\n")
+	# Tokens only store character indexes, lines and columns are looked up from the
+	# file when an error is displayed
 
-		self.updateCurrentCharacter()
+	def span(self, start: int, end: Optional[int] = None) -> StartEndPosition:
+		return StartEndPosition(self.file, start, end)
 
 	#########################################
 	# TOKENIZE
@@ -57,7 +47,7 @@ class Tokenizer:
 
 		while self.currentCharacter is not None:
 			if self.currentCharacter in ["\n", ";"]:
-				tokens.append(Token(TokenTypes.NEW_LINE, self.position.asStartEndPosition()))
+				tokens.append(Token(TokenTypes.NEW_LINE, self.span(self.index)))
 				self.advance()
 			elif self.currentCharacter == "#":
 				while self.currentCharacter and self.currentCharacter != "\n":
@@ -86,37 +76,37 @@ class Tokenizer:
 				token, error = self.makeDivideEquals()
 				tokens.append(token)
 			elif self.currentCharacter == "^":
-				tokens.append(Token(TokenTypes.POWER, self.position.asStartEndPosition()))
+				tokens.append(Token(TokenTypes.POWER, self.span(self.index)))
 				self.advance()
 			elif self.currentCharacter == "%":
-				tokens.append(Token(TokenTypes.MODULUS, self.position.asStartEndPosition()))
+				tokens.append(Token(TokenTypes.MODULUS, self.span(self.index)))
 				self.advance()
 			elif self.currentCharacter == "(":
-				tokens.append(Token(TokenTypes.LEFT_PARENTHESES, self.position.asStartEndPosition()))
+				tokens.append(Token(TokenTypes.LEFT_PARENTHESES, self.span(self.index)))
 				self.advance()
 			elif self.currentCharacter == ")":
-				tokens.append(Token(TokenTypes.RIGHT_PARENTHESES, self.position.asStartEndPosition()))
+				tokens.append(Token(TokenTypes.RIGHT_PARENTHESES, self.span(self.index)))
 				self.advance()
 			elif self.currentCharacter == "[":
-				tokens.append(Token(TokenTypes.LEFT_SQUARE, self.position.asStartEndPosition()))
+				tokens.append(Token(TokenTypes.LEFT_SQUARE, self.span(self.index)))
 				self.advance()
 			elif self.currentCharacter == "]":
-				tokens.append(Token(TokenTypes.RIGHT_SQUARE, self.position.asStartEndPosition()))
+				tokens.append(Token(TokenTypes.RIGHT_SQUARE, self.span(self.index)))
 				self.advance()
 			elif self.currentCharacter == "{":
-				tokens.append(Token(TokenTypes.LEFT_CURLY, self.position.asStartEndPosition()))
+				tokens.append(Token(TokenTypes.LEFT_CURLY, self.span(self.index)))
 				self.advance()
 			elif self.currentCharacter == "}":
-				tokens.append(Token(TokenTypes.RIGHT_CURLY, self.position.asStartEndPosition()))
+				tokens.append(Token(TokenTypes.RIGHT_CURLY, self.span(self.index)))
 				self.advance()
 			elif self.currentCharacter == ",":
-				tokens.append(Token(TokenTypes.COMMA, self.position.asStartEndPosition()))
+				tokens.append(Token(TokenTypes.COMMA, self.span(self.index)))
 				self.advance()
 			elif self.currentCharacter == ".":
 				token, error = self.makeDot()
 				tokens.append(token)
 			elif self.currentCharacter == ":":
-				tokens.append(Token(TokenTypes.COLON, self.position.asStartEndPosition()))
+				tokens.append(Token(TokenTypes.COLON, self.span(self.index)))
 				self.advance()
 			elif self.currentCharacter == "=":
 				token, error = self.makeEquals()
@@ -131,10 +121,10 @@ class Tokenizer:
 				token, error = self.makeLessThanEquals()
 				tokens.append(token)
 			elif self.currentCharacter is not None:
-				startPosition = self.position.copy()
+				startIndex = self.index
 				character = self.currentCharacter
 				self.advance()
-				error = IllegalCharacterError(f"'{character}' is not a valid character", startPosition.asStartEndPosition())
+				error = IllegalCharacterError(f"'{character}' is not a valid character", self.span(startIndex))
 				break
 
 			if error:
@@ -143,142 +133,140 @@ class Tokenizer:
 		if error is not None:
 			return None, error
 
-		position = self.position.copy()
-		position.advance()
-		tokens.append(Token(TokenTypes.EOF, position.asStartEndPosition()))
+		tokens.append(Token(TokenTypes.EOF, self.span(self.index + 1)))
 
 		return tokens, None
 
 	def makeDot(self) -> tuple[Token | None, Error | None]:
-		startPosition = self.position.copy()
+		startIndex = self.index
 
 		# self.advance()
 
 		# if self.currentCharacter == ".":
-		# 	endPosition = self.position.copy()
+		# 	endIndex = self.index
 
 		# 	self.advance()
 
-		# 	return Token(TokenTypes.DOUBLE_DOT, startPosition.createStartEndPosition(endPosition)), None
+		# 	return Token(TokenTypes.DOUBLE_DOT, self.span(startIndex, endIndex)), None
 		
 		self.advance()
 
-		return Token(TokenTypes.DOT, startPosition.asStartEndPosition()), None
+		return Token(TokenTypes.DOT, self.span(startIndex)), None
 
 	def makePlusEquals(self) -> tuple[Token | None, Error | None]:
-		startPosition = self.position.copy()
+		startIndex = self.index
 
 		self.advance()
 
 		if self.currentCharacter == "=":
-			endPosition = self.position.copy()
+			endIndex = self.index
 
 			self.advance()
 
-			return Token(TokenTypes.PLUS_EQUALS, startPosition.createStartEndPosition(endPosition)), None
-		return Token(TokenTypes.PLUS, startPosition.asStartEndPosition()), None
+			return Token(TokenTypes.PLUS_EQUALS, self.span(startIndex, endIndex)), None
+		return Token(TokenTypes.PLUS, self.span(startIndex)), None
 
 	def makeMinusEqualsArrow(self) -> tuple[Token | None, Error | None]:
-		startPosition = self.position.copy()
+		startIndex = self.index
 
 		self.advance()
 
 		if self.currentCharacter == "=":
-			endPosition = self.position.copy()
+			endIndex = self.index
 
 			self.advance()
 
-			return Token(TokenTypes.MINUS_EQUALS, startPosition.createStartEndPosition(endPosition)), None
+			return Token(TokenTypes.MINUS_EQUALS, self.span(startIndex, endIndex)), None
 		elif self.currentCharacter == ">":
-			endPosition = self.position.copy()
+			endIndex = self.index
 
 			self.advance()
 
-			return Token(TokenTypes.RIGHT_ARROW, startPosition.createStartEndPosition(endPosition)), None
-		return Token(TokenTypes.MINUS, startPosition.asStartEndPosition()), None
+			return Token(TokenTypes.RIGHT_ARROW, self.span(startIndex, endIndex)), None
+		return Token(TokenTypes.MINUS, self.span(startIndex)), None
 
 	def makeMultiplyEquals(self) -> tuple[Token | None, Error | None]:
-		startPosition = self.position.copy()
+		startIndex = self.index
 
 		self.advance()
 
 		if self.currentCharacter == "=":
-			endPosition = self.position.copy()
+			endIndex = self.index
 
 			self.advance()
 
-			return Token(TokenTypes.MULTIPLY_EQUALS, startPosition.createStartEndPosition(endPosition)), None
-		return Token(TokenTypes.MULTIPLY, startPosition.asStartEndPosition()), None
+			return Token(TokenTypes.MULTIPLY_EQUALS, self.span(startIndex, endIndex)), None
+		return Token(TokenTypes.MULTIPLY, self.span(startIndex)), None
 
 	def makeDivideEquals(self) -> tuple[Token | None, Error | None]:
-		startPosition = self.position.copy()
+		startIndex = self.index
 
 		self.advance()
 
 		if self.currentCharacter == "=":
-			endPosition = self.position.copy()
+			endIndex = self.index
 
 			self.advance()
 
-			return Token(TokenTypes.DIVIDE_EQUALS, startPosition.createStartEndPosition(endPosition)), None
-		return Token(TokenTypes.DIVIDE, startPosition.asStartEndPosition()), None
+			return Token(TokenTypes.DIVIDE_EQUALS, self.span(startIndex, endIndex)), None
+		return Token(TokenTypes.DIVIDE, self.span(startIndex)), None
 
 	def makeEquals(self) -> tuple[Token | None, Error | None]:
-		startPosition = self.position.copy()
+		startIndex = self.index
 
 		self.advance()
 
 		if self.currentCharacter == "=":
-			token = Token(TokenTypes.DOUBLE_EQUALS, startPosition.createStartEndPosition(self.position))
+			token = Token(TokenTypes.DOUBLE_EQUALS, self.span(startIndex, self.index))
 			self.advance()
 		else:
-			token = Token(TokenTypes.EQUALS, startPosition.asStartEndPosition())
+			token = Token(TokenTypes.EQUALS, self.span(startIndex))
 
 		return token, None
 
 	def makeNotEquals(self) -> tuple[Token | None, Error | None]:
-		startPosition = self.position.copy()
+		startIndex = self.index
 
 		self.advance()
 
 		if self.currentCharacter != "=":
-			return None, IllegalCharacterError(f"'{self.currentCharacter}' is not a valid character", startPosition.asStartEndPosition())
+			return None, IllegalCharacterError(f"'{self.currentCharacter}' is not a valid character", self.span(startIndex))
 
-		token = Token(TokenTypes.NOT_EQUALS, startPosition.createStartEndPosition(self.position))
+		token = Token(TokenTypes.NOT_EQUALS, self.span(startIndex, self.index))
 
 		self.advance()
 
 		return token, None
 
 	def makeGraterThanEquals(self) -> tuple[Token | None, Error | None]:
-		startPosition = self.position.copy()
+		startIndex = self.index
 
 		self.advance()
 
 		if self.currentCharacter == "=":
-			token = Token(TokenTypes.GREATER_EQUALS, startPosition.createStartEndPosition(self.position))
+			token = Token(TokenTypes.GREATER_EQUALS, self.span(startIndex, self.index))
 			self.advance()
 		else:
-			token = Token(TokenTypes.GRATER_THAN, startPosition.asStartEndPosition())
+			token = Token(TokenTypes.GRATER_THAN, self.span(startIndex))
 
 		return token, None
 
 	def makeLessThanEquals(self) -> tuple[Token | None, Error | None]:
-		startPosition = self.position.copy()
+		startIndex = self.index
 
 		self.advance()
 
 		if self.currentCharacter == "=":
-			token = Token(TokenTypes.LESS_EQUALS, startPosition.createStartEndPosition(self.position))
+			token = Token(TokenTypes.LESS_EQUALS, self.span(startIndex, self.index))
 			self.advance()
 		else:
-			token = Token(TokenTypes.LESS_THAN, startPosition.asStartEndPosition())
+			token = Token(TokenTypes.LESS_THAN, self.span(startIndex))
 
 		return token, None
 
 	def makeNumber(self) -> tuple[Token | None, Error | None]:
 		number = self.currentCharacter
-		startPosition = self.position.copy()
+		startIndex = self.index
 		dots = 0
 
 		self.advance()
@@ -288,7 +276,7 @@ class Tokenizer:
 
 			if self.currentCharacter == ".":
 				if dots == 1:
-					position = StartEndPosition(self.file, startPosition, self.position.copy())
+					position = self.span(startIndex, self.index)
 
 					return Token(TokenTypes.FLOAT, position, float(number[:-1])), None
 
@@ -296,14 +284,14 @@ class Tokenizer:
 
 			self.advance()
 
-		position = StartEndPosition(self.file, startPosition, self.position.copy())
+		position = self.span(startIndex, self.index)
 
 		if dots == 0:
 			return Token(TokenTypes.INTEGER, position, int(number)), None
 		return Token(TokenTypes.FLOAT, position, float(number)), None
 
 	def makeKeywordOrIdentifier(self) -> tuple[Token | None, Error | None]:
-		startPosition = self.position.copy()
+		startIndex = self.index
 		text = self.currentCharacter
 
 		self.advance()
@@ -312,13 +300,14 @@ class Tokenizer:
 			text += self.currentCharacter
 			self.advance()
 
-		if text in KEYWORDS:
-			return Token(TokenTypes.KEYWORD, startPosition.createStartEndPosition(self.position), text), None
-		return Token(TokenTypes.IDENTIFIER, startPosition.createStartEndPosition(self.position), text), None
+		keyword = KEYWORDS.get(text)
+		if keyword:
+			return Token(TokenTypes.KEYWORD, self.span(startIndex, self.index), keyword.name, keyword), None
+		return Token(TokenTypes.IDENTIFIER, self.span(startIndex, self.index), intern(text)), None
 
 	def makeEscapeCharacter(self, startingQuote: str) -> tuple[str | None, Error | None]:
 		if not self.currentCharacter == "\\":
-			return None, ExpectedCharacterError(f"Expected character \\, not {self.currentCharacter}", self.position.copy())
+			return None, ExpectedCharacterError(f"Expected character \\, not {self.currentCharacter}", self.span(self.index))
 
 		self.advance()
 
@@ -337,14 +326,14 @@ class Tokenizer:
 		elif self.currentCharacter == startingQuote:
 			escapeCharacter = startingQuote
 		else:
-			return None, ExpectedCharacterError(f"Expected escape a valid escape character, not {self.currentCharacter}", self.position.copy())
+			return None, ExpectedCharacterError(f"Expected escape a valid escape character, not {self.currentCharacter}", self.span(self.index))
 
 		self.advance()
 		
 		return escapeCharacter, None
 	
 	def makeString(self) -> tuple[Token | None, Error | None]:
-		startPosition = self.position.copy()
+		startIndex = self.index
 		startStringChar = self.currentCharacter
 		text = ""
 
@@ -366,11 +355,217 @@ class Tokenizer:
 
 		if self.currentCharacter == startStringChar:
 			self.advance()
-			return Token(TokenTypes.STRING, startPosition.createStartEndPosition(self.position), text), None
+			return Token(TokenTypes.STRING, self.span(startIndex, self.index), text), None
 
 		self.advance()
-		return None, ExpectedCharacterError(f"Expected string closing character, not '{self.currentCharacter or 'EOF'}'", self.position.asStartEndPosition())
-	
-	
+		return None, ExpectedCharacterError(f"Expected string closing character, not '{self.currentCharacter or 'EOF'}'", self.span(self.index))
+
+########################################
+#	TOKENIZER
+########################################
+
+# A single compiled pattern matches one whole token at a time. The order of the
+# groups matters, the first alternative that matches wins. A number ends at its
+# second dot, the dot is then matched on its own. Anything else is OTHER and is
+# handed to the character tokenizer
+
+TOKEN_GROUPS = [
+	r"(?P<SKIP>[ \t]+|\#[^\n]*)",
+	r"(?P<NAME>[a-zA-Z][a-zA-Z_]*)",
+	r"(?P<OPERATOR>\+=|-=|->|\*=|/=|==|!=|>=|<=|[-+*/^%()\[\]{},.:=<>])",
+	r"(?P<NEW_LINE>[\n;])",
+	r"(?P<NUMBER>[0-9]+(?:\.[0-9]*)?)",
+	r"(?P<STRING>\"(?:[^\"\\\n]|\\[\\nrtb\"])*\"|'(?:[^'\\\n]|\\[\\nrtb'])*')",
+	r"(?P<OTHER>.)"
+]
+
+TOKEN_PATTERN = re.compile("|".join(TOKEN_GROUPS), re.DOTALL)
+
+# Scans memory mapped files. Files read in text mode used to have \r\n turned
+# into \n, the mapped bytes still contain the \r
+
+BYTES_TOKEN_PATTERN = re.compile("|".join([r"(?P<SKIP>[ \t]+|\#[^\n]*|\r(?=\n))"] + TOKEN_GROUPS[1:]).encode(), re.DOTALL)
+
+ESCAPE_PATTERN = re.compile(r"\\(.)")
+
+ESCAPE_CHARACTERS = {
+	"\\": "\\",
+	"n": "\n",
+	"r": "\r",
+	"t": "\t",
+	"b": "\b",
+	"'": "'",
+	'"': '"'
+}
+
+OPERATORS = {
+	"+": TokenTypes.PLUS,
+	"-": TokenTypes.MINUS,
+	"*": TokenTypes.MULTIPLY,
+	"/": TokenTypes.DIVIDE,
+	"^": TokenTypes.POWER,
+	"%": TokenTypes.MODULUS,
+	"(": TokenTypes.LEFT_PARENTHESES,
+	")": TokenTypes.RIGHT_PARENTHESES,
+	"[": TokenTypes.LEFT_SQUARE,
+	"]": TokenTypes.RIGHT_SQUARE,
+	"{": TokenTypes.LEFT_CURLY,
+	"}": TokenTypes.RIGHT_CURLY,
+	",": TokenTypes.COMMA,
+	".": TokenTypes.DOT,
+	":": TokenTypes.COLON,
+	"=": TokenTypes.EQUALS,
+	">": TokenTypes.GRATER_THAN,
+	"<": TokenTypes.LESS_THAN,
+	"+=": TokenTypes.PLUS_EQUALS,
+	"-=": TokenTypes.MINUS_EQUALS,
+	"->": TokenTypes.RIGHT_ARROW,
+	"*=": TokenTypes.MULTIPLY_EQUALS,
+	"/=": TokenTypes.DIVIDE_EQUALS,
+	"==": TokenTypes.DOUBLE_EQUALS,
+	"!=": TokenTypes.NOT_EQUALS,
+	">=": TokenTypes.GREATER_EQUALS,
+	"<=": TokenTypes.LESS_EQUALS
+}
+
+BYTES_OPERATORS = {operator.encode(): tokenType for operator, tokenType in OPERATORS.items()}
+
+class Tokenizer(CharacterTokenizer):
+	def __init__(self, filename: str, fileText: str | bytes | mmap.mmap) -> None:
+		super().__init__(filename, fileText)
+
+		self.decoded: Tokenizer | None = None
+		self.decodedIndex = (0, 0)
+
+	def tokenize(self) -> tuple[list[Token], Error]:
+		tokens = list(self.generateTokens())
+
+		if isinstance(tokens[-1], Error):
+			return None, tokens[-1]
+
+		return tokens, None
+
+	# Yields the tokens one at a time so the parser can consume them while the file
+	# is being scanned. A tokenizer error is yielded in place of the EOF token and
+	# ends the stream
+
+	def generateTokens(self) -> Iterator[Token | Error]:
+		file = self.file
+		text = file.text
+		length = file.length
+		binary = file.binary
+		pattern = BYTES_TOKEN_PATTERN if binary else TOKEN_PATTERN
+		operators = BYTES_OPERATORS if binary else OPERATORS
+		keywords = KEYWORDS
+		keywordType = TokenTypes.KEYWORD
+		identifier = TokenTypes.IDENTIFIER
+		newLine = TokenTypes.NEW_LINE
+		index = self.index
+
+		# The scan has to be finished before the mapping is closed, the finally runs
+		# once the stream is done or abandoned
+		try:
+			while index < length:
+				for found in pattern.finditer(text, index, length):
+					kind = found.lastgroup
+
+					if kind == "SKIP":
+						continue
+
+					start, end = found.span()
+
+					if kind == "NAME":
+						value = found.group()
+						if binary:
+							value = value.decode()
+
+						keyword = keywords.get(value)
+						if keyword:
+							yield Token(keywordType, StartEndPosition(file, start, end), keyword.name, keyword)
+						else:
+							yield Token(identifier, StartEndPosition(file, start, end), intern(value))
+					elif kind == "OPERATOR":
+						yield Token(operators[found.group()], StartEndPosition(file, start, end - 1))
+					elif kind == "NEW_LINE":
+						yield Token(newLine, StartEndPosition(file, start))
+					elif kind == "NUMBER":
+						value = found.group()
+						if binary:
+							value = value.decode()
+
+						if "." in value:
+							yield Token(TokenTypes.FLOAT, StartEndPosition(file, start, end), float(value))
+						else:
+							yield Token(TokenTypes.INTEGER, StartEndPosition(file, start, end), int(value))
+					elif kind == "STRING":
+						value = found.group()[1:-1]
+						if binary:
+							value = value.decode()
+
+						if "\\" in value:
+							value = ESCAPE_PATTERN.sub(lambda escape: ESCAPE_CHARACTERS[escape.group(1)], value)
+
+						yield Token(TokenTypes.STRING, StartEndPosition(file, start, end), value)
+					else:
+						token, error = self.fallback(start)
+						if error:
+							yield error
+							return
+
+						index = self.index
+						yield token
+						break
+				else:
+					index = length
+
+			self.index = index
+			self.currentCharacter = None
+
+			yield Token(TokenTypes.EOF, self.span(index + 1))
+		finally:
+			file.closeMapping()
+
+	# Strings with invalid escapes or without a closing quote, a ! without = and
+	# illegal characters are scanned by the character tokenizer, which reports the
+	# errors
+
+	def fallback(self, index: int) -> tuple[Token | None, Error | None]:
+		if self.file.binary:
+			return self.decodedFallback(index)
+
+		self.index = index
+		self.currentCharacter = self.file.text[index]
+
+		if self.currentCharacter in "'\"":
+			return self.makeString()
+		elif self.currentCharacter == "!":
+			return self.makeNotEquals()
+
+		return None, IllegalCharacterError(f"'{self.currentCharacter}' is not a valid character", self.span(index))
+
+	# The character tokenizer needs a str, a mapped file is decoded once and the
+	# positions it reports are turned back into byte offsets. Fallbacks only move
+	# forward, the character index is counted from the last one
+
+	def decodedFallback(self, index: int) -> tuple[Token | None, Error | None]:
+		if self.decoded is None:
+			self.decoded = Tokenizer(self.file.name, self.file.text[:].decode())
+
+		lastIndex, lastCharacterIndex = self.decodedIndex
+		characterIndex = lastCharacterIndex + len(self.file.text[lastIndex:index].decode())
+		self.decodedIndex = (index, characterIndex)
+
+		tokenizer = self.decoded
+		text = tokenizer.file.text
+
+		def byteIndex(position: int) -> int:
+			end = min(position, len(text))
+			return index + len(text[characterIndex:end].encode()) + (position - end)
+
+		token, error = tokenizer.fallback(characterIndex)
+
+		result = error or token
+		result.position = StartEndPosition(self.file, byteIndex(result.position.start), byteIndex(result.position.end))
+		self.index = byteIndex(tokenizer.index)
 
-	
\ No newline at end of file
+		return token, error
@@ -4,8 +4,11 @@
 
 from __future__ import annotations
 from enum import Enum, auto
-from typing import Optional
+from typing import Optional, Generator, Any, TypeVar
+from bisect import bisect_right
 import string
+import mmap
+import os
 
 ########################################
 #	ENUMS
@@ -27,12 +30,22 @@ LETTERS = string.ascii_letters
 #	CLASSES
 ########################################
 
+# Files are never changed after tokenizing, positions share the same File object
+# and only look up lines and columns when an error is displayed. The text is
+# either a str or bytes, indexes are then byte offsets. A memory mapped file is
+# copied to bytes and closed once it is tokenized, a mapping kept open as long
+# as its positions could crash the process if the file is truncated meanwhile
+
+TAB_WIDTH = 4
+
 class File:
-	def __init__(self, filename: str, fileText: str) -> None:
+	def __init__(self, filename: str, fileText: str | bytes | mmap.mmap) -> None:
 		self.name = filename
 		self.text = fileText
+		self.binary = not isinstance(fileText, str)
 
 		self.length = len(self.text)
+		self.lineStarts: list[int] | None = None
 
 	def __repr__(self) -> str:
 		if self.text.split("\n") == 1:
@@ -41,7 +54,66 @@ class File:
 			return f"file({self.name}, '\n{self.text}\n')"
 
 	def copy(self) -> File:
-		return File(self.name, self.text)
+		return self
+
+	def closeMapping(self) -> None:
+		if isinstance(self.text, mmap.mmap):
+			mapping = self.text
+			self.text = mapping[:]
+			mapping.close()
+
+	# Returns the text between two indexes as a str
+	def slice(self, start: int, end: int) -> str:
+		if self.binary:
+			return self.text[start:end].decode("utf-8", "replace")
+
+		return self.text[start:end]
+
+	# Returns the 1 based line and 0 based column of an index. Columns count
+	# characters and a tab counts as TAB_WIDTH columns, indexes past the end of the
+	# file count one column each
+	def lineColumn(self, index: int) -> tuple[int, int]:
+		if index < 0:
+			return -1, -1
+
+		if self.lineStarts is None:
+			newLineCharacter = b"\n" if self.binary else "\n"
+
+			self.lineStarts = [0]
+			newLine = self.text.find(newLineCharacter)
+			while newLine != -1:
+				self.lineStarts.append(newLine + 1)
+				newLine = self.text.find(newLineCharacter, newLine + 1)
+
+		line = bisect_right(self.lineStarts, index)
+		lineStart = self.lineStarts[line - 1]
+		end = min(index, self.length)
+
+		beforeIndex = self.slice(lineStart, end)
+		column = len(beforeIndex) + beforeIndex.count("\t") * (TAB_WIDTH - 1) + (index - end)
+
+		return line, column
+
+	def lineText(self, line: int) -> str:
+		if line < 1:
+			return ""
+
+		self.lineColumn(0)
+
+		start = self.lineStarts[line - 1]
+		end = self.lineStarts[line] - 1 if line < len(self.lineStarts) else self.length
+
+		return self.slice(start, end).rstrip("\r").replace("\t", " " * TAB_WIDTH)
+
+# Maps the file instead of reading it into a str, the tokenizer scans the mapped
+# bytes directly. Empty files can't be mapped
+
+def readSource(path: str) -> bytes | mmap.mmap:
+	with open(path, "rb") as file:
+		if os.fstat(file.fileno()).st_size == 0:
+			return b""
+
+		return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
 
 class InterpretFile:
 	def __init__(self, filepath: str, parent: InterpretFile) -> None:
@@ -64,44 +136,65 @@ class InterpretFile:
 	def __repr__(self) -> str:
 		return f"INTERPRET_FILE({self.name}, {str(self.importedModules)})"
 
-class Position:
-	def __init__(self, index: int, line: int, column: int, file: File) -> None:
-		self.index = index
-		self.line = line
-		self.column = column
+# A position is a span of character indexes, start and end are both inclusive
+# for single characters. Positions are immutable so they can be shared freely
+
+class StartEndPosition:
+	__slots__ = ("file", "start", "end")
+
+	def __init__(self, file: File, start: int, end: Optional[int] = None) -> None:
 		self.file = file
+		self.start = start
+		self.end = start if end is None else end
 
 	def __repr__(self) -> str:
-		return f"position({str(self.index)}, ln: {str(self.line)}, cl: {str(self.column)}, {self.file.name})"
+		return f"startEndPos({str(self.start)}, {str(self.end)}, {self.file.name})"
 
-	def advance(self, newLine: bool = False):
-		self.index += 1
-		self.column += 1
+	def until(self, end: StartEndPosition) -> StartEndPosition:
+		return StartEndPosition(self.file, self.start, end.end)
 
-		if newLine:
-			self.column = 0
-			self.line += 1
+	def startPosition(self) -> StartEndPosition:
+		return StartEndPosition(self.file, self.start)
 
-	def asStartEndPosition(self) -> StartEndPosition:
-		return StartEndPosition(self.file.copy(), self.copy())
+	def extended(self, characters: int) -> StartEndPosition:
+		return StartEndPosition(self.file, self.start, self.end + characters)
 
-	def createStartEndPosition(self, end: Position) -> StartEndPosition:
-		return StartEndPosition(self.file.copy(), self.copy(), end.copy())
-			
-	def copy(self) -> Position:
-		return Position(self.index, self.line, self.column, self.file.copy())
+	def copy(self) -> StartEndPosition:
+		return self
 
-class StartEndPosition:
-	def __init__(self, file: File, start: Position, end: Optional[Position] = None) -> None:
-		self.file = file
-		self.start = start
-		self.end = end
+########################################
+#	NESTING
+########################################
 
-		if not self.end:
-			self.end = self.start.copy()
-	
-	def __repr__(self) -> str:
-		return f"startEndPos({repr(self.start)}, {repr(self.end)}, {self.file.name})"
-	
-	def copy(self) -> StartEndPosition:
-		return StartEndPosition(self.file.copy(), self.start.copy(), self.end.copy())
\ No newline at end of file
+# Code that nests, like blocks inside blocks or calls inside calls, is handled
+# by generators instead of recursive calls. A generator yields the generator of
+# every part it needs and is sent back what that part returned. The generators
+# waiting for a part are kept on an explicit stack, so nesting is only limited
+# by memory and never by the recursion limit. A part that turned out to need no
+# generator can be yielded as its result instead, which is sent right back
+
+T = TypeVar("T")
+Nested = Generator[Generator | tuple, Any, T]
+
+def runNested(generator: Nested[T]) -> T:
+	waiting: list[Generator] = []
+	value = None
+
+	while True:
+		try:
+			part = generator.send(value)
+		except StopIteration as stop:
+			if not waiting:
+				return stop.value
+
+			generator = waiting.pop()
+			value = stop.value
+			continue
+
+		if type(part) is tuple:
+			value = part
+			continue
+
+		waiting.append(generator)
+		generator = part
+		value = None
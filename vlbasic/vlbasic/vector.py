@@ -0,0 +1,147 @@
+########################################
+#	IMPORTS
+########################################
+
+from __future__ import annotations
+from array import array
+from typing import Sequence
+import operator
+
+# NumPy is optional, every operation has a pure Python version as well
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+########################################
+#	CONSTANTS
+########################################
+
+OPERATIONS = {
+	"+": operator.add,
+	"-": operator.sub,
+	"*": operator.mul,
+	"/": operator.truediv
+}
+
+INTEGER_MIN = -2 ** 63
+INTEGER_MAX = 2 ** 63 - 1
+
+# Integers up to this size are floats without rounding, NumPy divides them as
+# floats while Python divides the exact integers
+EXACT_FLOAT_MAX = 2 ** 53
+
+########################################
+#	NUMPY
+########################################
+
+# Only the arrays and ranges of number lists are handed to NumPy, they hold one
+# kind of number so NumPy gives the same types as Python. Plain lists can mix
+# integers and floats, which NumPy would turn into floats
+
+def toNumpy(numbers: Sequence[int | float]) -> numpy.ndarray | None:
+	if numpy is None or not len(numbers):
+		return None
+
+	if isinstance(numbers, array):
+		return numpy.frombuffer(numbers, dtype=numpy.int64 if numbers.typecode == "q" else numpy.float64)
+	elif isinstance(numbers, range) and INTEGER_MIN <= min(numbers[0], numbers[-1]) and max(numbers[0], numbers[-1]) <= INTEGER_MAX:
+		return numpy.arange(numbers.start, numbers.stop, numbers.step, dtype=numpy.int64)
+
+	return None
+
+def fromNumpy(numbers: numpy.ndarray) -> array:
+	packed = array("q" if numbers.dtype == numpy.int64 else "d")
+	packed.frombytes(numbers.astype(numpy.int64 if packed.typecode == "q" else numpy.float64).tobytes())
+
+	return packed
+
+def isIntegers(numbers: numpy.ndarray | int | float) -> bool:
+	if isinstance(numbers, numpy.ndarray):
+		return numbers.dtype == numpy.int64
+
+	return isinstance(numbers, int)
+
+# The largest size of a number, as a Python integer so it can not overflow
+def magnitude(numbers: numpy.ndarray | int | float) -> int | float:
+	if isinstance(numbers, numpy.ndarray):
+		return max(numbers.max().item(), -numbers.min().item())
+
+	return abs(numbers)
+
+# Integers overflow in NumPy where Python makes them bigger, results that could
+# overflow are worked out in Python instead. bound is the largest size the
+# result can have if every value is an integer
+
+def fits(operation: str, left: numpy.ndarray | int | float, right: numpy.ndarray | int | float, length: int = 1) -> bool:
+	if operation == "/":
+		return all(not isIntegers(values) or magnitude(values) <= EXACT_FLOAT_MAX for values in (left, right))
+	elif not (isIntegers(left) and isIntegers(right)):
+		return True
+	elif operation == "*":
+		bound = length * magnitude(left) * magnitude(right)
+	else:
+		bound = length * (magnitude(left) + magnitude(right))
+
+	return bound <= INTEGER_MAX
+
+########################################
+#	OPERATIONS
+########################################
+
+# left and right are arrays, ranges or lists of Python numbers, right can be a
+# single number as well. Lists have to be the same length and dividing by zero
+# has to be ruled out before, the results are the same as doing the operation
+# on every pair of Numbers
+
+def elementwise(operation: str, left: Sequence[int | float], right: Sequence[int | float] | int | float) -> Sequence[int | float]:
+	function = OPERATIONS[operation]
+	isNumber = isinstance(right, (int, float))
+
+	leftArray = toNumpy(left)
+	rightArray = right if isNumber else toNumpy(right)
+
+	if leftArray is not None and rightArray is not None and fits(operation, leftArray, rightArray):
+		return fromNumpy(function(leftArray, rightArray))
+
+	if isNumber:
+		return [function(number, right) for number in left]
+
+	return list(map(function, left, right))
+
+def sumOf(numbers: Sequence[int | float]) -> int | float:
+	numbersArray = toNumpy(numbers)
+	if numbersArray is not None and fits("+", numbersArray, 0, len(numbers)):
+		return numbersArray.sum().item()
+
+	return sum(numbers)
+
+def meanOf(numbers: Sequence[int | float]) -> float:
+	numbersArray = toNumpy(numbers)
+	if numbersArray is not None:
+		return numbersArray.mean().item()
+
+	return sum(numbers) / len(numbers)
+
+def minOf(numbers: Sequence[int | float]) -> int | float:
+	numbersArray = toNumpy(numbers)
+	if numbersArray is not None:
+		return numbersArray.min().item()
+
+	return min(numbers)
+
+def maxOf(numbers: Sequence[int | float]) -> int | float:
+	numbersArray = toNumpy(numbers)
+	if numbersArray is not None:
+		return numbersArray.max().item()
+
+	return max(numbers)
+
+def dot(left: Sequence[int | float], right: Sequence[int | float]) -> int | float:
+	leftArray = toNumpy(left)
+	rightArray = toNumpy(right)
+
+	if leftArray is not None and rightArray is not None and fits("*", leftArray, rightArray, len(left)):
+		return numpy.dot(leftArray, rightArray).item()
+
+	return sum(map(operator.mul, left, right))
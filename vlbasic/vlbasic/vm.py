@@ -0,0 +1,332 @@
+########################################
+#	IMPORTS
+########################################
+
+from .statementclass import StatementNode
+from .contextclass import Context
+from .runtimevaluesclass import RuntimeValue, Number, Null, String, List, Function, Dictionary, makeNumber, makeNull, makeList
+from .error import RTError, ReturnOutsideFunctionError, ContinueOutsideLoopError, BreakOutsideLoopError, ValueError_
+from .utils import StartEndPosition, File, InterpretFile
+from .interpreter import Interpreter
+from .compiler import Compiler
+from .bytecode import *
+
+########################################
+#	VM
+########################################
+
+class VM(Interpreter):
+	def __init__(self, statements: list[StatementNode], interpretFile: InterpretFile, isAFunction: bool = False) -> None:
+		super().__init__(statements, interpretFile, isAFunction)
+		self.code: CodeObject = None
+
+	def compile(self) -> CodeObject:
+		if self.code is None:
+			if self.isAFunction:
+				self.code = Compiler().compileFunction(self.statements, "<FUNCTION>")
+			else:
+				self.code = Compiler().compileModule(self.statements, self.interpretFile.filepath)
+
+		return self.code
+
+	def interpret(self, context: Context) -> tuple[list[RuntimeValue], RTError]:
+		result, error = self.execute(self.compile(), context)
+		if error:
+			return None, self.setErrorContext(error, context)
+
+		if self.isAFunction:
+			self.returnValue = result
+			return [], None
+
+		return result, None
+
+	def runFunction(self, func: Function, executeContext: Context) -> tuple[RuntimeValue, RTError]:
+		if func.code is None:
+			func.code = Compiler().compileFunction(func.body, f"<FUNCTION {func.name}>")
+
+		returnValue, error = self.execute(func.code, executeContext)
+		if error:
+			return None, self.setErrorContext(error, executeContext)
+
+		return returnValue, None
+
+	def execute(self, code: CodeObject, context: Context) -> tuple[list[RuntimeValue] | RuntimeValue, RTError]:
+		instructions = code.instructions
+		variableTable = context.variableTable
+		results: list[RuntimeValue] = []
+		stack: list = []
+		push = stack.append
+		pop = stack.pop
+		index = 0
+
+		while True:
+			opcode, argument, node = instructions[index]
+			index += 1
+
+			if opcode == LOAD_NAME:
+				value, error = variableTable.lookupVariableAt(node.token.value, node.depth, node.slot, node.position)
+				if error:
+					return None, error
+
+				push(value)
+
+			elif opcode == LOAD_NUMBER:
+				push(makeNumber(node.token.value, node.position, context))
+
+			elif opcode == LOAD_STRING:
+				push(String(node.token.value, node.position, context))
+
+			elif opcode == POP_TOP:
+				pop()
+
+			elif opcode == JUMP:
+				index = argument
+
+			elif opcode == POP_JUMP_IF_FALSE:
+				conditionBoolean, error = pop().toBoolean(node.position)
+				if error:
+					return None, error
+
+				if not conditionBoolean.value:
+					index = argument
+
+			elif opcode == FOR_ITER:
+				for item in stack[-1]:
+					if isinstance(item, RTError):
+						return None, item
+
+					variableTable.assignVariableAt(node.item.value, 0, node.slot, item, node.item.position)
+					break
+				else:
+					pop()
+					index = argument
+
+			elif BINARY_ADD <= opcode <= BINARY_LESS_EQUALS:
+				right = pop()
+				left = pop()
+
+				position = node.position
+
+				if opcode == BINARY_ADD:
+					result, error = left.added(right, position)
+				elif opcode == BINARY_SUBTRACT:
+					result, error = left.subtracted(right, position)
+				elif opcode == BINARY_MULTIPLY:
+					result, error = left.multiplied(right, position)
+				elif opcode == BINARY_DIVIDE:
+					result, error = left.divided(right, position)
+				elif opcode == BINARY_POWER:
+					result, error = left.power(right, position)
+				elif opcode == BINARY_MODULUS:
+					result, error = left.modulus(right, position)
+				elif opcode == BINARY_EQUALS:
+					result, error = left.equals(right, position)
+				elif opcode == BINARY_NOT_EQUALS:
+					result, error = left.notEquals(right, position)
+				elif opcode == BINARY_GRATER_THAN:
+					result, error = left.graterThan(right, position)
+				elif opcode == BINARY_LESS_THAN:
+					result, error = left.lessThan(right, position)
+				elif opcode == BINARY_GREATER_EQUALS:
+					result, error = left.graterThanEquals(right, position)
+				else:
+					result, error = left.lessThanEquals(right, position)
+
+				if error:
+					return None, error
+
+				push(result)
+
+			elif opcode == UNARY_PLUS or opcode == UNARY_MINUS or opcode == UNARY_NOT:
+				number = pop()
+				position = node.operationToken.position.until(node.expression.position)
+
+				if opcode == UNARY_MINUS:
+					number, error = number.multiplied(makeNumber(-1, position, context), position)
+				elif opcode == UNARY_PLUS:
+					number, error = number.multiplied(makeNumber(1, position, context), position)
+				else:
+					number, error = number.notted(position)
+
+				if error:
+					return None, error
+
+				push(number)
+
+			elif opcode == ASSIGN_NAME:
+				assignTo = pop()
+
+				if argument:
+					variableValue, error = variableTable.lookupVariableAt(node.token.value, node.depth, node.slot, node.token.position)
+					if error:
+						return None, error
+
+					if argument == 1:
+						assignTo, error = variableValue.added(assignTo, node.position)
+					elif argument == 2:
+						assignTo, error = variableValue.subtracted(assignTo, node.position)
+					elif argument == 3:
+						assignTo, error = variableValue.multiplied(assignTo, node.position)
+					else:
+						assignTo, error = variableValue.divided(assignTo, node.position)
+
+					if error:
+						return None, error
+
+				value, error = variableTable.assignVariableAt(node.token.value, node.depth, node.slot, assignTo, node.position)
+				if error:
+					return None, error
+
+				push(value)
+
+			elif opcode == DECLARE_NAME:
+				value, error = variableTable.declareVariableAt(node.token.value, node.slot, pop(), argument == 1, node.position)
+				if error:
+					return None, error
+
+				push(value)
+
+			elif opcode == CALL_FUNCTION:
+				if argument:
+					argumentsVisited = stack[-argument:]
+					del stack[-argument:]
+				else:
+					argumentsVisited = []
+
+				returnValue, error = self.callFunction(pop(), argumentsVisited, node.position, context)
+				if error:
+					return None, error
+
+				push(returnValue)
+
+			elif opcode == RETURN_VALUE:
+				return pop(), None
+
+			elif opcode == RETURN_NULL:
+				return makeNull(node.position, context), None
+
+			elif opcode == PUSH_NULL:
+				push(makeNull(node.position, context))
+
+			elif opcode == STORE_RESULT:
+				results.append(pop())
+
+			elif opcode == GET_ITEM:
+				item = pop()
+				value, error = pop().getItem(item, node.position)
+				if error:
+					return None, error
+
+				push(value)
+
+			elif opcode == SET_ITEM:
+				value = pop()
+				item = pop()
+				_, error = pop().setItem(item, value, node.position)
+				if error:
+					return None, error
+
+				push(makeNull(node.position, context))
+
+			elif opcode == GET_ATTRIBUTE:
+				item = pop()
+				value, error = pop().getAttribute(item, node.position)
+				if error:
+					return None, error
+
+				push(value)
+
+			elif opcode == BUILD_LIST:
+				if argument:
+					expressions = stack[-argument:]
+					del stack[-argument:]
+				else:
+					expressions = []
+
+				push(makeList(expressions, node.position, context))
+
+			elif opcode == BUILD_DICTIONARY:
+				valuesVisited = {}
+
+				if argument:
+					items = stack[-argument * 2:]
+					del stack[-argument * 2:]
+
+					for keyIndex in range(0, len(items), 2):
+						valuesVisited[items[keyIndex]] = items[keyIndex + 1]
+
+				push(Dictionary(valuesVisited, node.position, context))
+
+			elif opcode == BUILD_RANGE:
+				stepValue = pop()
+				stopValue = pop()
+				startValue = pop()
+
+				value, error = self.makeRange(node, startValue, stopValue, stepValue, context)
+				if error:
+					return None, error
+
+				push(value)
+
+			elif opcode == SETUP_FOR:
+				iteratorVisited = pop()
+
+				items, error = iteratorVisited.iterate(node.iterator.position, context)
+				if error:
+					return None, error
+
+				if variableTable.isDeclared(node.item.value):
+					_, error = variableTable.assignVariable(node.item.value, makeNull(node.item.position, context), node.item.position)
+				else:
+					_, error = variableTable.declareVariable(node.item.value, makeNull(node.item.position, context), False, node.item.position)
+
+				if error:
+					return None, error
+
+				push(items)
+
+			elif opcode == MAKE_FUNCTION:
+				func = Function(node.variable, node.arguments, node.body, node.position, node.anonymous, context, node.layout, self)
+				func.code = argument
+
+				if node.anonymous:
+					push(func)
+					continue
+
+				_, error = variableTable.declareVariable(node.variable, func, True, node.position)
+				if error:
+					return None, error
+
+				push(makeNull(node.position, context))
+
+			elif opcode == IMPORT:
+				moduleName = pop()
+
+				if not isinstance(moduleName, String):
+					return None, ValueError_(["string"], moduleName.__class__.__name__, node.moduleName.position, context)
+
+				_, error = self.importModule(moduleName.value, context, node.position, node.asName)
+				if error:
+					return None, error
+
+				push(makeNull(node.position, context))
+
+			elif opcode == BREAK_OUTSIDE_LOOP:
+				return None, BreakOutsideLoopError(node.position, context)
+
+			elif opcode == CONTINUE_OUTSIDE_LOOP:
+				return None, ContinueOutsideLoopError(node.position, context)
+
+			elif opcode == RETURN_OUTSIDE_FUNCTION:
+				return None, ReturnOutsideFunctionError(node.position, context)
+
+			elif opcode == END:
+				if code.isAFunction:
+					file = File("<DEFAULT_VARIABLE>", "")
+					return makeNull(StartEndPosition(file, -1), context), None
+
+				return results, None
+
+			else:
+				# The compiler only emits opcodes handled above
+				raise AssertionError(f"{OPCODE_NAMES[opcode]} is not handled")